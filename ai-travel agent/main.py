@@ -1,28 +1,47 @@
+import asyncio
 import os
-from dotenv import load_dotenv
-from typing import cast
+import sys
+from pathlib import Path
+from typing import Optional
 import chainlit as cl
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
-from agents.run import RunConfig
 
-load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise ValueError("GEMINI_API_KEY is not set in your .env file.")
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.admission import Overloaded, provider_admission
+from common.breaker import CircuitOpen, provider_breaker
+from common.cache import ResponseCache, normalize
+from common.clients import model_clients, register_lifecycle
+from common.config import LazyApp, require_env
+from common.deadlines import Deadline, DeadlineExceeded, start_deadline, turn_deadline_from_env
+from common.history import ChatHistory, estimate_tokens
+from common.prefetch import Prefetcher
+from common.recording import recorder
+from common.router import IntentRouter
+from common.sessions import store_from_env
+from common.streaming import BufferedStream
+from common.tools import ToolExecutor
+from common.tracing import tracer
+from common.turns import coordinator_from_env
 
-client = AsyncOpenAI(
-    api_key=api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=client
-)
-config = RunConfig(
-    model=model,
-    model_provider=client,
-    tracing_disabled=True
-)
+MODEL_NAME = "gemini-2.0-flash"
+HISTORY_TOKEN_BUDGET = 2000
+REPLY_TOKEN_ESTIMATE = 500
+
+# Shared across sessions, keyed on the whole conversation: near-identical openers ("what to eat in Bangkok")
+# reuse the reply, context-dependent follow-ups ("what should I eat there?") only after the same conversation
+response_cache = ResponseCache(max_entries=512, ttl=600.0)
+
+EXPLORE_DRAFT_PROMPT = "What should I see, eat and do in {destination}?"
+# A prefetched draft answers only questions as general as its prompt ("what to do there?", "things to see
+# in Cairo"); anything more specific ("vegan restaurants", "is it safe at night?") gets a real reply
+EXPLORE_DRAFT_WORDS = set(normalize(EXPLORE_DRAFT_PROMPT.format(destination="")).split()) | {
+    "to", "there", "can", "we", "me", "us", "the", "a", "some", "any", "good", "best", "things", "places",
+    "visit", "explore", "sights", "food", "activities", "where", "go", "is", "are", "s",
+}
+
+def draft_answers(text: str, destination: str) -> bool:
+    """Whether the explore draft for ``destination`` answers ``text`` as well as a fresh reply would"""
+    words = set(normalize(text).split()) - set(normalize(destination).split())
+    return bool(words) and words <= EXPLORE_DRAFT_WORDS
 
 def fetch_airlines(destination: str) -> str:
     return f"🛫 **Airlines to {destination}**\n- Horizon Air: $500 (Luxury)\n- Starlink Flights: $420 (Economy)\n- BudgetWings: $350 (Low-Cost)\n- Travel Duration: 6-10 hours"
@@ -30,73 +49,247 @@ def fetch_airlines(destination: str) -> str:
 def recommend_lodging(destination: str) -> str:
     return f"🛏️ **Lodging in {destination}**\n- Royal Oasis Resort: 5⭐ ($250/night) - Downtown\n- Serenity Suites: 4⭐ ($180/night) - Near Beach\n- Traveler’s Haven: 3⭐ ($60/night) - Budget Option\n- Includes free parking & pool access"
 
-DestinationAgent = Agent(
-    name="DestinationAgent",
-    instructions="Recommend travel spots based on user’s mood, budget, and preferences. Clarify with questions if needed. Popular: Dubai, New York, Bangkok, Lahore, Cairo."
-)
+BOOKING_TOOLS = {
+    "fetch_airlines": fetch_airlines,
+    "recommend_lodging": recommend_lodging
+}
 
-BookingAgent = Agent(
-    name="BookingAgent",
-    instructions="Simulate arranging airlines and lodging using tools.",
-    tools={
-        "fetch_airlines": fetch_airlines,
-        "recommend_lodging": recommend_lodging
-    }
-)
+# Both lookups depend only on the destination, so they run concurrently and are memoized
+booking_tools = ToolExecutor(BOOKING_TOOLS, timeout=10.0, pure=BOOKING_TOOLS)
+
+def booking_calls(destination: str):
+    return [
+        ("fetch_airlines", {"destination": destination}),
+        ("recommend_lodging", {"destination": destination}),
+    ]
 
-ExploreAgent = Agent(
-    name="ExploreAgent",
-    instructions="Propose local sights, cuisine, and activities for the chosen destination. Highlight iconic landmarks, local dishes, adventures, and travel advice."
+# Keyword tables are compiled once; booking beats explore when both match
+router = IntentRouter(
+    routes=[
+        ("booking", ["book", "booking", "hotel", "hotels", "flight", "flights"]),
+        ("explore", ["see", "explore", "eat", "do there"]),
+    ],
+    entities={
+        "Dubai": ["dubai"],
+        "New York": ["new york"],
+        "Bangkok": ["bangkok"],
+        "Lahore": ["lahore"],
+        "Cairo": ["cairo"],
+    },
+    default="destination",
 )
 
+class TravelApp:
+    """Clients, agents and env-configured state, built on the first chat rather than at import"""
+
+    def __init__(self):
+        api_key = require_env("GEMINI_API_KEY")
+        from agents import Agent
+        from agents.run import RunConfig
+        # Imports the SDK's Model base class, so only once the app is built
+        from common.hedging import HedgedModel, hedge_delay_from_env
+
+        fallback_model_name = os.getenv("GEMINI_FALLBACK_MODEL", "gemini-2.0-flash-lite")
+        base_url = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
+        client, model = model_clients.get(base_url=base_url, api_key=api_key, model=MODEL_NAME)
+        candidates = [(MODEL_NAME, model)]
+        if fallback_model_name:
+            candidates.append((fallback_model_name, model_clients.get(base_url=base_url, api_key=api_key, model=fallback_model_name)[1]))
+        # A slow or failing primary is hedged/failed over to the fallback model
+        self.hedged_model = HedgedModel(candidates, hedge_delay=hedge_delay_from_env())
+        # SDK tracing uploads to the OpenAI platform; turns are traced locally by common.tracing instead
+        self.config = RunConfig(
+            model=self.hedged_model,
+            model_provider=client,
+            tracing_disabled=True
+        )
+
+        # Bursts queue fairly per session instead of tripping Gemini's rate limits (GEMINI_MAX_CONCURRENCY, GEMINI_RPS, GEMINI_TPM)
+        self.admission = provider_admission("gemini", max_concurrency=16)
+        # After repeated failures Gemini calls fail fast for a while, then one probes for recovery (GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_RESET)
+        self.breaker = provider_breaker("gemini")
+        # Each turn, tool calls and model stream included, has TURN_DEADLINE seconds; a late reply keeps what it streamed
+        self.turn_deadline = turn_deadline_from_env()
+        # Conversation state lives in the session store, not cl.user_session (see SESSION_STORE)
+        self.sessions = store_from_env("travel", lambda: ChatHistory(max_tokens=HISTORY_TOKEN_BUDGET))
+        # A message sent while the previous reply is still streaming cancels that reply (TURN_MODE=serialize queues it instead)
+        self.turns = coordinator_from_env()
+        # Once a destination comes up, the next turn is usually booking or exploring it: warm those
+        # in the background (PREFETCH_TTL seconds; PREFETCH_EXPLORE=1 also drafts the ExploreAgent reply)
+        self.prefetcher = Prefetcher(ttl=float(os.getenv("PREFETCH_TTL", "300")))
+        self.prefetch_explore = os.getenv("PREFETCH_EXPLORE", "0") == "1"
+
+        self.destination_agent = Agent(
+            name="DestinationAgent",
+            instructions="Recommend travel spots based on user’s mood, budget, and preferences. Clarify with questions if needed. Popular: Dubai, New York, Bangkok, Lahore, Cairo."
+        )
+        self.booking_agent = Agent(
+            name="BookingAgent",
+            instructions="Simulate arranging airlines and lodging using tools.",
+            tools=BOOKING_TOOLS
+        )
+        self.explore_agent = Agent(
+            name="ExploreAgent",
+            instructions="Propose local sights, cuisine, and activities for the chosen destination. Highlight iconic landmarks, local dishes, adventures, and travel advice."
+        )
+        self.route_agents = {
+            "booking": self.booking_agent,
+            "explore": self.explore_agent,
+            "destination": self.destination_agent,
+        }
+
+    async def explore_draft(self, session_id: str, destination: str) -> str:
+        from agents import Runner
+
+        messages = [{"role": "user", "content": EXPLORE_DRAFT_PROMPT.format(destination=destination)}]
+        # Speculative calls queue like any other, are dropped rather than queued past the deadline,
+        # and count towards (and are refused by) the provider's circuit breaker
+        self.breaker.check()
+        async with self.admission.slot(session_id, tokens=estimate_tokens(messages[0]["content"]) + REPLY_TOKEN_ESTIMATE):
+            with self.breaker.attempt():
+                result = await Deadline(self.turn_deadline).wait(Runner.run(self.explore_agent, messages, run_config=self.config))
+        return result.final_output
+
+    def warm(self, session_id: str, destination: str) -> None:
+        self.prefetcher.prefetch(session_id, ("booking", destination), lambda: booking_tools.run(booking_calls(destination)))
+        if self.prefetch_explore:
+            self.prefetcher.prefetch(session_id, ("explore", destination), lambda: self.explore_draft(session_id, destination))
+
+app = LazyApp(TravelApp)
+
+register_lifecycle(cl, prepare=app)
+
 @cl.on_chat_start
 async def start():
-    cl.user_session.set("chat_history", [])
-    cl.user_session.set("config", config)
-    cl.user_session.set("current_agent", DestinationAgent)
+    session = await app.sessions.areset(cl.user_session.get("id"))
+    app.prefetcher.cancel(session.id)
+    session.set("current_agent", app.destination_agent.name)
+    await app.sessions.asave(session)
     await cl.Message(content="🌟 **Welcome to Dream Travel AI!** 🌟\n\nI'm your personal travel designer and I'm here to create your perfect adventure! ✈️🌍\n\n**Tell me about yourself:**\n• What's your travel mood? (Adventure, Relaxation, Culture, Food, etc.)\n• What's your budget range? (Luxury, Mid-range, Budget)\n• What interests you most? (History, Nature, Food, Shopping, etc.)\n• Who are you traveling with? (Solo, Couple, Family, Friends)\n\nLet's start planning your dream trip! 🎉").send()
 
 @cl.on_message
 async def main(message: cl.Message):
-    history = cl.user_session.get("chat_history") or []
-    history.append({"role": "user", "content": message.content})
-    user_input = message.content.lower()
+    await app.turns.run(cl.user_session.get("id"), lambda: handle_turn(message))
 
-    if any(word in user_input for word in ["book", "hotel", "flight"]):
-        agent = BookingAgent
-    elif any(word in user_input for word in ["see", "explore", "eat", "do there"]):
-        agent = ExploreAgent
-    else:
-        agent = DestinationAgent
+def cache_key(agent, backend: str, history: ChatHistory, destination: Optional[str]) -> str:
+    """Everything the reply depends on: the agent, the backend, the session's destination and the model input"""
+    return response_cache.key(agent.name, agent.instructions, backend, history.messages(), context=(destination or "",))
 
-    cl.user_session.set("current_agent", agent)
+async def handle_turn(message: cl.Message):
+    from agents import Runner
 
-    msg = cl.Message(content="")
+    turn = tracer.start_turn("travel", cl.user_session.get("id"))
+    record = recorder.start_turn("travel", cl.user_session.get("id"), message.content)
+    deadline = start_deadline(app.turn_deadline)
+    sessions, prefetcher, admission = app.sessions, app.prefetcher, app.admission
+    session = await sessions.asession(cl.user_session.get("id"))
+    history = session.history
+    history.append({"role": "user", "content": message.content})
+    with turn.span("routing") as span:
+        route = router.route(message.content)
+        span.set("route", route.route)
+    agent = app.route_agents[route.route]
+
+    session.set("current_agent", agent.name)
+    # Follow-ups like "book me a hotel" refer to the last destination mentioned
+    destination = route.entity or session.get("destination")
+    if route.entity and route.entity != session.get("destination"):
+        # A new destination: whatever was warmed for the previous one is no longer wanted
+        prefetcher.cancel(session.id)
+        session.set("destination", route.entity)
+        if agent == app.destination_agent:
+            app.warm(session.id, route.entity)
+
+    msg = BufferedStream(cl.Message(content=""))
     await msg.send()
+    result = None
 
     try:
-        if agent == BookingAgent:
-            destination = None
-            for word in ["dubai", "new york", "bangkok", "lahore", "cairo"]:
-                if word in user_input:
-                    destination = word.title()
-                    break
-
+        if agent == app.booking_agent:
             if destination:
-                airlines = fetch_airlines(destination)
-                lodging = recommend_lodging(destination)
+                with turn.span("prefetch") as span:
+                    prefetched = await deadline.wait(prefetcher.get(session.id, ("booking", destination)))
+                    span.set("hit", prefetched is not None)
+                airlines, lodging = prefetched or await booking_tools.run(booking_calls(destination))
                 await msg.stream_token(f"📍 Your Travel Plan for *{destination}*:\n\n{airlines}\n\n{lodging}")
-                history.append({"role": "assistant", "content": msg.content})
-                cl.user_session.set("chat_history", history)
+                with turn.span("session_write"):
+                    history.append({"role": "assistant", "content": msg.content})
+                    await sessions.asave(session)
+                return
+
+        if agent == app.explore_agent and destination and app.prefetch_explore and draft_answers(message.content, destination):
+            with turn.span("prefetch") as span:
+                draft = await deadline.wait(prefetcher.get(session.id, ("explore", destination)))
+                span.set("hit", draft is not None)
+            if draft:
+                await msg.stream_token(draft)
+                with turn.span("session_write"):
+                    history.append({"role": "assistant", "content": msg.content})
+                    await sessions.asave(session)
                 return
 
-        result = Runner.run_streamed(agent, history, run_config=cast(RunConfig, config))
-        async for event in result.stream_events():
-            if event.type == "raw_response_event" and hasattr(event.data, "delta"):
-                await msg.stream_token(event.data.delta)
+        with turn.span("cache") as span:
+            # Served only by the backend that would answer now: a fallback's reply is kept under its own name
+            backend = app.hedged_model.ranked()[0][0]
+            cached = response_cache.get(cache_key(agent, backend, history, destination))
+            span.set("hit", cached is not None)
+        if cached is not None:
+            await msg.stream_token(cached)
+        else:
+            prompt_tokens = history.total_tokens
+            with turn.span("admission"):
+                app.breaker.check()
+                permit = await deadline.wait(admission.acquire(session.id, tokens=prompt_tokens + REPLY_TOKEN_ESTIMATE))
+            try:
+                with turn.stream(agent=agent.name) as stream, record.model(agent.name) as model, app.breaker.attempt() as call, \
+                        app.hedged_model.track_winners() as winners:
+                    result = Runner.run_streamed(agent, history.messages(), run_config=app.config)
+                    async for event in deadline.iterate(result.stream_events()):
+                        if event.type == "raw_response_event" and hasattr(event.data, "delta"):
+                            call.responded()
+                            stream.token()
+                            model.delta(event.data.delta)
+                            await msg.stream_token(event.data.delta)
+            finally:
+                permit.record(prompt_tokens + estimate_tokens(msg.content))
+                admission.release(permit)
+            if msg.content:
+                response_cache.set(cache_key(agent, winners[-1] if winners else backend, history, destination), msg.content)
 
-        history.append({"role": "assistant", "content": msg.content})
-        cl.user_session.set("chat_history", history)
+        with turn.span("session_write"):
+            history.append({"role": "assistant", "content": msg.content})
+            await sessions.asave(session)
 
+    except asyncio.CancelledError:
+        # Superseded by a newer message: stop the upstream run and keep only what the user already saw
+        turn.set("error", "superseded")
+        if result is not None and hasattr(result, "cancel"):
+            result.cancel()
+        if msg.content:
+            history.append({"role": "assistant", "content": msg.content})
+        await sessions.asave(session)
+        raise
+    except DeadlineExceeded:
+        # Out of time: stop the upstream run and keep the part of the reply already streamed
+        turn.set("error", "deadline")
+        if result is not None and hasattr(result, "cancel"):
+            result.cancel()
+        if msg.content:
+            history.append({"role": "assistant", "content": msg.content})
+            await sessions.asave(session)
+            await msg.stream_token("\n\n⌛ *That's all I had time for. Ask me to go on if you'd like more.*")
+        else:
+            await msg.stream_token("⌛ Planning took too long this time. Please try again.")
+    except Overloaded as e:
+        turn.set("error", "overloaded")
+        await msg.stream_token(f"⏳ Lots of travellers are planning trips right now. Please try again in {max(1, round(e.retry_after))} seconds.")
+    except CircuitOpen as e:
+        turn.set("error", "circuit_open")
+        await msg.stream_token(f"🔌 Our travel planner is having trouble reaching its AI service. Please try again in {max(1, round(e.retry_after))} seconds.")
     except Exception as e:
-        await msg.stream_token(f"❌ Something went wrong: {str(e)}")
\ No newline at end of file
+        turn.set("error", type(e).__name__)
+        await msg.stream_token(f"❌ Something went wrong: {str(e)}")
+    finally:
+        await msg.flush()
+        record.end(session, msg.content)
+        turn.end()
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""Model calls under 5x overload, with and without per-provider admission control.
+
+The simulated provider rejects requests above ``--upstream-rps`` with a 429 and
+shares ``--knee`` units of capacity between in-flight requests (processor
+sharing), so every call slows down as concurrency grows, like a batched LLM
+backend. Users give up after ``--user-timeout``. One chatty session sends
+``--chatty-share`` of all requests; the rest come from many normal sessions.
+
+``unbounded`` fires every call straight at the provider, as the apps did.
+``admission`` goes through an AdmissionController sized to the provider. It
+reports queue wait, success rate per class of user and how fast shed calls fail.
+
+Run from the repository root: python -m benchmarks.bench_admission
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.loadtest import summarize
+from common.admission import AdmissionController, Overloaded, TokenBucket
+
+
+class RateLimited(Exception):
+    pass
+
+
+class SimProvider:
+    def __init__(self, rps: float, knee: int, work: float):
+        self.bucket = TokenBucket(rps, rps)
+        self.knee = knee
+        self.work = work
+        self.in_flight = 0
+        self.rejected = 0
+
+    async def call(self) -> None:
+        if self.bucket.delay(1) > 0:
+            self.rejected += 1
+            raise RateLimited()
+        self.bucket.take(1)
+        self.in_flight += 1
+        try:
+            remaining = self.work
+            while remaining > 0:
+                step = 0.01
+                await asyncio.sleep(step)
+                remaining -= step * min(1.0, self.knee / self.in_flight)
+        finally:
+            self.in_flight -= 1
+
+
+async def simulate(mode: str, args) -> None:
+    provider = SimProvider(args.upstream_rps, args.knee, args.work)
+    capacity = min(args.upstream_rps, args.knee / args.work)
+    controller = AdmissionController("sim", max_concurrency=args.knee, requests_per_second=args.upstream_rps,
+                                     deadline=args.deadline, service_time=args.work)
+    rng = random.Random(7)
+    outcomes = {"normal": [0, 0], "chatty": [0, 0]}
+    waits, shed_latency = [], []
+
+    async def request(kind: str, session_id: str) -> None:
+        started = time.perf_counter()
+        outcomes[kind][1] += 1
+        try:
+            if mode == "admission":
+                async def admitted():
+                    async with controller.slot(session_id):
+                        waits.append(time.perf_counter() - started)
+                        await provider.call()
+                await asyncio.wait_for(admitted(), args.user_timeout)
+            else:
+                await asyncio.wait_for(provider.call(), args.user_timeout)
+            outcomes[kind][0] += 1
+        except Overloaded:
+            shed_latency.append(time.perf_counter() - started)
+        except (RateLimited, asyncio.TimeoutError):
+            pass
+
+    offered = capacity * args.overload
+    tasks = []
+    deadline = time.perf_counter() + args.duration
+    while time.perf_counter() < deadline:
+        if rng.random() < args.chatty_share:
+            kind, session_id = "chatty", "chatty"
+        else:
+            kind, session_id = "normal", f"user-{rng.randrange(args.sessions)}"
+        tasks.append(asyncio.ensure_future(request(kind, session_id)))
+        await asyncio.sleep(rng.expovariate(offered))
+    await asyncio.gather(*tasks)
+
+    total_ok = sum(ok for ok, _ in outcomes.values())
+    total = sum(count for _, count in outcomes.values())
+    rate = {kind: ok / count * 100 if count else 0.0 for kind, (ok, count) in outcomes.items()}
+    wait = summarize(waits)
+    shed = sum(shed_latency) / len(shed_latency) * 1e3 if shed_latency else 0.0
+    print(f"{mode:>9} {total:>8} {total_ok / total * 100:>8.1f}% {rate['normal']:>8.1f}% {rate['chatty']:>8.1f}% "
+          f"{total_ok / args.duration:>7.1f} {wait['p50_ms']:>6.0f}/{wait['p99_ms']:<6.0f} {len(shed_latency):>6} {shed:>9.2f} "
+          f"{provider.rejected:>5}")
+
+
+async def main_async(args) -> None:
+    capacity = min(args.upstream_rps, args.knee / args.work)
+    print(f"provider capacity {capacity:.0f} req/s, offered {capacity * args.overload:.0f} req/s for {args.duration:.0f} s, "
+          f"users give up after {args.user_timeout:.0f} s, queue deadline {args.deadline:.1f} s")
+    print(f"{'mode':>9} {'requests':>8} {'success':>9} {'normal':>9} {'chatty':>9} {'ok/s':>7} {'wait p50/p99':>13} "
+          f"{'shed':>6} {'shed ms':>9} {'429s':>5}")
+    for mode in ("unbounded", "admission"):
+        await simulate(mode, args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--overload", type=float, default=5.0, help="offered load as a multiple of capacity")
+    parser.add_argument("--duration", type=float, default=8.0)
+    parser.add_argument("--upstream-rps", type=float, default=30.0)
+    parser.add_argument("--knee", type=int, default=4, help="requests the provider serves at full speed")
+    parser.add_argument("--work", type=float, default=0.2, help="seconds per request when uncontended")
+    parser.add_argument("--user-timeout", type=float, default=3.0)
+    parser.add_argument("--deadline", type=float, default=1.0, help="admission queue deadline")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--chatty-share", type=float, default=0.3)
+    asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
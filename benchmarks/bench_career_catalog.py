@@ -0,0 +1,77 @@
+"""Per-turn latency and allocations of advisor replies: per-call dict rebuilding vs the catalog.
+
+Run from the repository root: python -m benchmarks.bench_career_catalog
+"""
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "career-mentor-agent"))
+from catalog import CATALOG, FIELD_DESCRIPTIONS, FIELD_JOB_ROLES, FIELD_SKILLS, JOB_MARKET_DATA, SKILL_DETAILS, ADVISOR_PROFILES
+
+TURNS = [(field, intent) for field in FIELD_DESCRIPTIONS for intent in ("skills", "jobs", "overview")]
+
+
+def _copy_table(table):
+    # Same object count as re-evaluating the old nested dict literals on every call
+    return {key: {k: list(v) if isinstance(v, list) else v for k, v in value.items()} for key, value in table.items()}
+
+
+def legacy_respond(field, intent):
+    """The previous advisor path: rebuild field and market data each turn, then format"""
+    field_info = {
+        "field": field,
+        "description": FIELD_DESCRIPTIONS[field],
+        "skills": FIELD_SKILLS.get(field, []),
+        "job_roles": FIELD_JOB_ROLES.get(field, []),
+        "growth_potential": "High",
+        "salary_range": "$60,000 - $150,000+",
+        "education_required": "Bachelor's degree or equivalent",
+    }
+    market_data = _copy_table(JOB_MARKET_DATA)[field]
+    profile = ADVISOR_PROFILES[field]
+    if intent == "skills":
+        skill_details = _copy_table(SKILL_DETAILS)[profile["skill"]]
+        return (f"{profile['emoji']} **{profile['title']} Skills Guide**\n\n{skill_details['description']}\n\n**Learning Path:**\n" +
+                "\n".join([f"• {step}" for step in skill_details["learning_path"]]) +
+                f"\n\n**Resources:** {', '.join(skill_details['resources'])}\n\n**Time to Learn:** {skill_details['time_to_learn']}")
+    if intent == "jobs":
+        return (f"💼 **{profile['title']} Career Opportunities**\n\n**Job Roles:**\n" +
+                "\n".join([f"• {role}" for role in field_info["job_roles"]]) +
+                f"\n\n**Market Data:**\n• Demand: {market_data['demand']}\n• Growth Rate: {market_data['growth_rate']}\n• Average Salary: {market_data['average_salary']}\n• Top Companies: {', '.join(market_data['top_companies'])}")
+    return (f"{profile['emoji']} **{profile['title']} Expert Here!**\n\nI can help you with:\n" +
+            "\n".join([f"• {topic}" for topic in profile["topics"]]) +
+            f"\n\nWhat would you like to know about {profile['subject']}?")
+
+
+def catalog_respond(field, intent):
+    return CATALOG.reply(field, intent)
+
+
+def peak_allocation(func):
+    """Mean peak bytes allocated while producing one reply"""
+    tracemalloc.start()
+    total = 0
+    for field, intent in TURNS:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func(field, intent)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - baseline
+    tracemalloc.stop()
+    return total / len(TURNS)
+
+
+def main(number=20000):
+    for field, intent in TURNS:
+        assert legacy_respond(field, intent) == catalog_respond(field, intent)
+    print(f"{'path':>8} {'us/turn':>8} {'peak bytes/turn':>16}")
+    for name, func in (("legacy", legacy_respond), ("catalog", catalog_respond)):
+        seconds = timeit.timeit(lambda: [func(f, i) for f, i in TURNS], number=number)
+        peak = peak_allocation(func)
+        print(f"{name:>8} {seconds / (number * len(TURNS)) * 1e6:>8.3f} {peak:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""Career mentor time-to-first-byte: "Thinking..." then a full update, vs streamed parts.
+
+``update`` is the previous handler: run the whole reply, then replace the
+placeholder in one go, so the first byte arrives with the last. ``stream`` sends
+each part as ``respond_stream`` yields it. ``catalog`` turns use today's advisors,
+which stream pre-rendered sections. ``model`` turns swap in an advisor that writes
+its reply with a model (a local FakeModelServer), streamed token by token, as
+model-backed advisors will.
+
+Run from the repository root: python -m benchmarks.bench_career_stream
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.bench_hedging import SSEModel
+from benchmarks.fake_server import FakeModelServer
+from benchmarks.loadtest import summarize
+from common.history import ChatHistory
+from common.sessions import Session
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "career-mentor-agent"))
+from advisors import CareerMentorAgent, FieldAdvisor
+from agents import Runner
+
+CONVERSATION = [
+    "hello",
+    "I'm interested in software engineering",
+    "what jobs are there?",
+    "what skills should I learn?",
+    "how is the market demand?",
+    "show me the learning path",
+    "thanks",
+]
+
+
+class ModelAdvisor(FieldAdvisor):
+    """Software engineering advisor that has the model write its reply under the catalog heading"""
+    field = "software engineering"
+
+    def reply_parts(self, history, session):
+        parts, handoff = super().reply_parts(history, session)
+        if parts is None:
+            return (parts, handoff)
+        return (self._tokens(parts[0]), None)
+
+    async def _tokens(self, heading):
+        yield heading
+        async for delta in self.model.stream_response():
+            yield delta
+
+
+async def turn(agent, session, text, advisors, mode, ttfb, total):
+    history = session.history
+    history.append({"role": "user", "content": text})
+    started = time.perf_counter()
+    first = None
+    if mode == "update" and advisors == "catalog":
+        reply = (await Runner.run(agent, history, context=session)).final_output
+        first = time.perf_counter() - started
+    elif mode == "update":
+        # A model-backed reply can only be shown once all of it has arrived
+        result = Runner.run_streamed(agent, history, context=session)
+        reply = "".join([event.data.delta async for event in result.stream_events()])
+        first = time.perf_counter() - started
+    else:
+        result = Runner.run_streamed(agent, history, context=session)
+        chunks = []
+        async for event in result.stream_events():
+            if first is None:
+                first = time.perf_counter() - started
+            chunks.append(event.data.delta)
+        reply = "".join(chunks)
+    total.append(time.perf_counter() - started)
+    ttfb.append(first)
+    history.append({"role": "assistant", "content": reply})
+
+
+async def simulate(advisors: str, mode: str, server: FakeModelServer, args) -> None:
+    agent = CareerMentorAgent("Career Mentor Agent", "benchmark", None)
+    if advisors == "model":
+        agent.handoffs["software engineering"] = ModelAdvisor("Software Engineering Advisor", "benchmark", SSEModel(server.base_url))
+    ttfb, total = [], []
+
+    async def conversation(index):
+        session = Session(str(index), new_history=lambda: ChatHistory(max_tokens=2000))
+        for text in CONVERSATION:
+            await turn(agent, session, text, advisors, mode, ttfb, total)
+
+    await asyncio.gather(*(conversation(index) for index in range(args.sessions)))
+    first, whole = summarize(ttfb), summarize(total)
+    print(f"{advisors:>8} {mode:>7} {first['p50_ms']:>9.2f}/{first['p99_ms']:<9.2f} {whole['p50_ms']:>9.2f}/{whole['p99_ms']:<9.2f}")
+
+
+async def main_async(args) -> None:
+    async with FakeModelServer(first_token_latency=args.first_token_latency, token_interval=args.token_interval,
+                               tokens=args.tokens) as server:
+        print(f"{args.sessions} sessions x {len(CONVERSATION)} turns; model advisor: first token "
+              f"{args.first_token_latency * 1e3:.0f} ms, {args.tokens} tokens every {args.token_interval * 1e3:.0f} ms")
+        print(f"{'advisors':>8} {'handler':>7} {'ttfb p50/p99 ms':>19} {'total p50/p99 ms':>19}")
+        for advisors in ("catalog", "model"):
+            for mode in ("update", "stream"):
+                await simulate(advisors, mode, server, args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--first-token-latency", type=float, default=0.3)
+    parser.add_argument("--token-interval", type=float, default=0.02)
+    parser.add_argument("--tokens", type=int, default=60)
+    asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
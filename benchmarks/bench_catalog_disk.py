@@ -0,0 +1,234 @@
+"""Career catalog lookups for a large taxonomy: all in memory vs paged in from a catalog file.
+
+A synthetic taxonomy of ``--entries`` records (a fifth fields, three fifths skills,
+the rest market data and learning paths, with made-up names as in
+bench_similarity) is written as JSONL and built into a catalog file with
+build_catalog. Each mode then runs in a fresh worker process and answers the
+same tool calls through CareerTools:
+
+- ``memory`` parses the whole taxonomy into records and a SimilarityIndex at
+  start, as a large in-memory catalog would.
+- ``disk`` opens the file with DiskCatalog and pages records in on demand.
+
+``start`` is the time to open the catalog, ``first`` the first lookup after it.
+``paged`` lookups each ask for a record not asked for before (a cache miss for
+DiskCatalog); ``warm`` repeats ``--cache`` of them, which the LRU then holds.
+``match`` is a fuzzy field lookup by a job role in a sentence. Memory is what
+the worker holds after the lookups beyond what it held before opening the
+catalog: ``rss`` all resident pages, ``private`` those no other process can share
+(the catalog file's mapped pages are shared by every worker that reads it), and
+``peak`` the growth of the peak. The file is in the OS page cache when the
+workers start (it was just written), as on a warm server.
+
+Run from the repository root: python -m benchmarks.bench_catalog_disk
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.bench_similarity import word
+from benchmarks.loadtest import rss_kb, summarize
+from common.similarity import SimilarityIndex
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "career-mentor-agent"))
+from advisors import CareerTools
+from catalog import CatalogEntry, CatalogLookup, MATCH_THRESHOLD, FieldRecord, MarketRecord, SkillRecord
+from catalog_db import DiskCatalog, _decode, _parse, build_catalog
+
+ROOT = Path(__file__).resolve().parent.parent
+LEVELS = ("beginner", "intermediate")
+
+
+def name(rng: random.Random, words: int) -> str:
+    return " ".join(word(rng) for _ in range(words))
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return name(rng, words).capitalize() + "."
+
+
+def taxonomy(entries: int, seed: int) -> Iterator[Dict[str, Any]]:
+    """Fields with skills, roles, market data and paths, and skill details, ``entries`` records in all"""
+    rng = random.Random(seed)
+    fields = entries // 5
+    for index in range(fields):
+        field = f"{name(rng, 2)} {index}"
+        skills = [f"{name(rng, 2)} {index}-{number}" for number in range(3)]
+        yield {"kind": "field", "field": field, "description": sentence(rng, 30), "skills": skills,
+               "job_roles": [f"{name(rng, 1)} {word(rng)}ist {index}-{number}" for number in range(3)]}
+        for skill in skills:
+            yield {"kind": "skill", "name": skill, "field": field, "description": sentence(rng, 15),
+                   "learning_path": [sentence(rng, 6) for _ in range(4)], "resources": [name(rng, 2) for _ in range(4)],
+                   "time_to_learn": f"{rng.randint(1, 12)} months"}
+        if index % 2:
+            yield {"kind": "market", "field": field, "demand": "High", "growth_rate": f"{rng.randint(1, 30)}%",
+                   "average_salary": f"${rng.randint(40, 200)},000", "remote_work": "Common",
+                   "top_companies": [name(rng, 1).title() for _ in range(5)]}
+        else:
+            yield {"kind": "path", "field": field, "level": LEVELS[index % 4 // 2],
+                   "steps": [sentence(rng, 8) for _ in range(5)]}
+
+
+class MemoryCatalog(CatalogLookup):
+    """The whole taxonomy as records in dicts, as CareerCatalog holds the built-in one"""
+
+    __slots__ = ("records", "index")
+
+    def __init__(self, path: str):
+        self.records: Dict[Tuple[str, str], Any] = {}
+        names: List[Tuple[str, CatalogEntry]] = []
+        with open(path, encoding="utf-8") as source:
+            for line in source:
+                kind, key, value, record_names = _parse(json.loads(line))
+                self.records[(kind, key)] = _decode(kind, value) if kind != "alias" else value
+                names.extend(record_names)
+        self.index = SimilarityIndex(names)
+
+    def field(self, name: str) -> Optional[FieldRecord]:
+        return self.records.get(("field", name))
+
+    def skill(self, name: str) -> Optional[SkillRecord]:
+        return self.records.get(("skill", name))
+
+    def market(self, field: str) -> Optional[MarketRecord]:
+        return self.records.get(("market", field))
+
+    def path(self, field: str, level: str) -> Optional[Tuple[str, ...]]:
+        return self.records.get(("path", f"{field}\t{level}"))
+
+    def match(self, text: str, k: int = 5, min_score: float = MATCH_THRESHOLD) -> List[Tuple[CatalogEntry, float]]:
+        return [(match.key, match.score) for match in self.index.search(text, k=k, min_score=min_score, whole_words=True)]
+
+    def field_names(self) -> List[str]:
+        return [key for kind, key in self.records if kind == "field"]
+
+
+def call(tools: CareerTools, lookup: List[str]) -> Dict:
+    kind, *args = lookup
+    if kind == "field":
+        return tools.get_field_info(*args)
+    if kind == "skill":
+        return tools.get_skill_details(args[0], "")
+    if kind == "market":
+        return tools.get_job_market_data(*args)
+    return tools.get_learning_path(*args)
+
+
+def resident_kb() -> Dict[str, int]:
+    """Resident memory now (all and anonymous) and at its peak, from /proc on Linux; else the peak for all.
+
+    /proc's peak starts afresh in a new program, where ru_maxrss keeps the parent's.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            fields = {key: int(value.split()[0]) for key, value in (line.split(":", 1) for line in status)
+                      if key in ("VmRSS", "RssAnon", "VmHWM")}
+        return {"rss": fields["VmRSS"], "private": fields["RssAnon"], "peak": fields["VmHWM"]}
+    except (OSError, KeyError):
+        return {"rss": rss_kb(), "private": rss_kb(), "peak": rss_kb()}
+
+
+def timed(func, items) -> List[float]:
+    latencies = []
+    for item in items:
+        started = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def worker(mode: str, args) -> Dict:
+    plan = json.loads(Path(args.plan).read_text(encoding="utf-8"))
+    before = resident_kb()
+    started = time.perf_counter()
+    catalog = MemoryCatalog(args.source) if mode == "memory" else DiskCatalog(args.catalog, cache_size=args.cache)
+    tools = CareerTools(catalog)
+    start = time.perf_counter() - started
+    first = timed(lambda lookup: call(tools, lookup), plan["lookups"][:1])[0]
+    paged = timed(lambda lookup: call(tools, lookup), plan["lookups"][1:])
+    warm = timed(lambda lookup: call(tools, lookup), plan["lookups"][1:args.cache + 1] * 3)
+    match = timed(tools.get_field_info, plan["messages"])
+    found = sum("error" not in tools.get_field_info(message) for message in plan["messages"])
+    return {"start_s": start, "first_s": first, "paged": summarize(paged), "warm": summarize(warm),
+            "match": summarize(match), "matched": found / len(plan["messages"]),
+            "memory_kb": {key: value - before[key] for key, value in resident_kb().items()}}
+
+
+def launch(mode: str, args) -> Dict:
+    completed = subprocess.run([sys.executable, "-m", "benchmarks.bench_catalog_disk", "--worker", mode,
+                                "--source", args.source, "--catalog", args.catalog, "--plan", args.plan,
+                                "--cache", str(args.cache)], cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{mode} failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def plan(records: List[Dict[str, Any]], lookups: int, seed: int) -> Dict[str, List]:
+    """Distinct tool calls in random order, and messages naming a field by one of its job roles"""
+    rng = random.Random(seed + 1)
+    calls = []
+    for record in rng.sample(records, lookups):
+        if record["kind"] == "field":
+            calls.append(["field", record["field"].upper()])
+        elif record["kind"] == "skill":
+            calls.append(["skill", record["name"]])
+        elif record["kind"] == "market":
+            calls.append(["market", record["field"]])
+        else:
+            calls.append(["path", record["field"], record["level"]])
+    roles = [role for record in records if record["kind"] == "field" for role in record["job_roles"]]
+    messages = [f"I think I'd like to work as a {rng.choice(roles).lower()}" for _ in range(lookups // 10)]
+    return {"lookups": calls, "messages": messages}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--lookups", type=int, default=2000, help="distinct tool calls per worker")
+    parser.add_argument("--cache", type=int, default=256, help="DiskCatalog LRU size")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--worker", choices=["memory", "disk"], help=argparse.SUPPRESS)
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    parser.add_argument("--catalog", help=argparse.SUPPRESS)
+    parser.add_argument("--plan", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(worker(args.worker, args)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        records = list(taxonomy(args.entries, args.seed))
+        args.source = str(Path(directory) / "taxonomy.jsonl")
+        args.catalog = str(Path(directory) / "catalog.db")
+        args.plan = str(Path(directory) / "plan.json")
+        with open(args.source, "w", encoding="utf-8") as output:
+            output.writelines(json.dumps(record) + "\n" for record in records)
+        Path(args.plan).write_text(json.dumps(plan(records, args.lookups, args.seed)), encoding="utf-8")
+        started = time.perf_counter()
+        build_catalog(args.catalog, records)
+        build = time.perf_counter() - started
+        print(f"{len(records)} records: taxonomy {Path(args.source).stat().st_size / 2**20:.1f} MB, "
+              f"catalog file {Path(args.catalog).stat().st_size / 2**20:.1f} MB built in {build:.1f}s")
+        results = {mode: launch(mode, args) for mode in ("memory", "disk")}
+
+    print(f"{args.lookups} lookups per worker, DiskCatalog cache {args.cache}")
+    print(f"{'mode':>7} {'start ms':>9} {'first ms':>9} {'paged p50':>10} {'paged p99':>10} {'warm p50':>9} "
+          f"{'warm p99':>9} {'match p50':>10} {'match p99':>10} {'matched':>8} {'rss MB':>7} {'private MB':>11} {'peak MB':>8}")
+    for mode, result in results.items():
+        print(f"{mode:>7} {result['start_s'] * 1e3:>9.1f} {result['first_s'] * 1e3:>9.3f} "
+              f"{result['paged']['p50_ms']:>10.3f} {result['paged']['p99_ms']:>10.3f} "
+              f"{result['warm']['p50_ms']:>9.3f} {result['warm']['p99_ms']:>9.3f} "
+              f"{result['match']['p50_ms']:>10.3f} {result['match']['p99_ms']:>10.3f} "
+              f"{result['matched']:>8.0%} {result['memory_kb']['rss'] / 1024:>7.1f} "
+              f"{result['memory_kb']['private'] / 1024:>11.1f} {result['memory_kb']['peak'] / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""New-session latency with a fresh client per chat vs the shared ClientRegistry.
+
+Each simulated session does what ``on_chat_start`` plus the first turn does: obtain a
+client, then send one chat completion to a local fake OpenAI-compatible server.
+Requires the ``openai`` and ``httpx`` packages from the apps' requirements.
+
+Run from the repository root: python -m benchmarks.bench_clients
+"""
+import asyncio
+import statistics
+import time
+
+from openai import AsyncOpenAI
+
+from benchmarks.fake_server import FakeModelServer
+from common.clients import ClientRegistry
+
+
+def _model(model, openai_client):
+    return model
+
+
+async def first_turn(client) -> None:
+    await client.chat.completions.create(model="fake-model", messages=[{"role": "user", "content": "hi"}])
+
+
+async def unpooled_session(base_url: str) -> float:
+    started = time.perf_counter()
+    client = AsyncOpenAI(api_key="test", base_url=base_url)
+    await first_turn(client)
+    elapsed = time.perf_counter() - started
+    await client.close()
+    return elapsed
+
+
+async def pooled_session(registry: ClientRegistry, base_url: str) -> float:
+    started = time.perf_counter()
+    client, _ = registry.get(base_url, "test", "fake-model", client_cls=AsyncOpenAI, model_cls=_model)
+    await first_turn(client)
+    return time.perf_counter() - started
+
+
+async def main(sessions=200, concurrency=20):
+    async with FakeModelServer(first_token_latency=0.0, tokens=5) as server:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(factory):
+            async with semaphore:
+                return await factory()
+
+        unpooled = await asyncio.gather(*(limited(lambda: unpooled_session(server.base_url)) for _ in range(sessions)))
+        connections = server.connections
+        registry = ClientRegistry(max_connections=concurrency, max_keepalive_connections=concurrency)
+        registry.client(server.base_url, "test", client_cls=AsyncOpenAI)
+        await registry.warm_up()
+        pooled = await asyncio.gather(*(limited(lambda: pooled_session(registry, server.base_url)) for _ in range(sessions)))
+        await registry.aclose()
+        print(f"{'mode':>9} {'p50 ms':>8} {'p95 ms':>8} {'connections':>12}")
+        for name, samples, opened in (("unpooled", unpooled, connections), ("pooled", pooled, server.connections - connections)):
+            ordered = sorted(samples)
+            print(f"{name:>9} {statistics.median(ordered) * 1e3:>8.2f} {ordered[int(len(ordered) * 0.95)] * 1e3:>8.2f} {opened:>12}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""Turn deadlines and the circuit breaker against an upstream that stalls or fails.
+
+Turns stream from a local FakeModelServer through HedgedModel (two candidates,
+as the apps use) the way the travel and game handlers do: inside
+``breaker.attempt()`` and ``deadline.iterate``. The phases run in order against
+one breaker:
+
+- ``healthy``: replies finish well within the deadline.
+- ``slow``: tokens trickle, the deadline cuts replies short and the streamed part
+  is kept. The provider did answer, so the breaker stays closed.
+- ``hang``: the server stops answering. Turns end at the deadline until the breaker
+  opens, and then fail fast without reaching the server.
+- ``recovered``: once the breaker's reset time has passed, one turn probes alone
+  and the rest stream again.
+- ``fail``: the server returns 503s. The breaker opens after ``--failures`` errors.
+- ``recovered``: the same as above.
+
+After the phases, no task beyond those present before may be left running, and
+no connection may be left open on the server. The exit status is 1 otherwise.
+
+Run from the repository root: python -m benchmarks.bench_deadlines
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.bench_hedging import SSEModel
+from benchmarks.fake_server import FakeModelServer
+from benchmarks.loadtest import summarize
+from common.breaker import CircuitBreaker, CircuitOpen
+from common.deadlines import Deadline, DeadlineExceeded
+from common.hedging import HedgedModel
+
+
+async def turn(model: HedgedModel, breaker: CircuitBreaker, seconds: float) -> Dict:
+    deadline = Deadline(seconds)
+    started = time.perf_counter()
+    tokens = 0
+    try:
+        with breaker.attempt() as call:
+            async for _ in deadline.iterate(model.stream_response()):
+                call.responded()
+                tokens += 1
+        outcome = "complete"
+    except DeadlineExceeded:
+        outcome = "partial" if tokens else "deadline"
+    except CircuitOpen:
+        outcome = "circuit_open"
+    except ConnectionError:
+        outcome = "error"
+    return {"outcome": outcome, "seconds": time.perf_counter() - started, "tokens": tokens}
+
+
+async def phase(name: str, server: FakeModelServer, model: HedgedModel, breaker: CircuitBreaker, args,
+                probe: bool = False) -> None:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    before = server.requests
+    # A probe turn on its own first; the rest would be turned away while it is in flight
+    first = [await turn(model, breaker, args.deadline)] if probe else []
+
+    async def one() -> Dict:
+        async with semaphore:
+            return await turn(model, breaker, args.deadline)
+
+    results: List[Dict] = first + await asyncio.gather(*(one() for _ in range(args.turns - len(first))))
+    outcomes: Dict[str, int] = {}
+    for result in results:
+        outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+    latency = summarize([result["seconds"] for result in results])
+    kept = [result["tokens"] for result in results if result["outcome"] == "partial"]
+    print(f"{name:>10} {latency['p50_ms']:>8.0f} {latency['p99_ms']:>8.0f} {server.requests - before:>9} "
+          f"{(sum(kept) / len(kept) if kept else 0):>12.1f} {breaker.state:>10}  "
+          + ", ".join(f"{outcome} {count}" for outcome, count in sorted(outcomes.items())))
+
+
+async def main_async(args) -> int:
+    baseline = len(asyncio.all_tasks())
+    async with FakeModelServer(first_token_latency=0.02, token_interval=0.002, tokens=20) as server:
+        model = HedgedModel([("primary", SSEModel(server.base_url)), ("fallback", SSEModel(server.base_url))],
+                            hedge_delay=args.deadline / 4)
+        breaker = CircuitBreaker("fake", failure_threshold=args.failures, reset_timeout=args.reset)
+        print(f"{args.turns} turns per phase, {args.concurrency} at a time; deadline {args.deadline * 1e3:.0f} ms, "
+              f"breaker opens after {args.failures} failures for {args.reset * 1e3:.0f} ms")
+        print(f"{'phase':>10} {'p50 ms':>8} {'p99 ms':>8} {'upstream':>9} {'partial tok':>12} {'breaker':>10}  outcomes")
+        await phase("healthy", server, model, breaker, args)
+
+        server.token_interval = args.deadline / 10
+        await phase("slow", server, model, breaker, args)
+        server.token_interval = 0.002
+
+        server.hang = True
+        await phase("hang", server, model, breaker, args)
+        server.hang = False
+        await asyncio.sleep(args.reset)
+        await phase("recovered", server, model, breaker, args, probe=True)
+
+        server.fail = True
+        await phase("fail", server, model, breaker, args)
+        server.fail = False
+        await asyncio.sleep(args.reset)
+        await phase("recovered", server, model, breaker, args, probe=True)
+
+        # Give closed sockets a moment to reach the server's handlers
+        await asyncio.sleep(0.1)
+        leaked = len(asyncio.all_tasks()) - baseline
+        open_connections = server.active
+    print(f"tasks left running: {leaked}, upstream connections left open: {open_connections}")
+    return 1 if leaked or open_connections else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--deadline", type=float, default=0.5, help="turn deadline in seconds")
+    parser.add_argument("--failures", type=int, default=5, help="failures in a row that open the breaker")
+    parser.add_argument("--reset", type=float, default=1.0, help="seconds the breaker stays open before probing")
+    return asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
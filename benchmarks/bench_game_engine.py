@@ -0,0 +1,98 @@
+"""Share of game turns served without a model call, before and after the game engine.
+
+Simulated players send a mix of moves, sneaks, searches, item uses, inventory
+checks and free-form chat. ``legacy`` is the previous routing: only sneak and item
+messages had a local shortcut (an unseeded dice roll or random event) and every
+other turn went to the model. ``engine`` resolves actions against the per-session
+game state and leaves the rest to the model. Every engine game is then replayed
+from its seed and action log and must reproduce the same state.
+
+Run from the repository root: python -m benchmarks.bench_game_engine
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.loadtest import summarize
+from common.router import IntentRouter
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "game-agent"))
+from engine import ITEMS, LOCATIONS, GameState, engine
+
+# The game app's routing before the engine; sneak and item were its only local paths
+LEGACY_ROUTER = IntentRouter(
+    routes=[
+        ("sneak", ["sneak", "sneaking", "evade", "evading"]),
+        ("obstacle", ["trap", "traps", "guard", "guards", "obstacle", "obstacles"]),
+        ("item", ["item", "items", "find", "treasure", "key", "keys", "map", "maps"]),
+    ],
+    default="narrate",
+)
+LEGACY_LOCAL = {"sneak", "item"}
+
+ACTIONS = [
+    (0.25, ["go to the {location}", "head to the {location}", "let's walk over to the {location}", "I visit the {location}"]),
+    (0.15, ["sneak past", "I try to evade it", "slip past quietly", "sneak around the obstacle"]),
+    (0.2, ["search the room", "look around", "find the treasure", "explore the area", "inspect the shelves"]),
+    (0.08, ["use the {item}", "bribe the guard with a coin", "open the gate with the key", "tie the rope to the beam"]),
+    (0.05, ["check my inventory", "what's in my bag?"]),
+    (0.27, ["I attack the guard", "talk to the guard", "who built this fountain?", "tell me more about the town",
+            "I ask the shopkeeper about the legend", "I'm a clever detective hunting for gold", "jump over the trap"]),
+]
+
+
+def player_message(rng: random.Random) -> str:
+    pick = rng.random()
+    for weight, templates in ACTIONS:
+        pick -= weight
+        if pick <= 0:
+            break
+    return rng.choice(templates).format(location=rng.choice(list(LOCATIONS)), item=rng.choice(list(ITEMS)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=40)
+    args = parser.parse_args(argv)
+    rng = random.Random(7)
+    scripts = [[player_message(rng) for _ in range(args.turns)] for _ in range(args.sessions)]
+    total = args.sessions * args.turns
+
+    legacy_local = sum(LEGACY_ROUTER.route(text.lower()).route in LEGACY_LOCAL for script in scripts for text in script)
+
+    games, latencies = [], []
+    local = 0
+    for index, script in enumerate(scripts):
+        game = engine.new_game(seed=index)
+        for text in script:
+            # Each turn loads and stores the state through the session's JSON values, as the app does
+            started = time.perf_counter()
+            game = GameState.from_dict(json.loads(json.dumps(game.as_dict())))
+            reply = engine.resolve(game, text)
+            elapsed = time.perf_counter() - started
+            if reply is not None:
+                local += 1
+                latencies.append(elapsed)
+        games.append(game)
+
+    started = time.perf_counter()
+    replayed = sum(engine.replay(game.seed, game.log).as_dict() == game.as_dict() for game in games)
+    replay_ms = (time.perf_counter() - started) / len(games) * 1e3
+    latency = summarize(latencies)
+
+    print(f"{args.sessions} sessions x {args.turns} turns")
+    print(f"{'mode':>7} {'local turns':>12} {'model calls':>12} {'local p50/p99 us':>17}")
+    print(f"{'legacy':>7} {legacy_local / total * 100:>11.1f}% {total - legacy_local:>12} {'-':>17}")
+    print(f"{'engine':>7} {local / total * 100:>11.1f}% {total - local:>12} "
+          f"{latency['p50_ms'] * 1e3:>8.1f}/{latency['p99_ms'] * 1e3:<8.1f}")
+    print(f"replay: {replayed}/{len(games)} games reproduced exactly, {replay_ms:.2f} ms per game; "
+          f"{sum(game.won for game in games)} games won")
+    assert replayed == len(games), "replay diverged from the recorded game"
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
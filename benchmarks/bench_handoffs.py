@@ -0,0 +1,94 @@
+"""Advisor invocations and latency per career-mentor turn.
+
+"double dispatch" replays the old handler behaviour, where the handler ran the
+advisor a second time after the mentor had already used it; "single dispatch" is the
+current ``CareerMentorAgent.respond``. Advisor answers are counted from ``respond``
+on the mentor (the field it returns) and on each advisor (a reply of its own). Exits
+with status 1 unless single dispatch answers every advisor turn exactly once.
+
+Run from the repository root: python -m benchmarks.bench_handoffs
+"""
+import argparse
+import sys
+import timeit
+from collections import Counter
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "career-mentor-agent"))
+from advisors import CareerMentorAgent
+
+CONVERSATION = [
+    "hello",
+    "I'm interested in software engineering",
+    "what jobs are there?",
+    "what skills should I learn?",
+    "how is the market demand?",
+    "tell me about finance instead",
+    "show me the learning path",
+    "thanks",
+]
+
+
+class Session(dict):
+    def set(self, key, value):
+        self[key] = value
+
+
+def counting(agent, turns: List[Counter]) -> None:
+    """Count advisor answers into ``turns[-1]`` from every agent's ``respond``"""
+    def instrument(target, answered_by):
+        inner = target.respond
+
+        def respond(history, session):
+            reply, handoff = inner(history, session)
+            field = answered_by(reply, handoff)
+            if field:
+                turns[-1][field] += 1
+            return reply, handoff
+        target.respond = respond
+
+    # The mentor returns the field of the advisor that answered; an advisor answering itself returns a reply
+    instrument(agent, lambda reply, handoff: handoff)
+    for field, advisor in agent.handoffs.items():
+        instrument(advisor, lambda reply, handoff, field=field: field if reply is not None else None)
+
+
+def run_conversation(agent, double_dispatch, turns=None):
+    session = Session()
+    for text in CONVERSATION:
+        if turns is not None:
+            turns.append(Counter())
+        history = [{"role": "user", "content": text}]
+        _, field = agent.respond(history, session)
+        if double_dispatch and field:
+            agent.handoffs[field].respond(history, session)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=5000, help="conversations timed per mode")
+    args = parser.parse_args(argv)
+    print(f"{'mode':>16} {'advisor calls/turn':>19} {'max':>4} {'us/turn':>8}")
+    status = 0
+    for name, double_dispatch in (("double dispatch", True), ("single dispatch", False)):
+        agent = CareerMentorAgent("Career Mentor Agent", "benchmark", None)
+        turns: List[Counter] = []
+        counting(agent, turns)
+        run_conversation(agent, double_dispatch, turns)
+        calls = [sum(turn.values()) for turn in turns]
+        # Timed on an agent without the counting wrappers
+        agent = CareerMentorAgent("Career Mentor Agent", "benchmark", None)
+        seconds = timeit.timeit(lambda: run_conversation(agent, double_dispatch), number=args.number)
+        print(f"{name:>16} {sum(calls) / len(calls):>19.2f} {max(calls):>4} "
+              f"{seconds / (args.number * len(CONVERSATION)) * 1e6:>8.2f}")
+        if not double_dispatch:
+            for text, turn in zip(CONVERSATION, turns):
+                if turn and sum(turn.values()) != 1:
+                    print(f"{name}: {dict(turn)} advisor calls for {text!r}")
+                    status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""Tail latency with a single provider vs HedgedModel over two providers.
+
+Two local FakeModelServers have the same latency profile, including a slow tail:
+``--slow-fraction`` of requests wait ``--slow-latency`` before the first token. Each
+request streams a reply through a minimal SSE client. ``hedged`` sends a second
+request to the other server once the first has been silent for ``--hedge-delay``.
+A second scenario makes the primary return errors, to show failover.
+
+Run from the repository root: python -m benchmarks.bench_hedging
+"""
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlparse
+
+from benchmarks.fake_server import FakeModelServer
+from benchmarks.loadtest import summarize
+from common.hedging import HedgedModel
+
+
+class SSEModel:
+    """Just enough of a streaming chat-completions client to drive the fake server"""
+
+    def __init__(self, base_url: str):
+        url = urlparse(base_url)
+        self.host, self.port, self.path = url.hostname, url.port, url.path + "chat/completions"
+
+    async def stream_response(self, *args, **kwargs):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            body = json.dumps({"model": "fake-model", "stream": True, "messages": [{"role": "user", "content": "hi"}]}).encode()
+            writer.write(f"POST {self.path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            status = await reader.readline()
+            if b" 200 " not in status:
+                raise ConnectionError(status.decode().strip())
+            while await reader.readline() not in (b"\r\n", b""):
+                pass
+            while True:
+                size = int((await reader.readline()).strip(), 16)
+                if not size:
+                    break
+                payload = (await reader.readexactly(size + 2))[:-2]
+                if payload.startswith(b"data: [DONE]"):
+                    continue
+                delta = json.loads(payload[6:])["choices"][0]["delta"].get("content")
+                if delta:
+                    yield delta
+        finally:
+            writer.close()
+
+
+async def run(model, requests: int, concurrency: int):
+    ttft, total = [], []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            first = None
+            try:
+                async for _ in model.stream_response():
+                    if first is None:
+                        first = time.perf_counter() - started
+            except ConnectionError:
+                errors += 1
+                return
+            ttft.append(first)
+            total.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return ttft, total, errors
+
+
+async def scenario(title, args, fail_primary=False):
+    profile = dict(first_token_latency=args.first_token_latency, jitter=0.3, token_interval=0.002, tokens=20,
+                   slow_fraction=args.slow_fraction, slow_latency=args.slow_latency)
+    async with FakeModelServer(seed=1, **profile) as primary, FakeModelServer(seed=2, **profile) as secondary:
+        primary.fail = fail_primary
+        print(title)
+        print(f"{'mode':>7} {'ttft p50/p95/p99 ms':>24} {'total p99 ms':>13} {'errors':>7} {'upstream requests':>18}")
+        models = {
+            "single": SSEModel(primary.base_url),
+            "hedged": HedgedModel([("primary", SSEModel(primary.base_url)), ("secondary", SSEModel(secondary.base_url))],
+                                  hedge_delay=args.hedge_delay),
+        }
+        for mode, model in models.items():
+            before = primary.requests + secondary.requests
+            ttft, total, errors = await run(model, args.requests, args.concurrency)
+            first, whole = summarize(ttft), summarize(total)
+            print(f"{mode:>7} {first['p50_ms']:>7.0f}/{first['p95_ms']:>6.0f}/{first['p99_ms']:>7.0f} "
+                  f"{whole['p99_ms']:>13.0f} {errors:>7} {primary.requests + secondary.requests - before:>18}")
+        print(f"hedged provider stats: {json.dumps(models['hedged'].metrics())}\n")
+
+
+async def main_async(args):
+    await scenario(f"{args.requests} requests, {args.slow_fraction:.0%} of them {args.slow_latency * 1e3:.0f} ms slow, "
+                   f"hedge after {args.hedge_delay * 1e3:.0f} ms", args)
+    await scenario("primary returning 503s", args, fail_primary=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--first-token-latency", type=float, default=0.05)
+    parser.add_argument("--slow-fraction", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=1.0)
+    parser.add_argument("--hedge-delay", type=float, default=0.1)
+    asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""Time-to-first-token over a 200-turn conversation: unbounded list vs ChatHistory.
+
+The fake model charges a fixed latency plus a prefill cost per prompt token, which is
+how provider latency scales with the size of the history sent on every turn.
+
+Run from the repository root: python -m benchmarks.bench_history
+"""
+import asyncio
+import time
+
+from common.history import ChatHistory, estimate_tokens
+
+BASE_LATENCY = 0.002
+PREFILL_PER_TOKEN = 0.000005
+USER_TURN = "Tell me more about things to do there, especially food markets and museums. " * 2
+ASSISTANT_TURN = "Here are some ideas for your trip, with local dishes and landmarks to visit. " * 8
+
+
+async def fake_stream(messages):
+    prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+    await asyncio.sleep(BASE_LATENCY + prompt_tokens * PREFILL_PER_TOKEN)
+    yield "first", prompt_tokens
+
+
+async def converse(history, as_input, turns):
+    samples = []
+    for turn in range(1, turns + 1):
+        history.append({"role": "user", "content": USER_TURN})
+        started = time.perf_counter()
+        async for _, prompt_tokens in fake_stream(as_input(history)):
+            samples.append((turn, time.perf_counter() - started, prompt_tokens))
+            break
+        history.append({"role": "assistant", "content": ASSISTANT_TURN})
+    return samples
+
+
+async def main(turns=200, budget=2000):
+    unbounded = await converse([], lambda history: history, turns)
+    bounded = await converse(ChatHistory(max_tokens=budget), lambda history: history.messages(), turns)
+    print(f"{'turn':>5} {'list ttft ms':>13} {'list tokens':>12} {'budgeted ttft ms':>17} {'budgeted tokens':>16}")
+    for (turn, list_ttft, list_tokens), (_, ttft, tokens) in zip(unbounded, bounded):
+        if turn in (1, 10, 50, 100, 150, 200):
+            print(f"{turn:>5} {list_ttft * 1e3:>13.2f} {list_tokens:>12} {ttft * 1e3:>17.2f} {tokens:>16}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""Memory and cold start: three app processes vs all three apps in host/main.py.
+
+``separate`` starts one interpreter per app, as running three Chainlit processes
+does. ``host`` starts one interpreter that mounts all three. Each process imports
+its app(s), builds them, and reports when it is ready. It then serves
+``--sessions`` headless sessions per app (the load test's scripts, against a local
+FakeModelServer) and reports its peak resident memory. Cold start is measured
+from launching the interpreter to ready. The separate processes are started one
+after another, so their sum is the CPU cost of bringing all three up.
+
+Run from the repository root: python -m benchmarks.bench_host
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.fake_server import FakeModelServer
+from benchmarks.headless import APPS, ROOT, HeadlessMessage, HeadlessSession, load_app, load_module
+from benchmarks.loadtest import SCRIPTS, rss_kb
+
+ENV = {
+    "GEMINI_API_KEY": "fake-key",
+    "OPENROUTER_API_KEY": "fake-key",
+    "GEMINI_MAX_CONCURRENCY": "1000",
+    "OPENROUTER_MAX_CONCURRENCY": "1000",
+    "OPENROUTER_RPS": "0",
+}
+
+
+async def serve(app: str, start, main, sessions: int, turns: int, profile=None) -> int:
+    served = 0
+
+    async def user(index: int) -> None:
+        nonlocal served
+        session = HeadlessSession(f"{app}-{index}")
+        session.activate()
+        if profile is not None:
+            session.values["chat_profile"] = profile
+        await start()
+        for turn in range(turns):
+            await main(HeadlessMessage(content=SCRIPTS[app][turn % len(SCRIPTS[app])]))
+            served += 1
+
+    await asyncio.gather(*(user(index) for index in range(sessions)))
+    return served
+
+
+async def worker(mode: str, app: str, sessions: int, turns: int) -> Dict:
+    async with FakeModelServer(first_token_latency=0.01, token_interval=0.001, tokens=20) as server:
+        env = dict(ENV, GEMINI_BASE_URL=server.base_url, OPENROUTER_BASE_URL=server.base_url)
+        if mode == "host":
+            host = load_module(ROOT / "host" / "main.py", "host_app", env)
+            host.build_apps()
+            ready_at = time.time()
+            rss_ready = rss_kb()
+            served = 0
+            for name in host.apps:
+                served += await serve(name, host.start, host.main, sessions, turns, profile=host.APPS[name][0])
+        else:
+            module = load_app(app, env)
+            module.app()
+            ready_at = time.time()
+            rss_ready = rss_kb()
+            served = await serve(app, module.start, module.main, sessions, turns)
+    return {"ready_at": ready_at, "rss_ready_kb": rss_ready, "rss_peak_kb": rss_kb(), "turns": served}
+
+
+def launch(mode: str, app: str, args) -> Dict:
+    launched = time.time()
+    completed = subprocess.run([sys.executable, "-m", "benchmarks.bench_host", "--worker", mode, "--app", app,
+                                "--sessions", str(args.sessions), "--turns", str(args.turns)],
+                               cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{mode} {app} failed:\n{completed.stderr.strip()}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["cold_start_s"] = result.pop("ready_at") - launched
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="sessions per app")
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=3, help="the run with the fastest cold start is reported")
+    parser.add_argument("--worker", choices=["separate", "host"], help=argparse.SUPPRESS)
+    parser.add_argument("--app", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(asyncio.run(worker(args.worker, args.app, args.sessions, args.turns))))
+        return
+
+    def best(runs: List[Dict]) -> Dict:
+        return min(runs, key=lambda result: result["cold_start_s"])
+
+    separate = {app: best([launch("separate", app, args) for _ in range(args.runs)]) for app in sorted(APPS)}
+    host = best([launch("host", "", args) for _ in range(args.runs)])
+
+    print(f"{args.sessions} sessions x {args.turns} turns per app; best of {args.runs} cold starts")
+    print(f"{'process':>10} {'cold start ms':>14} {'rss ready MB':>13} {'rss peak MB':>12} {'turns':>6}")
+    for app, result in separate.items():
+        print(f"{app:>10} {result['cold_start_s'] * 1e3:>14.0f} {result['rss_ready_kb'] / 1024:>13.1f} "
+              f"{result['rss_peak_kb'] / 1024:>12.1f} {result['turns']:>6}")
+    total = {key: sum(result[key] for result in separate.values()) for key in ("cold_start_s", "rss_ready_kb", "rss_peak_kb", "turns")}
+    print(f"{'3 separate':>10} {total['cold_start_s'] * 1e3:>14.0f} {total['rss_ready_kb'] / 1024:>13.1f} "
+          f"{total['rss_peak_kb'] / 1024:>12.1f} {total['turns']:>6}")
+    print(f"{'host':>10} {host['cold_start_s'] * 1e3:>14.0f} {host['rss_ready_kb'] / 1024:>13.1f} "
+          f"{host['rss_peak_kb'] / 1024:>12.1f} {host['turns']:>6}")
+    print(f"host saves {(1 - host['rss_peak_kb'] / total['rss_peak_kb']) * 100:.0f}% peak memory "
+          f"({(total['rss_peak_kb'] - host['rss_peak_kb']) / 1024:.1f} MB) and "
+          f"{(1 - host['cold_start_s'] / total['cold_start_s']) * 100:.0f}% of the combined cold start "
+          f"({(total['cold_start_s'] - host['cold_start_s']) * 1e3:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
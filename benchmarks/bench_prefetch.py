@@ -0,0 +1,110 @@
+"""Follow-up turn latency in the travel flow, with and without speculative prefetch.
+
+Each session first names a destination (a DestinationAgent turn streamed from a
+local FakeModelServer), reads the reply for ``--think`` seconds, then follows up:
+``--booking`` of them ask to book (two tool calls of ``--tool-latency`` each, as a
+live airline/hotel API would take), ``--explore`` ask what to do there (a model
+reply), and the rest change course to another destination, which cancels what was
+warmed. ``prefetch`` warms the booking tools and an explore draft once the
+destination appears, exactly as the travel app does with PREFETCH_EXPLORE=1.
+
+Run from the repository root: python -m benchmarks.bench_prefetch
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from benchmarks.bench_hedging import SSEModel
+from benchmarks.fake_server import FakeModelServer
+from benchmarks.loadtest import summarize
+from common.prefetch import Prefetcher
+from common.tools import ToolExecutor
+
+DESTINATIONS = ["Dubai", "New York", "Bangkok", "Lahore", "Cairo"]
+
+
+async def simulate(mode: str, server: FakeModelServer, args) -> None:
+    async def fetch_airlines(destination: str) -> str:
+        await asyncio.sleep(args.tool_latency)
+        return f"Airlines to {destination}"
+
+    async def recommend_lodging(destination: str) -> str:
+        await asyncio.sleep(args.tool_latency)
+        return f"Lodging in {destination}"
+
+    # Live fares and rooms change, so nothing is memoized across sessions here
+    tools = ToolExecutor({"fetch_airlines": fetch_airlines, "recommend_lodging": recommend_lodging}, timeout=10.0)
+    model = SSEModel(server.base_url)
+    prefetcher = Prefetcher(ttl=60.0)
+    rng = random.Random(3)
+    latency = {"booking": [], "explore": [], "explore_ttft": []}
+
+    def booking_calls(destination):
+        return [("fetch_airlines", {"destination": destination}), ("recommend_lodging", {"destination": destination})]
+
+    async def reply() -> str:
+        return "".join([delta async for delta in model.stream_response()])
+
+    async def session(index: int) -> None:
+        session_id = str(index)
+        destination = rng.choice(DESTINATIONS)
+        follow_up = rng.random()
+        await asyncio.sleep(rng.random() * args.think)
+        if mode == "prefetch":
+            prefetcher.prefetch(session_id, ("booking", destination), lambda: tools.run(booking_calls(destination)))
+            prefetcher.prefetch(session_id, ("explore", destination), reply)
+        await reply()
+        await asyncio.sleep(args.think)
+
+        started = time.perf_counter()
+        if follow_up < args.booking:
+            plan = await prefetcher.get(session_id, ("booking", destination)) if mode == "prefetch" else None
+            plan = plan or await tools.run(booking_calls(destination))
+            latency["booking"].append(time.perf_counter() - started)
+        elif follow_up < args.booking + args.explore:
+            draft = await prefetcher.get(session_id, ("explore", destination)) if mode == "prefetch" else None
+            if draft:
+                latency["explore_ttft"].append(time.perf_counter() - started)
+            else:
+                first = None
+                async for _ in model.stream_response():
+                    if first is None:
+                        first = time.perf_counter() - started
+                latency["explore_ttft"].append(first)
+            latency["explore"].append(time.perf_counter() - started)
+        else:
+            prefetcher.cancel(session_id)
+            await reply()
+
+    before = server.requests
+    await asyncio.gather(*(session(index) for index in range(args.sessions)))
+    booking, explore, ttft = summarize(latency["booking"]), summarize(latency["explore"]), summarize(latency["explore_ttft"])
+    print(f"{mode:>8} {booking['p50_ms']:>7.0f}/{booking['p99_ms']:<7.0f} {ttft['p50_ms']:>7.0f}/{ttft['p99_ms']:<7.0f} "
+          f"{explore['p50_ms']:>7.0f}/{explore['p99_ms']:<7.0f} {server.requests - before:>15}")
+    if mode == "prefetch":
+        print(f"prefetch metrics: {json.dumps(prefetcher.metrics())}")
+
+
+async def main_async(args) -> None:
+    async with FakeModelServer(first_token_latency=args.first_token_latency, token_interval=0.01, tokens=40) as server:
+        print(f"{args.sessions} sessions, {args.think:.1f} s between turns, tools {args.tool_latency * 1e3:.0f} ms")
+        print(f"{'mode':>8} {'booking p50/p99 ms':>15} {'explore ttft p50/p99':>15} {'explore total':>15} {'model requests':>15}")
+        for mode in ("baseline", "prefetch"):
+            await simulate(mode, server, args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--think", type=float, default=1.0, help="seconds the user spends before the follow-up")
+    parser.add_argument("--tool-latency", type=float, default=0.3)
+    parser.add_argument("--first-token-latency", type=float, default=0.4)
+    parser.add_argument("--booking", type=float, default=0.5, help="share of follow-ups that book")
+    parser.add_argument("--explore", type=float, default=0.35, help="share of follow-ups that explore")
+    asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
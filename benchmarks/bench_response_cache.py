@@ -0,0 +1,171 @@
+"""Response cache hit rate, latency and correctness through the travel app's real handler.
+
+Headless sessions (see benchmarks/headless.py) send scripted conversations to the
+travel app's ``main`` handler, with ``agents.Runner`` replaced by a stub model whose
+reply is a function of everything it is given: the agent and the whole model
+input (normalized as the cache normalizes it). Sessions arrive ``--arrival``
+seconds apart. Many sessions open with the same question ("What to eat in Bangkok?") and
+then ask follow-ups that only make sense in context ("what should I eat there?",
+"yes", "mid-range"). Every mode is compared turn by turn with a run with the
+cache off: a reply that differs was served from another conversation's entry
+(``wrong``). ``conversation`` is the app's cache; ``last-message`` keys on the last
+message only, as the cache first did. Hits never reach the stub model.
+
+Run from the repository root: python -m benchmarks.bench_response_cache
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.headless import HeadlessMessage, HeadlessSession, load_app
+from common.cache import ResponseCache, normalize
+
+OPENERS = [
+    "What to eat in Bangkok?",
+    "what to eat in bangkok",
+    "I want a relaxing beach holiday",
+    "Somewhere cheap with great food please",
+    "What should I see in Cairo?",
+    "Things to do in Dubai!",
+]
+FOLLOW_UPS = ["what should I eat there?", "yes", "mid-range", "Tell me more about it", "is it good for kids?"]
+
+MODES = {
+    "off": dict(max_entries=0),
+    "conversation": dict(max_entries=512, ttl=600.0),
+    "last-message": dict(max_entries=512, ttl=600.0, history_turns=1),
+}
+
+
+class StubDelta:
+    __slots__ = ("delta",)
+
+    def __init__(self, delta: str):
+        self.delta = delta
+
+
+class StubEvent:
+    __slots__ = ("type", "data")
+
+    def __init__(self, delta: str):
+        self.type = "raw_response_event"
+        self.data = StubDelta(delta)
+
+
+class StubResult:
+    def __init__(self, reply: str, latency: float):
+        self.reply = reply
+        self.latency = latency
+        self.final_output = ""
+
+    async def stream_events(self):
+        await asyncio.sleep(self.latency)
+        for word in self.reply.split(" "):
+            self.final_output += word + " "
+            yield StubEvent(word + " ")
+
+    def cancel(self) -> None:
+        pass
+
+
+class StubRunner:
+    """Stands in for ``agents.Runner``: the reply is a digest of the agent and its whole input"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def reply(self, agent, input) -> str:
+        seen = [agent.name] + [f"{message['role']}:{normalize(message['content'])}" for message in input]
+        digest = hashlib.sha1(json.dumps(seen).encode()).hexdigest()[:12]
+        return f"{agent.name} answers {digest} " + " ".join(f"token{index}" for index in range(20))
+
+    def run_streamed(self, agent, input, **kwargs) -> StubResult:
+        self.calls += 1
+        return StubResult(self.reply(agent, input), self.latency)
+
+    async def run(self, agent, input, **kwargs) -> StubResult:
+        result = self.run_streamed(agent, input)
+        async for _ in result.stream_events():
+            pass
+        return result
+
+
+def scripts(sessions: int, turns: int, seed: int) -> List[List[str]]:
+    rng = random.Random(seed)
+    return [[rng.choice(OPENERS)] + [rng.choice(FOLLOW_UPS) for _ in range(turns - 1)] for _ in range(sessions)]
+
+
+async def run_mode(module, runner: StubRunner, mode: str, conversations: List[List[str]],
+                   arrival: float) -> Tuple[Dict, List[List[str]]]:
+    module.response_cache = ResponseCache(**MODES[mode])
+    calls = runner.calls
+    hit_times: List[float] = []
+    miss_times: List[float] = []
+    replies: List[List[str]] = [[] for _ in conversations]
+
+    async def conversation(index: int, script: List[str]) -> None:
+        await asyncio.sleep(index * arrival)
+        session = HeadlessSession(f"{mode}-{index}")
+        session.activate()
+        await module.start()
+        for text in script:
+            before = runner.calls
+            started = time.perf_counter()
+            await module.main(HeadlessMessage(content=text))
+            (miss_times if runner.calls > before else hit_times).append(time.perf_counter() - started)
+            replies[index].append(session.messages[-1].content)
+
+    await asyncio.gather(*(conversation(index, script) for index, script in enumerate(conversations)))
+    stats = module.response_cache.stats()
+    return {"model_calls": runner.calls - calls, "hits": stats["hits"], "misses": stats["misses"],
+            "hit_us": sum(hit_times) / max(len(hit_times), 1) * 1e6,
+            "miss_ms": sum(miss_times) / max(len(miss_times), 1) * 1e3}, replies
+
+
+async def main_async(args) -> int:
+    module = load_app("travel", env={
+        "GEMINI_API_KEY": "fake-key",
+        "GEMINI_MAX_CONCURRENCY": "1000",
+        "PREFETCH_EXPLORE": "0",
+    })
+    runner = StubRunner(args.latency)
+    import agents
+    agents.Runner = runner
+
+    conversations = scripts(args.sessions, args.turns, args.seed)
+    results = {mode: await run_mode(module, runner, mode, conversations, args.arrival) for mode in MODES}
+    expected = results["off"][1]
+    print(f"{args.sessions} sessions x {args.turns} turns, stub model latency {args.latency * 1e3:.0f} ms")
+    print(f"{'mode':>13} {'model calls':>12} {'hits':>6} {'hit us':>8} {'miss ms':>8} {'wrong':>6}")
+    status = 0
+    for mode, (stats, replies) in results.items():
+        wrong = sum(got != want for session, want_session in zip(replies, expected)
+                    for got, want in zip(session, want_session))
+        print(f"{mode:>13} {stats['model_calls']:>12} {stats['hits']:>6} {stats['hit_us']:>8.0f} "
+              f"{stats['miss_ms']:>8.1f} {wrong:>6}")
+        if stats["model_calls"] != stats["misses"]:
+            print(f"{mode}: {stats['model_calls']} model calls for {stats['misses']} cache misses")
+            status = 1
+        if mode == "conversation" and wrong:
+            status = 1
+    return status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub model time to first token, seconds")
+    parser.add_argument("--arrival", type=float, default=0.01, help="seconds between sessions starting")
+    parser.add_argument("--seed", type=int, default=3)
+    return asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
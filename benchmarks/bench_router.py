@@ -0,0 +1,47 @@
+"""Per-message routing cost as keyword tables grow.
+
+Run from the repository root: python -m benchmarks.bench_router
+"""
+import random
+import string
+import timeit
+
+from common.router import IntentRouter
+
+MESSAGES = [
+    "I want to book a flight to New York next month",
+    "What should I eat and see in Bangkok?",
+    "Can you recommend somewhere relaxing for a family trip on a mid-range budget?",
+    "this is a long message that mentions nothing in particular but goes on for a while " * 3,
+]
+
+
+def make_words(count: int, rng: random.Random):
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(count)]
+
+
+def naive_route(tables, text):
+    text = text.lower()
+    for name, words in tables:
+        if any(word in text for word in words):
+            return name
+    return None
+
+
+def main(sizes=(10, 100, 1000, 5000), number=500):
+    rng = random.Random(7)
+    print(f"{'keywords':>9} {'naive us/msg':>13} {'router us/msg':>14}")
+    for size in sizes:
+        tables = [
+            ("booking", ["book", "hotel", "flight"] + make_words(size, rng)),
+            ("explore", ["see", "explore", "eat"] + make_words(size, rng)),
+        ]
+        router = IntentRouter(tables, default="destination")
+        naive = timeit.timeit(lambda: [naive_route(tables, m) for m in MESSAGES], number=number)
+        compiled = timeit.timeit(lambda: [router.route(m) for m in MESSAGES], number=number)
+        per_message = number * len(MESSAGES) / 1e6
+        print(f"{size * 2:>9} {naive / per_message:>13.2f} {compiled / per_message:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""Does one slow advisor delay other sessions? Direct sync respond vs Runner.run.
+
+One session hits an advisor whose ``respond`` blocks for ``slow_seconds``; the others hit
+a fast advisor. Calling ``respond`` inline in the async handler stalls every session
+behind the slow one; ``Runner.run`` offloads it to the runner's thread pool.
+
+Run from the repository root: python -m benchmarks.bench_runner
+"""
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "career-mentor-agent"))
+from agents import Runner
+
+
+class SlowAdvisor:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def respond(self, history, session):
+        time.sleep(self.seconds)
+        return ("slow answer", None)
+
+
+class FastAdvisor:
+    def respond(self, history, session):
+        return ("fast answer", None)
+
+
+async def inline_handler(agent, history):
+    return agent.respond(history, None)[0]
+
+
+async def runner_handler(agent, history):
+    result = await Runner.run(agent, history, context=None)
+    return result.final_output
+
+
+async def load(handler, sessions, slow_seconds):
+    history = [{"role": "user", "content": "what skills should I learn?"}]
+    latencies = []
+    start = time.perf_counter()
+
+    async def fast_session(delay):
+        # Latency counts from when the message arrived, including time spent waiting on a blocked loop
+        await asyncio.sleep(delay)
+        await handler(FastAdvisor(), history)
+        latencies.append(time.perf_counter() - (start + delay))
+
+    slow = asyncio.create_task(handler(SlowAdvisor(slow_seconds), history))
+    await asyncio.gather(*(fast_session(index * slow_seconds / sessions) for index in range(sessions)))
+    await slow
+    return latencies
+
+
+def main(sessions=50, slow_seconds=0.5):
+    print(f"{sessions} fast sessions alongside one advisor blocking for {slow_seconds * 1e3:.0f} ms")
+    print(f"{'handler':>8} {'p50 ms':>8} {'max ms':>8}")
+    for name, handler in (("inline", inline_handler), ("runner", runner_handler)):
+        latencies = sorted(asyncio.run(load(handler, sessions, slow_seconds)))
+        print(f"{name:>8} {statistics.median(latencies) * 1e3:>8.2f} {latencies[-1] * 1e3:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
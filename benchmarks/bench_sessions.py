@@ -0,0 +1,85 @@
+"""Resident memory held by idle sessions, before and after the session store.
+
+Each mode runs in its own subprocess: it creates N sessions with a few turns of
+history, arriving one simulated second apart with a 60 s idle TTL, and reports the
+RSS growth once all of them are idle. ``user_session`` is the old layout (a live
+ChatHistory and values per session in a dict); ``memory`` compacts idle sessions to
+compressed blobs in-process; ``memory+sqlite`` evicts them to a SQLite file;
+``sqlite`` keeps nothing in memory between turns.
+
+Run from the repository root: python -m benchmarks.bench_sessions
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from common.history import ChatHistory
+from common.sessions import MemorySessionStore, SQLiteSessionStore
+
+MODES = ["user_session", "memory", "memory+sqlite", "sqlite"]
+USER = "I'd like a relaxing trip somewhere warm with good food, session {index} turn {turn}"
+ASSISTANT = ("Here are a few ideas for a warm, food-focused getaway: Bangkok for street food markets and "
+             "riverside temples, Cairo for koshari and the pyramids at sunset, Dubai for the old souks and "
+             "desert dinners. Tell me your budget and who is travelling and I'll narrow it down. ") * 2
+
+
+def rss_kb() -> int:
+    with open("/proc/self/statm") as handle:
+        return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def fill(history: ChatHistory, index: int, turns: int) -> None:
+    for turn in range(turns):
+        history.append({"role": "user", "content": USER.format(index=index, turn=turn)})
+        # Model replies are distinct strings in practice; don't let every session share one object
+        history.append({"role": "assistant", "content": f"{ASSISTANT}({index}.{turn})"})
+
+
+def worker(mode: str, sessions: int, turns: int, directory: str) -> dict:
+    new_history = lambda: ChatHistory(max_tokens=2000)
+    clock = [0.0]
+    before = rss_kb()
+    if mode == "user_session":
+        store = {}
+        for index in range(sessions):
+            history = new_history()
+            fill(history, index, turns)
+            store[f"session-{index}"] = {"chat_history": history, "current_agent": "DestinationAgent", "current_field": None}
+    else:
+        if mode == "sqlite":
+            store = SQLiteSessionStore(os.path.join(directory, "sessions.db"), "bench", new_history)
+        else:
+            spill = SQLiteSessionStore(os.path.join(directory, "sessions.db"), "bench", new_history) if mode == "memory+sqlite" else None
+            store = MemorySessionStore(new_history, idle_ttl=60.0, spill=spill, clock=lambda: clock[0])
+        for index in range(sessions):
+            # Sessions arrive one simulated second apart, so earlier ones go idle while later ones are created
+            clock[0] += 1.0
+            session = store.session(f"session-{index}")
+            session.set("current_agent", "DestinationAgent")
+            fill(session.history, index, turns)
+            store.save(session)
+        if isinstance(store, MemorySessionStore):
+            clock[0] += 120.0
+            store.evict_idle()
+    after = rss_kb()
+    return {"mode": mode, "rss_mb": round((after - before) / 1024, 1), "bytes_per_session": (after - before) * 1024 // sessions}
+
+
+def main(sessions: int = 10000, turns: int = 4):
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        with tempfile.TemporaryDirectory() as directory:
+            print(json.dumps(worker(sys.argv[2], sessions, turns, directory)))
+        return
+    print(f"{sessions} idle sessions, {turns} turns each")
+    print(f"{'mode':>14} {'rss MB':>8} {'bytes/session':>14}")
+    for mode in MODES:
+        completed = subprocess.run([sys.executable, "-m", "benchmarks.bench_sessions", "--worker", mode],
+                                   capture_output=True, text=True, check=True)
+        result = json.loads(completed.stdout)
+        print(f"{mode:>14} {result['rss_mb']:>8} {result['bytes_per_session']:>14}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""Fuzzy catalog matching: a naive Python loop vs SimilarityIndex, at catalog sizes up to 100k.
+
+The catalog is the career catalog's real fields, skills, roles and aliases, padded
+with generated names of one to three made-up words ("tobira velunist", ...) from
+a vocabulary of thousands, as in a real occupation and skill taxonomy. Each query is
+a chat message that mentions one entry, sometimes by a close word form
+("nursing" for "Nurse"). ``naive`` scores every entry in a Python loop, with the
+same n-gram containment score as the index but without hashing. ``postings`` is
+SimilarityIndex without NumPy and ``numpy`` is the vectorized one. ``agree`` is
+the share of queries whose best entry scores the same as the naive loop's (equal
+scores may pick different entries; a hash collision can change a score). Query latency
+is reported per message. Build time is reported separately.
+
+Run from the repository root: python -m benchmarks.bench_similarity
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.loadtest import summarize
+from common.similarity import SimilarityIndex, _load_numpy, ngrams
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "career-mentor-agent"))
+from catalog import CATALOG
+
+CONSONANTS = "bcdfghjklmnprstvwz"
+VOWELS = "aeiou"
+ENDINGS = ["", "n", "r", "s", "l", "ist", "er", "ic", "ian", "ology"]
+TEMPLATES = ["I think I'd like to be a {}", "what does a {} do all day?", "is {} a good career", "tell me about {}",
+             "how do I get into {} work", "my friend is a {}, is that for me?"]
+
+
+def word(rng: random.Random) -> str:
+    syllables = "".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(rng.randint(2, 3)))
+    return syllables + rng.choice(ENDINGS)
+
+
+def catalog_entries(size: int, seed: int) -> List[Tuple[str, str]]:
+    """The career catalog's own entries, then generated names of 1-3 words up to ``size``"""
+    entries = [(text, text) for text in CATALOG.index.texts]
+    rng = random.Random(seed)
+    # A vocabulary of a few thousand words, as in a real occupation and skill taxonomy
+    vocabulary = sorted({word(rng) for _ in range(max(2000, size // 20))})
+    seen = {text.lower() for text, _ in entries}
+    while len(entries) < size:
+        name = " ".join(rng.choice(vocabulary) for _ in range(rng.choice((1, 2, 2, 3))))
+        if name not in seen:
+            seen.add(name)
+            entries.append((name, name))
+    return entries[:size]
+
+
+def queries(entries: List[Tuple[str, str]], count: int, seed: int) -> List[str]:
+    rng = random.Random(seed + 1)
+    messages = []
+    for _ in range(count):
+        text = rng.choice(entries)[0].lower()
+        if rng.random() < 0.3:
+            # A nearby word form: "nurse" -> "nursing", "accountant" -> "accountants"
+            words = text.split()
+            words[-1] = words[-1].rstrip("e") + rng.choice(["ing", "s", "ers"])
+            text = " ".join(words)
+        messages.append(rng.choice(TEMPLATES).format(text))
+    return messages
+
+
+class NaiveMatcher:
+    """The same containment score, computed by looping over every entry"""
+
+    def __init__(self, entries: List[Tuple[str, str]]):
+        self.entries: List[Tuple[str, Dict[str, float]]] = []
+        for text, _ in entries:
+            grams = ngrams(text)
+            weights: Dict[str, float] = {}
+            for gram in grams:
+                weights[gram] = weights.get(gram, 0.0) + 1 / len(grams)
+            self.entries.append((text, weights))
+
+    def best(self, message: str):
+        present = set(ngrams(message))
+        best_text, best_score = None, 0.0
+        for text, weights in self.entries:
+            score = sum(weight for gram, weight in weights.items() if gram in present)
+            if score > best_score:
+                best_text, best_score = text, score
+        return best_text, best_score
+
+
+def timed(func, messages: List[str]) -> Tuple[List[float], List]:
+    latencies, results = [], []
+    for message in messages:
+        started = time.perf_counter()
+        results.append(func(message))
+        latencies.append(time.perf_counter() - started)
+    return latencies, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--naive-queries", type=int, default=20, help="the naive loop is slow; it sees this many")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    modes = ["postings"] + (["numpy"] if _load_numpy() else [])
+    if len(modes) == 1:
+        print("NumPy is not installed: only the pure-Python index is measured")
+
+    print(f"{'entries':>8} {'mode':>9} {'build ms':>9} {'p50 ms':>8} {'p99 ms':>8} {'agree':>6}")
+    for size in args.sizes:
+        entries = catalog_entries(size, args.seed)
+        messages = queries(entries, args.queries, args.seed)
+        naive = NaiveMatcher(entries)
+        latencies, expected = timed(naive.best, messages[:args.naive_queries])
+        latency = summarize(latencies)
+        print(f"{size:>8} {'naive':>9} {'-':>9} {latency['p50_ms']:>8.3f} {latency['p99_ms']:>8.3f} {'-':>6}")
+        for mode in modes:
+            started = time.perf_counter()
+            index = SimilarityIndex(entries, vectorized=mode == "numpy")
+            build = time.perf_counter() - started
+
+            def best(message: str):
+                match = index.best(message)
+                return (match.text, match.score) if match else (None, 0.0)
+
+            best(messages[0])  # warm-up
+            latencies, found = timed(best, messages)
+            agree = sum(abs(a[1] - b[1]) < 1e-9 for a, b in zip(found, expected)) / len(expected)
+            latency = summarize(latencies)
+            print(f"{size:>8} {mode:>9} {build * 1e3:>9.0f} {latency['p50_ms']:>8.3f} {latency['p99_ms']:>8.3f} {agree:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""Cold-start import time of each app, from ``python -X importtime``, against a budget.
+
+Each app's ``main.py`` is imported in a fresh interpreter with no API keys set.
+``app`` is the import time of everything except Chainlit, whose decorators have
+to run at import; it is checked against ``--budget-ms`` (median of ``--runs``).
+The import must also leave the model SDK, HTTP clients and dotenv unloaded and
+the app unbuilt. ``first use`` is the time of the first ``app()`` call (keys,
+clients, agents), with a placeholder key, where the SDK is installed.
+Exits with status 1 when an app is over budget or imports something it should not.
+
+Run from the repository root: python -m benchmarks.bench_startup
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+from benchmarks.headless import APPS
+
+# Nothing here may be loaded just by importing an app
+DEFERRED = ("openai", "httpx", "dotenv", "requests", "pydantic", "numpy")
+
+PROBE = """
+import json, os, sys, time
+# Placeholder keys are set only after the import, which must not need them
+keys = {{name: os.environ.pop(name) for name in ("GEMINI_API_KEY", "OPENROUTER_API_KEY")}}
+import main
+loaded = sorted(name for name in {deferred!r} if name in sys.modules)
+# The career app's own agents/ shim is light; the installed SDK is not
+loaded += ["agents"] if "agents" in sys.modules and "site-packages" in (sys.modules["agents"].__file__ or "") else []
+built = main.app.built
+os.environ.update(keys)
+started = time.perf_counter()
+try:
+    main.app()
+    first_use = (time.perf_counter() - started) * 1e3
+except ImportError:
+    first_use = None
+print(json.dumps({{"loaded": loaded, "built": built, "first_use_ms": first_use}}))
+"""
+
+
+def import_times(stderr: str) -> Dict[str, int]:
+    """Cumulative microseconds per module from -X importtime output"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(app: str, env: Dict[str, str]) -> Dict:
+    directory = APPS[app].parent
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=directory,
+                            env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {app} failed:\n{result.stderr[-2000:]}")
+    times = import_times(result.stderr)
+    total = times["main"]
+    chainlit = times.get("chainlit", 0)
+    return {"total_ms": total / 1e3, "chainlit_ms": chainlit / 1e3, "app_ms": (total - chainlit) / 1e3}
+
+
+def probe(app: str, env: Dict[str, str]) -> Dict:
+    directory = APPS[app].parent
+    probe_env = dict(env, GEMINI_API_KEY="placeholder", OPENROUTER_API_KEY="placeholder")
+    result = subprocess.run([sys.executable, "-c", PROBE.format(deferred=DEFERRED)], cwd=directory, env=probe_env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"probing {app} failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="app import time budget, excluding Chainlit")
+    parser.add_argument("--apps", nargs="*", default=list(APPS))
+    args = parser.parse_args(argv)
+    env = {name: value for name, value in os.environ.items() if not name.endswith("_API_KEY")}
+
+    failures: List[str] = []
+    print(f"median of {args.runs} cold imports, budget {args.budget_ms:.0f} ms")
+    print(f"{'app':>7} {'total ms':>9} {'chainlit':>9} {'app ms':>9} {'first use':>10}  deferred")
+    for app in args.apps:
+        runs = [measure(app, env) for _ in range(args.runs)]
+        median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        checked = probe(app, env)
+        first_use = "-" if checked["first_use_ms"] is None else f"{checked['first_use_ms']:.1f}"
+        problems = [f"loads {', '.join(checked['loaded'])}"] if checked["loaded"] else []
+        problems += ["builds the app"] if checked["built"] else []
+        print(f"{app:>7} {median['total_ms']:>9.1f} {median['chainlit_ms']:>9.1f} {median['app_ms']:>9.1f} {first_use:>10}  "
+              f"{'; '.join(problems) or 'ok'}")
+        if median["app_ms"] > args.budget_ms:
+            failures.append(f"{app}: {median['app_ms']:.1f} ms over the {args.budget_ms:.0f} ms budget")
+        failures.extend(f"{app}: import {problem}" for problem in problems)
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""Frames and CPU per session when streaming deltas directly vs through BufferedStream.
+
+Simulates many concurrent sessions receiving model deltas at a steady token rate. The
+fake message serializes one websocket-style frame per ``stream_token`` call.
+
+Run from the repository root: python -m benchmarks.bench_streaming
+"""
+import asyncio
+import json
+import time
+
+from common.streaming import BufferedStream
+
+
+class FakeMessage:
+    def __init__(self):
+        self.content = ""
+        self.frames = 0
+
+    async def stream_token(self, token):
+        self.content += token
+        self.frames += 1
+        json.dumps({"type": "stream_token", "id": "message-id", "token": token, "isSequence": False})
+        await asyncio.sleep(0)
+
+
+async def session(buffered, tokens, token_interval):
+    message = FakeMessage()
+    writer = BufferedStream(message) if buffered else message
+    for index in range(tokens):
+        await writer.stream_token(f"tok{index} ")
+        await asyncio.sleep(token_interval)
+    if buffered:
+        await writer.flush()
+    return message.frames
+
+
+async def run(buffered, sessions, tokens, token_interval):
+    cpu = time.process_time()
+    frames = await asyncio.gather(*(session(buffered, tokens, token_interval) for _ in range(sessions)))
+    return sum(frames), time.process_time() - cpu
+
+
+def main(sessions=500, tokens=200, token_interval=0.002):
+    print(f"{sessions} sessions x {tokens} tokens, one token every {token_interval * 1e3:.0f} ms")
+    print(f"{'mode':>9} {'frames':>8} {'cpu ms/session':>15}")
+    for name, buffered in (("direct", False), ("buffered", True)):
+        frames, cpu = asyncio.run(run(buffered, sessions, tokens, token_interval))
+        print(f"{name:>9} {frames:>8} {cpu / sessions * 1e3:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""Turn latency with artificially slow tools: sequential calls vs ToolExecutor.
+
+Run from the repository root: python -m benchmarks.bench_tools
+"""
+import asyncio
+import time
+
+from common.tools import ToolExecutor
+
+
+def fetch_airlines(destination: str) -> str:
+    time.sleep(0.20)
+    return f"airlines to {destination}"
+
+
+def recommend_lodging(destination: str) -> str:
+    time.sleep(0.15)
+    return f"lodging in {destination}"
+
+
+async def check_weather(destination: str) -> str:
+    await asyncio.sleep(0.25)
+    return f"weather in {destination}"
+
+
+TOOLS = {"fetch_airlines": fetch_airlines, "recommend_lodging": recommend_lodging, "check_weather": check_weather}
+CALLS = [(name, {"destination": "Dubai"}) for name in TOOLS]
+
+
+async def sequential_turn():
+    results = []
+    for name, kwargs in CALLS:
+        tool = TOOLS[name]
+        results.append(await tool(**kwargs) if asyncio.iscoroutinefunction(tool) else tool(**kwargs))
+    return results
+
+
+async def main():
+    started = time.perf_counter()
+    await sequential_turn()
+    sequential = time.perf_counter() - started
+
+    executor = ToolExecutor(TOOLS, pure=["fetch_airlines", "recommend_lodging"])
+    started = time.perf_counter()
+    await executor.run(CALLS)
+    concurrent = time.perf_counter() - started
+    started = time.perf_counter()
+    await executor.run(CALLS)
+    memoized = time.perf_counter() - started
+
+    print("slowest tool 250 ms, sum of tools 600 ms")
+    print(f"sequential turn       {sequential * 1e3:7.1f} ms")
+    print(f"concurrent turn       {concurrent * 1e3:7.1f} ms")
+    print(f"concurrent, memoized  {memoized * 1e3:7.1f} ms")
+    for name, stats in executor.metrics().items():
+        print(f"  {name:<18} " + " ".join(f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}" for key, value in stats.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""Per-turn cost of tracing at full sampling, against no tracing and the old print() logging.
+
+Each simulated turn follows the travel handler: route, cache lookup, a tool call, a
+streamed model reply through BufferedStream and the session write. ``print`` mode
+dumps the whole history plus both messages per turn, as the career handlers used to.
+``traced`` records every phase with a JSONL exporter at sample rate 1.0.
+
+Overhead is the CPU added per turn as a share of the untraced turn latency. The
+realistic scenario has model latency; the zero-latency one runs a single session so
+it shows the worst case, where the turn itself is nothing but local work.
+
+Run from the repository root: python -m benchmarks.bench_tracing
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from common.cache import ResponseCache
+from common.history import ChatHistory
+from common.router import IntentRouter
+from common.streaming import BufferedStream
+from common.tools import ToolExecutor
+from common.tracing import JsonlExporter, Tracer
+
+ROUTER = IntentRouter(
+    routes=[("booking", ["book", "hotel", "flight"]), ("explore", ["see", "explore", "eat"])],
+    entities={"Dubai": ["dubai"], "Bangkok": ["bangkok"], "Cairo": ["cairo"]},
+    default="destination",
+)
+MESSAGES = ["What to eat in Bangkok?", "Something relaxing near the sea", "What can I see in Cairo?", "Tell me about Dubai"]
+
+
+class FakeMessage:
+    def __init__(self):
+        self.content = ""
+
+    async def stream_token(self, token):
+        self.content += token
+
+
+def lookup(destination: str) -> str:
+    return f"Lodging in {destination}"
+
+
+async def user(index, mode, tracer, turns, tokens, first_token, token_interval, devnull):
+    history = ChatHistory(max_tokens=2000)
+    cache = ResponseCache()
+    tools = ToolExecutor({"lookup": lookup}, inline=["lookup"])
+    latencies = []
+    for number in range(turns):
+        text = MESSAGES[(index + number) % len(MESSAGES)]
+        started = time.perf_counter()
+        turn = tracer.start_turn("bench", f"session-{index}")
+        history.append({"role": "user", "content": text})
+        with turn.span("routing") as span:
+            route = ROUTER.route(text)
+            span.set("route", route.route)
+        with turn.span("cache") as span:
+            key = cache.key("Agent", "instructions", "model", history)
+            span.set("hit", cache.get(key) is not None)
+        await tools.call("lookup", destination=route.entity or "anywhere")
+        msg = BufferedStream(FakeMessage())
+        with turn.stream(agent="Agent") as stream:
+            await asyncio.sleep(first_token)
+            for position in range(tokens):
+                stream.token()
+                await msg.stream_token(f"tok{position} ")
+                if token_interval:
+                    await asyncio.sleep(token_interval)
+        await msg.flush()
+        with turn.span("session_write"):
+            history.append({"role": "assistant", "content": msg.content})
+        if mode == "print":
+            print("\n[CALLING_AGENT_WITH_CONTEXT]\n", history.messages(), "\n", file=devnull)
+            print(f"User: {text}", file=devnull)
+            print(f"Assistant: {msg.content}", file=devnull)
+        turn.end()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def run(mode, tracer, sessions, turns, tokens, first_token, token_interval):
+    with open(os.devnull, "w") as devnull:
+        cpu = time.process_time()
+        results = await asyncio.gather(*(user(index, mode, tracer, turns, tokens, first_token, token_interval, devnull)
+                                         for index in range(sessions)))
+        cpu = time.process_time() - cpu
+    latencies = [latency for result in results for latency in result]
+    return sum(latencies) / len(latencies), cpu / len(latencies)
+
+
+def scenario(title, sessions, turns, tokens, first_token, token_interval):
+    print(f"{title}: {sessions} sessions x {turns} turns, {tokens} tokens, first token after {first_token * 1e3:.0f} ms")
+    print(f"{'mode':>7} {'mean turn ms':>13} {'cpu us/turn':>12} {'added us':>9} {'overhead':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        traced = Tracer(JsonlExporter(os.path.join(directory, "traces.jsonl")), sample_rate=1.0)
+        modes = (("none", Tracer()), ("print", Tracer()), ("traced", traced))
+        baseline = None
+        for mode, tracer in modes:
+            latency, cpu = asyncio.run(run(mode, tracer, sessions, turns, tokens, first_token, token_interval))
+            if baseline is None:
+                baseline = (latency, cpu)
+            # CPU added per turn as a share of turn latency; wall-clock deltas are dominated by sleep jitter
+            added = cpu - baseline[1]
+            print(f"{mode:>7} {latency * 1e3:>13.3f} {cpu * 1e6:>12.1f} {added * 1e6:>9.1f} {added / baseline[0] * 100:>8.2f}%")
+        traced.flush()
+        with open(os.path.join(directory, "traces.jsonl")) as handle:
+            exported = sum(1 for _ in handle)
+        print(f"exported {exported} traced turns, dropped {traced.dropped}\n")
+
+
+def main():
+    scenario("with model latency", sessions=200, turns=5, tokens=40, first_token=0.05, token_interval=0.002)
+    scenario("zero latency (worst case)", sessions=1, turns=4000, tokens=40, first_token=0.0, token_interval=0.0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
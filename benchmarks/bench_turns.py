@@ -0,0 +1,147 @@
+"""Rapid consecutive messages in one session, with and without the TurnCoordinator.
+
+Each session sends a burst of ``--burst`` messages ``--gap`` seconds apart, faster
+than a reply takes to stream. The handler has the same shape as the apps': it
+appends the user message, runs a tool call, then streams a reply from a fake
+``run_streamed`` whose upstream generation runs in its own task, as the SDK's does.
+On cancellation it stops the run, keeps the partial reply and re-raises.
+
+``none`` runs every message at once, as the apps did. ``serialize`` and
+``supersede`` go through a TurnCoordinator. The script checks that every assistant
+message answers the user message just before it, that the history ends with the
+full reply to the last message, and that no tasks are left behind, and it reports
+the upstream tokens generated and the time until the last message is answered.
+
+Run from the repository root: python -m benchmarks.bench_turns
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.loadtest import summarize
+from common.history import ChatHistory
+from common.turns import SERIALIZE, SUPERSEDE, TurnCoordinator
+
+MODES = ["none", SERIALIZE, SUPERSEDE]
+
+
+class FakeRun:
+    """Streaming run whose upstream generation continues until it finishes or is cancelled"""
+
+    def __init__(self, reply: str, tokens: int, interval: float, counter: list):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.ensure_future(self._generate(reply, tokens, interval, counter))
+
+    async def _generate(self, reply, tokens, interval, counter):
+        for index in range(tokens):
+            await asyncio.sleep(interval)
+            counter[0] += 1
+            self.queue.put_nowait(f"{reply}:{index} ")
+        self.queue.put_nowait(None)
+
+    async def stream_events(self):
+        while True:
+            token = await self.queue.get()
+            if token is None:
+                return
+            yield token
+
+    def cancel(self) -> None:
+        self._task.cancel()
+
+
+async def handle_turn(history: ChatHistory, text: str, args, counter: list, done: dict) -> None:
+    history.append({"role": "user", "content": text})
+    content = []
+    result = None
+    try:
+        await asyncio.sleep(args.tool_latency)
+        result = FakeRun(f"re[{text}]", args.tokens, args.token_interval, counter)
+        async for token in result.stream_events():
+            content.append(token)
+        history.append({"role": "assistant", "content": "".join(content)})
+        done[text] = time.perf_counter()
+    except asyncio.CancelledError:
+        if result is not None:
+            result.cancel()
+        if content:
+            history.append({"role": "assistant", "content": "".join(content)})
+        raise
+
+
+def check(history: ChatHistory, last: str, tokens: int) -> bool:
+    """Every reply follows its own message and the last message got a full reply"""
+    messages = history.messages()
+    for previous, message in zip(messages, messages[1:]):
+        if message["role"] == "assistant":
+            if previous["role"] != "user" or not message["content"].startswith(f"re[{previous['content']}]"):
+                return False
+    return (len(messages) >= 2 and messages[-2]["content"] == last
+            and messages[-1]["content"].count(f"re[{last}]") == tokens)
+
+
+async def simulate(mode: str, args) -> None:
+    coordinator = TurnCoordinator(mode) if mode != "none" else None
+    counter = [0]
+    consistent = 0
+    latencies = []
+
+    async def session(index: int) -> None:
+        nonlocal consistent
+        history = ChatHistory(max_tokens=100000, summarize=False)
+        done = {}
+        sent = []
+        for turn in range(args.burst):
+            text = f"s{index}m{turn}"
+            if coordinator is None:
+                sent.append(asyncio.ensure_future(handle_turn(history, text, args, counter, done)))
+            else:
+                sent.append(asyncio.ensure_future(coordinator.run(
+                    str(index), lambda text=text: handle_turn(history, text, args, counter, done))))
+            if turn < args.burst - 1:
+                await asyncio.sleep(args.gap)
+        last_sent = time.perf_counter()
+        await asyncio.gather(*sent)
+        last = f"s{index}m{args.burst - 1}"
+        latencies.append(done[last] - last_sent)
+        consistent += check(history, last, args.tokens)
+
+    await asyncio.gather(*(session(index) for index in range(args.sessions)))
+    await asyncio.sleep(args.token_interval * 2)
+    leaked = len(asyncio.all_tasks()) - 1
+    latency = summarize(latencies)
+    superseded = coordinator.superseded if coordinator else 0
+    print(f"{mode:>9} {counter[0]:>9} {superseded:>10} {consistent:>5}/{args.sessions:<5} "
+          f"{latency['p50_ms']:>7.0f}/{latency['p99_ms']:<7.0f} {leaked:>7}")
+    if coordinator is not None:
+        assert consistent == args.sessions, f"{mode}: inconsistent history"
+        assert leaked == 0, f"{mode}: {leaked} tasks left running"
+        assert not coordinator.metrics()["sessions"], f"{mode}: per-session state not released"
+    if mode == SUPERSEDE and args.gap < args.tool_latency + args.tokens * args.token_interval:
+        assert superseded == args.sessions * (args.burst - 1), "expected every earlier turn to be superseded"
+    if mode == SERIALIZE:
+        assert counter[0] == args.sessions * args.burst * args.tokens
+
+
+async def main_async(args) -> None:
+    reply = args.tool_latency + args.tokens * args.token_interval
+    print(f"{args.sessions} sessions x {args.burst} messages {args.gap * 1e3:.0f} ms apart, "
+          f"{reply * 1e3:.0f} ms per reply ({args.tokens} tokens)")
+    print(f"{'mode':>9} {'upstream':>9} {'superseded':>10} {'consistent':>11} {'last reply p50/p99 ms':>15} {'leaked':>7}")
+    for mode in MODES:
+        await simulate(mode, args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--burst", type=int, default=3)
+    parser.add_argument("--gap", type=float, default=0.1, help="seconds between a session's messages")
+    parser.add_argument("--tokens", type=int, default=40)
+    parser.add_argument("--token-interval", type=float, default=0.01)
+    parser.add_argument("--tool-latency", type=float, default=0.05)
+    asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""Local fake OpenAI-compatible model server for benchmarks.
+
+Speaks just enough HTTP/1.1 (with keep-alive) to serve ``GET /models`` and
+``POST /chat/completions``, streamed as server-sent events when ``"stream": true``.
+Latency, token rate and jitter are configurable; ``slow_fraction`` of requests wait
+``slow_latency`` before the first token instead, to model a tail. ``hang`` and
+``fail`` let benchmarks inject stalled or erroring upstreams: while ``hang`` is
+set, requests stall before answering (until it is cleared or the server stops).
+``active`` counts connections still open.
+"""
+import asyncio
+import json
+import random
+import time
+from typing import Optional
+
+
+class FakeModelServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, first_token_latency: float = 0.05,
+                 token_interval: float = 0.005, jitter: float = 0.0, tokens: int = 40, seed: Optional[int] = None,
+                 slow_fraction: float = 0.0, slow_latency: float = 1.0):
+        self.host = host
+        self.port = port
+        self.first_token_latency = first_token_latency
+        self.token_interval = token_interval
+        self.jitter = jitter
+        self.tokens = tokens
+        self.slow_fraction = slow_fraction
+        self.slow_latency = slow_latency
+        self.hang = False
+        self.fail = False
+        self.connections = 0
+        self.active = 0
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1/"
+
+    async def start(self) -> "FakeModelServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        self.hang = False
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def _delay(self, base: float) -> float:
+        return max(0.0, base + self._random.uniform(-self.jitter, self.jitter) * base)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self.active += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.requests += 1
+                await self._respond(method, path, json.loads(body) if body else {}, writer)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active -= 1
+            writer.close()
+
+    async def _respond(self, method: str, path: str, body: dict, writer: asyncio.StreamWriter) -> None:
+        while self.hang:
+            await asyncio.sleep(0.01)
+        if self.fail:
+            return self._send(writer, 503, {"error": {"message": "upstream unavailable"}})
+        if path.rstrip("/").endswith("/models"):
+            return self._send(writer, 200, {"object": "list", "data": [{"id": "fake-model", "object": "model"}]})
+        if not path.rstrip("/").endswith("/chat/completions"):
+            return self._send(writer, 404, {"error": {"message": "not found"}})
+        model = body.get("model", "fake-model")
+        slow = self.slow_fraction and self._random.random() < self.slow_fraction
+        await asyncio.sleep(self.slow_latency if slow else self._delay(self.first_token_latency))
+        if not body.get("stream"):
+            text = " ".join(f"word{index}" for index in range(self.tokens))
+            return self._send(writer, 200, {
+                "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": self.tokens, "total_tokens": self.tokens},
+            })
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\nConnection: keep-alive\r\n\r\n")
+        for index in range(self.tokens):
+            if index:
+                await asyncio.sleep(self._delay(self.token_interval))
+            delta = {"role": "assistant", "content": f"word{index} "} if index == 0 else {"content": f"word{index} "}
+            self._chunk(writer, {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                                 "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+            await writer.drain()
+        self._chunk(writer, {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                             "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _send(self, writer: asyncio.StreamWriter, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n".encode() + body)
+
+    def _chunk(self, writer: asyncio.StreamWriter, payload: dict) -> None:
+        self._write_chunk(writer, b"data: " + json.dumps(payload).encode() + b"\n\n")
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+
+async def _serve(port: int) -> None:
+    async with FakeModelServer(port=port) as server:
+        print(f"Fake model server listening on {server.base_url}")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    import sys
+    asyncio.run(_serve(int(sys.argv[1]) if len(sys.argv) > 1 else 8765))
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""Drive the apps' real Chainlit handlers without a browser or websocket server.
+
+``load_app`` imports an app's ``main.py`` and swaps the ``cl`` module it (and its
+helpers) call at runtime for ``HeadlessChainlit``, which keeps one ``user_session``
+per simulated session in a context variable and records every outgoing message.
+The apps still need Chainlit installed, since its decorators run at import.
+"""
+import contextvars
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+APPS = {
+    "travel": ROOT / "ai-travel agent" / "main.py",
+    "game": ROOT / "game-agent" / "main.py",
+    "career": ROOT / "career-mentor-agent" / "main.py",
+}
+
+_current: contextvars.ContextVar = contextvars.ContextVar("headless_session")
+
+
+class HeadlessUserSession:
+    def get(self, key, default=None):
+        return _current.get().values.get(key, default)
+
+    def set(self, key, value):
+        _current.get().values[key] = value
+
+
+class HeadlessSession:
+    """State and outgoing traffic of one simulated user"""
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.values: Dict[str, object] = {"id": session_id}
+        self.messages: List["HeadlessMessage"] = []
+        self.first_output_at: Optional[float] = None
+        self.frames = 0
+
+    def activate(self) -> None:
+        _current.set(self)
+
+    def output(self) -> None:
+        self.frames += 1
+        if self.first_output_at is None:
+            self.first_output_at = time.perf_counter()
+
+
+class HeadlessMessage:
+    def __init__(self, content: str = "", author: Optional[str] = None, **kwargs):
+        self.content = content
+        self.author = author
+        self.session = _current.get(None)
+
+    async def send(self):
+        if self.session is not None:
+            self.session.messages.append(self)
+        return self
+
+    async def stream_token(self, token: str, is_sequence: bool = False):
+        self.content = token if is_sequence else self.content + token
+        if self.session is not None and token:
+            self.session.output()
+
+    async def update(self):
+        if self.session is not None:
+            self.session.output()
+        return True
+
+
+class HeadlessChainlit:
+    """Stand-in for the ``chainlit`` module as seen by handlers at call time"""
+
+    def __init__(self, chainlit_module):
+        self._chainlit = chainlit_module
+        self.user_session = HeadlessUserSession()
+        self.Message = HeadlessMessage
+
+    def __getattr__(self, name):
+        return getattr(self._chainlit, name)
+
+
+def load_app(name: str, env: Optional[Dict[str, str]] = None):
+    """Import an app's main module and route its Chainlit calls through HeadlessChainlit"""
+    path = APPS[name]
+    sys.path.insert(0, str(path.parent))
+    return load_module(path, f"{name}_app", env)
+
+
+def load_module(path: Path, module_name: str, env: Optional[Dict[str, str]] = None):
+    """Import any Chainlit entry point (such as host/main.py) with its Chainlit calls made headless"""
+    os.environ.update(env or {})
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    import chainlit
+    headless = HeadlessChainlit(chainlit)
+    for loaded in list(sys.modules.values()):
+        if getattr(loaded, "cl", None) is chainlit:
+            loaded.cl = headless
+    return module
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""Headless load test of the three apps against a local fake model server.
+
+Runs N concurrent simulated sessions through each app's real ``start``/``main``
+handlers and reports time-to-first-token, turn latency, throughput and memory per
+session. Each app runs in its own subprocess (the career app ships its own
+``agents`` package, and it keeps memory numbers separate). Results are written as
+JSON under ``benchmarks/results/`` so runs can be compared across commits.
+
+Run from the repository root:
+    python -m benchmarks.loadtest --sessions 100 --turns 4 --token-interval 0.005 --jitter 0.3
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.fake_server import FakeModelServer
+from benchmarks.headless import APPS, ROOT, HeadlessMessage, HeadlessSession, load_app
+
+SCRIPTS = {
+    "travel": [
+        "I love food and culture, mid-range budget, travelling as a couple",
+        "What to eat in Bangkok?",
+        "Book a flight and hotel to Bangkok",
+        "Something relaxing near the sea instead",
+    ],
+    "game": [
+        "I'm a curious explorer and I head to the old library",
+        "I sneak past the guard",
+        "I search for the treasure map",
+        "I talk to the locals in the town square",
+    ],
+    "career": [
+        "hello",
+        "I'm interested in software engineering",
+        "what skills should I learn?",
+        "what jobs are there?",
+        "thanks",
+    ],
+}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {name: round(percentile(samples, fraction) * 1e3, 3) for name, fraction in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99))}
+
+
+def rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def run_app(app: str, sessions: int, turns: int, think_time: float, server: FakeModelServer) -> Dict:
+    module = load_app(app, env={
+        "GEMINI_API_KEY": "fake-key",
+        "OPENROUTER_API_KEY": "fake-key",
+        "GEMINI_BASE_URL": server.base_url,
+        "OPENROUTER_BASE_URL": server.base_url,
+        # The fake server has no rate limits; keep real-tier admission limits out of the way unless set explicitly
+        **{name: os.environ.get(name, value) for name, value in (
+            ("GEMINI_MAX_CONCURRENCY", "1000"), ("OPENROUTER_MAX_CONCURRENCY", "1000"), ("OPENROUTER_RPS", "0"))},
+    })
+    script = SCRIPTS[app]
+    ttft: List[float] = []
+    latency: List[float] = []
+    errors = 0
+    users: List[HeadlessSession] = []
+
+    async def user(index: int) -> None:
+        nonlocal errors
+        session = HeadlessSession(f"{app}-{index}")
+        session.activate()
+        users.append(session)
+        await module.start()
+        for turn in range(turns):
+            session.first_output_at = None
+            started = time.perf_counter()
+            try:
+                await module.main(HeadlessMessage(content=script[turn % len(script)]))
+            except Exception:
+                errors += 1
+                continue
+            finished = time.perf_counter()
+            latency.append(finished - started)
+            if session.first_output_at is not None:
+                ttft.append(session.first_output_at - started)
+            if think_time:
+                await asyncio.sleep(think_time)
+
+    rss_before = rss_kb()
+    started = time.perf_counter()
+    await asyncio.gather(*(user(index) for index in range(sessions)))
+    elapsed = time.perf_counter() - started
+    rss_after = rss_kb()
+    return {
+        "app": app,
+        "sessions": sessions,
+        "turns": len(latency),
+        "errors": errors,
+        "ttft": summarize(ttft),
+        "turn_latency": summarize(latency),
+        "throughput_turns_per_s": round(len(latency) / elapsed, 2) if elapsed else 0.0,
+        "memory_kb_per_session": round((rss_after - rss_before) / sessions, 2),
+        "frames_per_turn": round(sum(user.frames for user in users) / max(len(latency), 1), 2),
+        "model_requests": server.requests,
+    }
+
+
+async def worker(args) -> Dict:
+    async with FakeModelServer(first_token_latency=args.first_token_latency, token_interval=args.token_interval,
+                               jitter=args.jitter, tokens=args.tokens, seed=1) as server:
+        return await run_app(args.app, args.sessions, args.turns, args.think_time, server)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", choices=sorted(APPS) + ["all"], default="all")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds between a user's turns")
+    parser.add_argument("--first-token-latency", type=float, default=0.2)
+    parser.add_argument("--token-interval", type=float, default=0.01, help="seconds between streamed tokens")
+    parser.add_argument("--jitter", type=float, default=0.2, help="relative jitter applied to both delays")
+    parser.add_argument("--tokens", type=int, default=40, help="tokens per model reply")
+    parser.add_argument("--output", type=Path, default=ROOT / "benchmarks" / "results")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(asyncio.run(worker(args))))
+        return
+
+    apps = sorted(APPS) if args.app == "all" else [args.app]
+    forwarded = []
+    for option in ("sessions", "turns", "think_time", "first_token_latency", "token_interval", "jitter", "tokens"):
+        forwarded += ["--" + option.replace("_", "-"), str(getattr(args, option))]
+    results = []
+    for app in apps:
+        completed = subprocess.run([sys.executable, "-m", "benchmarks.loadtest", "--worker", "--app", app] + forwarded,
+                                   cwd=ROOT, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{app}: failed\n{completed.stderr.strip()}", file=sys.stderr)
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(f"{app:>7} ttft p50/p95/p99 {result['ttft']['p50_ms']}/{result['ttft']['p95_ms']}/{result['ttft']['p99_ms']} ms  "
+              f"turn p50/p95/p99 {result['turn_latency']['p50_ms']}/{result['turn_latency']['p95_ms']}/{result['turn_latency']['p99_ms']} ms  "
+              f"{result['throughput_turns_per_s']} turns/s  {result['memory_kb_per_session']} KB/session  errors={result['errors']}")
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    revision = git_revision()
+    report = {
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "worker", "app")},
+        "results": results,
+    }
+    path = args.output / f"loadtest-{revision}-{int(time.time())}.json"
+    path.write_text(json.dumps(report, indent=2))
+    print(f"results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
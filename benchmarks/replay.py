@@ -0,0 +1,261 @@
+"""Replay recorded conversations through the apps' real handlers, to time our own code.
+
+Conversations recorded with RECORD_FILE (see ``common/recording.py``) are driven
+through each app's ``start``/``main`` handlers headlessly. For the travel and game
+apps the model is replaced by the recording: every streamed model call gets the
+next recorded call of that turn, its deltas released on their recorded offsets
+divided by ``--speed``. The career mentor's replies come from its own catalog, so
+they run for real. Sessions start and think at their recorded times too
+(``--speed 10`` is ten times faster, ``--speed 0`` does not wait at all).
+
+Per turn, ``provider`` is the time the replayed model took and ``overhead`` is
+the rest: routing, history, sessions, tools, streaming. A turn diverges when
+the route, tool calls or reply differ from the recording; model calls the replay
+made without a recorded one, or left unused, are counted too. The travel app's
+response cache is shared across sessions, so replaying its sessions in another
+order can turn recorded model calls into cache hits and back. The exit status is
+1 when the p99 overhead passes ``--max-overhead-ms``, or on any divergence with
+``--strict``.
+
+Run from the repository root:
+    python -m benchmarks.replay recording.jsonl --speed 0 --max-overhead-ms 20
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from benchmarks.headless import APPS, ROOT, HeadlessMessage, HeadlessSession, load_app
+from benchmarks.loadtest import git_revision, summarize
+from common.recording import load_recording, recorder
+
+# Apps whose model output is replayed; the career mentor computes its replies locally
+REPLAYED_MODEL_APPS = {"travel", "game"}
+
+_session: contextvars.ContextVar = contextvars.ContextVar("replay_session")
+
+
+class ReplayDelta:
+    __slots__ = ("delta",)
+
+    def __init__(self, delta: str):
+        self.delta = delta
+
+
+class ReplayEvent:
+    __slots__ = ("type", "data")
+
+    def __init__(self, delta: str):
+        self.type = "raw_response_event"
+        self.data = ReplayDelta(delta)
+
+
+class ReplayResult:
+    """Stands in for ``RunResultStreaming``: the recorded deltas on their recorded schedule"""
+
+    def __init__(self, player: "Player", session_id: str, call: Optional[Dict]):
+        self.player = player
+        self.session_id = session_id
+        self.deltas = call["deltas"] if call else []
+        self.final_output = ""
+        self._cancelled = False
+
+    async def stream_events(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        chunks = []
+        for offset_ms, text in self.deltas:
+            if self._cancelled:
+                break
+            if self.player.speed:
+                await asyncio.sleep(max(0.0, started + offset_ms / 1e3 / self.player.speed - loop.time()))
+            chunks.append(text)
+            yield ReplayEvent(text)
+        if self.deltas and self.player.speed:
+            self.player.provider[self.session_id] += self.deltas[-1][0] / 1e3 / self.player.speed
+        self.final_output = "".join(chunks)
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+
+class Player:
+    """Replaces ``agents.Runner``: hands each model call the next recorded call of its session's turn"""
+
+    def __init__(self, speed: float):
+        self.speed = speed
+        self.calls: Dict[str, Deque[Dict]] = {}
+        self.provider: Dict[str, float] = {}
+        self.unrecorded = 0
+        self.unplayed = 0
+
+    def begin(self, session_id: str, record: Dict) -> None:
+        _session.set(session_id)
+        self.calls[session_id] = deque(record["model"])
+        self.provider[session_id] = 0.0
+
+    def _next(self) -> ReplayResult:
+        session_id = _session.get()
+        calls = self.calls[session_id]
+        if not calls:
+            self.unrecorded += 1
+        return ReplayResult(self, session_id, calls.popleft() if calls else None)
+
+    def run_streamed(self, agent, input, **kwargs) -> ReplayResult:
+        return self._next()
+
+    async def run(self, agent, input, **kwargs) -> ReplayResult:
+        result = self._next()
+        async for _ in result.stream_events():
+            pass
+        return result
+
+
+def diverged(recorded: Dict, replayed: Optional[Dict]) -> List[str]:
+    if replayed is None:
+        return ["missing"]
+    kinds = []
+    if recorded["route"] != replayed["route"]:
+        kinds.append("route")
+    if [(tool["name"], tool["args"]) for tool in recorded["tools"]] != [(tool["name"], tool["args"]) for tool in replayed["tools"]]:
+        kinds.append("tools")
+    if recorded["reply"] != replayed["reply"]:
+        kinds.append("reply")
+    return kinds
+
+
+async def replay_app(app: str, conversations: Dict[str, List[Dict]], speed: float) -> Dict:
+    module = load_app(app, env={
+        "GEMINI_API_KEY": "replay",
+        "OPENROUTER_API_KEY": "replay",
+        # Explore drafts are background model calls outside any recorded turn
+        "PREFETCH_EXPLORE": "0",
+        # Provider limits would only add queueing the recording already paid for
+        **{name: os.environ.get(name, value) for name, value in (
+            ("GEMINI_MAX_CONCURRENCY", "1000"), ("OPENROUTER_MAX_CONCURRENCY", "1000"), ("OPENROUTER_RPS", "0"))},
+    })
+    player = Player(speed)
+    if app in REPLAYED_MODEL_APPS:
+        import agents
+        agents.Runner = player
+
+    # The handlers record the replay too, into a scratch file compared with the input afterwards
+    output = Path(tempfile.mkstemp(prefix=f"replay-{app}-", suffix=".jsonl")[1])
+    recorder.path, recorder.sample_rate = output, 1.0
+
+    wall: List[float] = []
+    provider: List[float] = []
+    overhead: List[float] = []
+    first_at = min(turns[0]["at"] for turns in conversations.values())
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def conversation(session_id: str, turns: List[Dict]) -> None:
+        session = HeadlessSession(session_id)
+        session.activate()
+        if speed:
+            await asyncio.sleep(max(0.0, started + (turns[0]["at"] - first_at) / speed - loop.time()))
+        seed = turns[0].get("state", {}).get("seed")
+        if seed is not None:
+            module.app.game_seed = seed  # start() seeds the new game before its first await
+        await module.start()
+        for index, record in enumerate(turns):
+            player.begin(session_id, record)
+            turn_started = time.perf_counter()
+            await module.main(HeadlessMessage(content=record["user"]))
+            elapsed = time.perf_counter() - turn_started
+            if app in REPLAYED_MODEL_APPS:
+                player.unplayed += len(player.calls[session_id])
+            wall.append(elapsed)
+            provider.append(player.provider[session_id])
+            overhead.append(elapsed - player.provider[session_id])
+            if speed and index + 1 < len(turns):
+                think = turns[index + 1]["at"] - record["at"] - record["ms"] / 1e3
+                await asyncio.sleep(max(0.0, think / speed))
+
+    await asyncio.gather(*(conversation(session_id, turns) for session_id, turns in conversations.items()))
+    recorder.flush()
+    replayed = load_recording(str(output))
+    output.unlink()
+
+    divergences: Dict[str, int] = {}
+    for session_id, turns in conversations.items():
+        again = replayed.get((app, session_id), [])
+        for index, record in enumerate(turns):
+            for kind in diverged(record, again[index] if index < len(again) else None):
+                divergences[kind] = divergences.get(kind, 0) + 1
+    return {
+        "app": app,
+        "sessions": len(conversations),
+        "turns": len(wall),
+        "speed": speed,
+        "turn_latency": summarize(wall),
+        "provider": summarize(provider),
+        "overhead": summarize(overhead),
+        "overhead_mean_ms": round(sum(overhead) / len(overhead) * 1e3, 3) if overhead else 0.0,
+        "unrecorded_model_calls": player.unrecorded,
+        "unplayed_model_calls": player.unplayed,
+        "divergences": divergences,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", type=Path, help="JSONL written by RECORD_FILE")
+    parser.add_argument("--app", choices=sorted(APPS) + ["all"], default="all")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed; 0 replays without waiting")
+    parser.add_argument("--max-overhead-ms", type=float, default=None, help="fail when p99 overhead per turn exceeds this")
+    parser.add_argument("--strict", action="store_true", help="fail on any divergence from the recording")
+    parser.add_argument("--output", type=Path, default=ROOT / "benchmarks" / "results")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    recorded = load_recording(str(args.recording))
+    if args.worker:
+        conversations = {session_id: turns for (app, session_id), turns in recorded.items() if app == args.app}
+        print(json.dumps(asyncio.run(replay_app(args.app, conversations, args.speed))))
+        return 0
+
+    apps = sorted({app for app, _ in recorded}) if args.app == "all" else [args.app]
+    results, failures = [], []
+    for app in apps:
+        # One process per app: the career app ships its own agents package
+        completed = subprocess.run([sys.executable, "-m", "benchmarks.replay", str(args.recording.resolve()), "--worker",
+                                    "--app", app, "--speed", str(args.speed)], cwd=ROOT, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{app}: failed\n{completed.stderr.strip()}", file=sys.stderr)
+            failures.append(f"{app}: replay failed")
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+        overhead, provider = result["overhead"], result["provider"]
+        print(f"{app:>7} {result['sessions']} sessions, {result['turns']} turns  "
+              f"overhead p50/p95/p99 {overhead['p50_ms']}/{overhead['p95_ms']}/{overhead['p99_ms']} ms  "
+              f"provider p50/p99 {provider['p50_ms']}/{provider['p99_ms']} ms  "
+              f"diverged {json.dumps(result['divergences'])}  model calls unrecorded/unplayed {result['unrecorded_model_calls']}/{result['unplayed_model_calls']}")
+        if args.max_overhead_ms is not None and overhead["p99_ms"] > args.max_overhead_ms:
+            failures.append(f"{app}: p99 overhead {overhead['p99_ms']} ms over {args.max_overhead_ms} ms")
+        if args.strict and (result["divergences"] or result["unrecorded_model_calls"] or result["unplayed_model_calls"]):
+            failures.append(f"{app}: replay diverged from the recording")
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    revision = git_revision()
+    path = args.output / f"replay-{revision}-{int(time.time())}.json"
+    path.write_text(json.dumps({"revision": revision, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                                "recording": str(args.recording), "results": results}, indent=2))
+    print(f"results written to {path}")
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,289 @@
+import asyncio
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from agents import Agent
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.router import IntentRouter
+from common.tracing import span
+from catalog import CATALOG, FIELDS, FIELD_DESCRIPTIONS, FIELD_SKILLS, FIELD_JOB_ROLES, CatalogLookup, as_dict
+
+# The agent system only: no Chainlit, environment or API keys, so the app, the batch
+# runner and benchmarks can all import it
+
+# Intent routers, compiled once per catalog (at import for the built-in one). Earlier
+# routes win when several match; a field mentioned anywhere in the message is returned
+# as the route entity.
+GREETING_WORDS = ["hi", "hello", "hey"]
+END_WORDS = ["thanks", "thank you", "ok", "okay", "bye", "goodbye", "end", "finish", "done"]
+
+
+def mentor_router(fields: Iterable[str]) -> IntentRouter:
+    return IntentRouter(
+        routes=[
+            ("greeting", GREETING_WORDS),
+            ("end", END_WORDS),
+        ],
+        entities={field: [field] for field in fields},
+    )
+
+
+# Advisors hand greetings and goodbyes back to the mentor
+def advisor_router(fields: Iterable[str]) -> IntentRouter:
+    return IntentRouter(
+        routes=[
+            ("mentor", GREETING_WORDS + END_WORDS),
+            ("market", ["market", "markets", "demand"]),
+            ("path", ["path", "paths"]),
+            ("skills", ["skill", "skills", "learn", "learning"]),
+            ("jobs", ["job", "jobs", "career", "careers"]),
+        ],
+        entities={field: [field] for field in fields},
+        default="overview",
+    )
+
+
+MENTOR_ROUTER = mentor_router(FIELDS)
+ADVISOR_ROUTER = advisor_router(FIELDS)
+
+HANDOFF_TO_MENTOR = "mentor"
+
+# Fields the mentor's greeting lists; a large catalog has far more
+LISTED_FIELDS = 10
+
+# Advisors kept for fields only the configured catalog has, least recently used dropped first
+MAX_CATALOG_ADVISORS = 256
+
+# Tools for dynamic data fetching, from the built-in catalog or a DiskCatalog
+# (catalog_db.py) for taxonomies too large to hold in every worker
+class CareerTools:
+    def __init__(self, catalog: CatalogLookup = CATALOG):
+        self.catalog = catalog
+
+    def get_field_info(self, field_name: str) -> Dict[str, Any]:
+        """Get comprehensive information about a career field"""
+        record = self.catalog.field(field_name.lower())
+        if record is None:
+            # "coding", "nursing": the field the name is closest to
+            field = self.catalog.match_field(field_name)
+            record = self.catalog.field(field) if field else None
+        if record:
+            return as_dict(record)
+        return {"error": "Field not found"}
+
+    def get_skill_details(self, skill_name: str, field: str) -> Dict[str, Any]:
+        """Get detailed information about a specific skill"""
+        record = self.catalog.skill(skill_name.lower())
+        if record:
+            return as_dict(record, exclude=("name", "field"))
+        # Not an exact key: the closest detailed skill, named so the caller sees what matched
+        record = self.catalog.match_skill(skill_name)
+        if record:
+            return as_dict(record, exclude=("field",))
+        return {"error": "Skill not found"}
+
+    def get_job_market_data(self, field: str) -> Dict[str, Any]:
+        """Get current job market data for a field"""
+        record = self.catalog.market(field.lower())
+        if record:
+            return as_dict(record, exclude=("field",))
+        return {"error": "Field not found"}
+
+    def get_learning_path(self, field: str, experience_level: str = "beginner") -> Dict[str, Any]:
+        """Get a personalized learning path for a field"""
+        steps = self.catalog.path(field.lower(), experience_level)
+        if steps:
+            return list(steps)
+        return {"error": "Path not found"}
+
+async def stream_parts(parts):
+    """Yield a reply part by part: catalog sections one at a time, or model tokens as they arrive"""
+    if hasattr(parts, "__aiter__"):
+        async for part in parts:
+            yield part
+        return
+    for part in parts:
+        yield part
+        # Give the handler a chance to send each section before the next one
+        await asyncio.sleep(0)
+
+class StreamingAgent(Agent, ABC):
+    """Agent whose reply is built by ``reply_parts(history, session) -> (parts, handoff)``.
+
+    ``respond`` joins the parts; ``respond_stream`` returns them as an async
+    generator instead, so the handler can send each one as soon as it exists.
+    Routing and handoffs are decided before the first part either way.
+    """
+
+    @abstractmethod
+    def reply_parts(self, history, session):
+        ...
+
+    def respond(self, history, session):
+        parts, handoff = self.reply_parts(history, session)
+        return ("".join(parts) if parts is not None else None, handoff)
+
+    def respond_stream(self, history, session):
+        parts, handoff = self.reply_parts(history, session)
+        return (stream_parts(parts) if parts is not None else None, handoff)
+
+# Specialized Career Advisors (for handoffs)
+class FieldAdvisor(StreamingAgent):
+    """Answers from ``catalog``'s replies for ``field`` (pre-rendered in the built-in catalog).
+
+    Returns ``(None, handoff)`` instead of a reply when the message names another
+    field or should go back to the mentor.
+    """
+    field = None
+    catalog: CatalogLookup = CATALOG
+    router: IntentRouter = ADVISOR_ROUTER
+
+    def __init__(self, name: str, instructions: str, model, field: Optional[str] = None):
+        super().__init__(name=name, instructions=instructions, model=model)
+        if field is not None:
+            self.field = field
+
+    def reply_parts(self, history, session):
+        with span("routing", router="advisor"):
+            route = self.router.route(history[-1]["content"])
+        if route.route == "mentor":
+            return (None, HANDOFF_TO_MENTOR)
+        if route.entity and route.entity != self.field:
+            return (None, route.entity)
+        return (self.catalog.reply_sections(self.field, route.route), None)
+
+class SoftwareEngineeringAdvisor(FieldAdvisor):
+    field = "software engineering"
+
+class FinanceAdvisor(FieldAdvisor):
+    field = "finance"
+
+class MedicalAdvisor(FieldAdvisor):
+    field = "medical"
+
+# Handoff registry: field -> (advisor class, name, instructions)
+ADVISORS = {
+    "software engineering": (SoftwareEngineeringAdvisor, "Software Engineering Advisor", "Expert in software engineering careers"),
+    "finance": (FinanceAdvisor, "Finance Advisor", "Expert in finance careers"),
+    "medical": (MedicalAdvisor, "Medical Advisor", "Expert in medical careers"),
+}
+
+# Main Career Mentor Agent with Tools and Handoffs
+class CareerMentorAgent(StreamingAgent):
+    catalog: CatalogLookup = CATALOG
+    router: IntentRouter = MENTOR_ROUTER
+
+    def __init__(self, name: str, instructions: str, model):
+        super().__init__(name=name, instructions=instructions, model=model)
+        self.fields: List[str] = FIELDS
+        self.field_descriptions = FIELD_DESCRIPTIONS
+        self.field_skills = FIELD_SKILLS
+        self.field_job_roles = FIELD_JOB_ROLES
+        
+        # Initialize specialized advisors from the handoff registry
+        self.handoffs = {field: advisor_cls(name, advisor_instructions, model) for field, (advisor_cls, name, advisor_instructions) in ADVISORS.items()}
+        self.software_advisor = self.handoffs["software engineering"]
+        self.finance_advisor = self.handoffs["finance"]
+        self.medical_advisor = self.handoffs["medical"]
+        # Plain advisors for the catalog's other fields, made on first use (see ``advisor``)
+        self._catalog_advisors: "OrderedDict[str, FieldAdvisor]" = OrderedDict()
+        self._advisor_lock = threading.Lock()
+        self.advisor_router = ADVISOR_ROUTER
+
+    def use_catalog(self, catalog: CatalogLookup) -> None:
+        """Route, match fields and answer this agent's and the advisors' turns from ``catalog``"""
+        if catalog is self.catalog:
+            return
+        self.fields = catalog.field_names()
+        self.router = mentor_router(self.fields)
+        self.advisor_router = advisor_router(self.fields)
+        self.catalog = catalog
+        for advisor in self.handoffs.values():
+            advisor.catalog = catalog
+            advisor.router = self.advisor_router
+        with self._advisor_lock:
+            self._catalog_advisors.clear()
+
+    def advisor(self, field: Optional[str]) -> Optional[FieldAdvisor]:
+        """``field``'s advisor: a specialised one, or a plain one for a field only the catalog has.
+
+        Plain advisors are made on first use and the last ``MAX_CATALOG_ADVISORS``
+        kept, so a large catalog does not grow the shared agent without bound.
+        None when the catalog has no such field.
+        """
+        if not field or self.catalog.field(field) is None:
+            return None
+        advisor = self.handoffs.get(field)
+        if advisor is not None:
+            return advisor
+        with self._advisor_lock:
+            advisor = self._catalog_advisors.get(field)
+            if advisor is not None:
+                self._catalog_advisors.move_to_end(field)
+                return advisor
+            advisor = FieldAdvisor(f"{field.title()} Advisor", f"Expert in {field} careers", self.model, field=field)
+            advisor.catalog = self.catalog
+            advisor.router = self.advisor_router
+            self._catalog_advisors[field] = advisor
+            if len(self._catalog_advisors) > MAX_CATALOG_ADVISORS:
+                self._catalog_advisors.popitem(last=False)
+            return advisor
+
+    def hand_off(self, field, history, session):
+        """Make ``field``'s advisor the active one and let it answer the turn"""
+        session.set("current_field", field)
+        with span("handoff", field=field):
+            parts, _ = self.advisor(field).reply_parts(history, session)
+        return (parts, field)
+
+    def reply_parts(self, history, session):
+        """
+        Professional AI-based response system with tools and handoffs.
+        Returns the reply's parts and the field of the advisor that produced it (None for the mentor).
+        While an advisor is active it answers directly and the mentor's rules are skipped.
+        """
+        advisor = self.advisor(session.get("current_field"))
+        if advisor is not None:
+            with span("advisor", field=advisor.field):
+                parts, handoff = advisor.reply_parts(history, session)
+            if handoff is None:
+                return (parts, advisor.field)
+            session.set("current_field", None)
+            if self.advisor(handoff) is not None:
+                return self.hand_off(handoff, history, session)
+
+        with span("routing", router="mentor"):
+            route = self.router.route(history[-1]["content"])
+        
+        # Greetings
+        if route.route == "greeting":
+            return (("👋 Hello! I'm your Career Mentor Agent. 🎯 I can help you explore various career fields. Here are some popular areas:\n- " + "\n- ".join(self.fields[:LISTED_FIELDS]) + "\n\n🤔 Which field interests you most?",), None)
+        
+        # End conversation
+        if route.route == "end":
+            return (("😊 Thank you for using the Career Mentor Agent! Feel free to return anytime for more career guidance. 🚀 Good luck with your career journey!",), None)
+        
+        # Field selection with handoff to specialized advisor
+        if route.entity and self.advisor(route.entity) is not None:
+            return self.hand_off(route.entity, history, session)
+
+        # No field named: one of its skills, job roles or everyday terms ("coding", "nursing") may be
+        with span("matching") as matching:
+            field = self.catalog.match_field(history[-1]["content"])
+            matching.set("field", field or "")
+        if field and self.advisor(field) is not None:
+            return self.hand_off(field, history, session)
+        
+        # Default response
+        return (("I'd be happy to help you explore career opportunities! 🎯 I can help you explore various career fields. Here are some popular areas:\n- " + "\n- ".join(self.fields[:LISTED_FIELDS]) + "\n\n🤔 Which field interests you most?",), None)
+
+# Initialize the professional agent with tools and handoffs
+career_agent = CareerMentorAgent(
+    name="Career Mentor Agent",
+    instructions="You are a professional career mentor with access to tools and specialized advisors for comprehensive career guidance.",
+    model=None  # Will be set in main.py
+)
\ No newline at end of file
@@ -1,9 +1,11 @@
 class AsyncOpenAI:
-    def __init__(self, api_key, base_url=None):
+    def __init__(self, api_key, base_url=None, default_headers=None, http_client=None):
         self.api_key = api_key
         self.base_url = base_url
+        self.default_headers = default_headers
+        self.http_client = http_client
 
 class OpenAIChatCompletionsModel:
     def __init__(self, model, openai_client):
         self.model = model
-        self.openai_client = openai_client 
\ No newline at end of file
+        self.openai_client = openai_client
\ No newline at end of file
@@ -1,3 +1,8 @@
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 class RunConfig:
     def __init__(self, model=None, model_provider=None, tracing_disabled=True):
         self.model = model
@@ -18,14 +23,85 @@ class AgentRunner:
         if agent_name in self.agents:
             self.current_agent = agent_name 
 
+class RunResult:
+    def __init__(self, input, final_output=None, handoff=None):
+        self.input = input
+        self.final_output = final_output
+        self.handoff = handoff
+
+    def to_input_list(self):
+        return self.input
+
+class ResponseDelta:
+    def __init__(self, delta):
+        self.delta = delta
+
+class StreamEvent:
+    # Same shape as the SDK events the travel and game apps consume
+    def __init__(self, type, data):
+        self.type = type
+        self.data = data
+
+class RunResultStreaming(RunResult):
+    def __init__(self, starting_agent, input, context=None, timeout=None):
+        super().__init__(input)
+        self._agent = starting_agent
+        self._context = context
+        self._timeout = timeout
+
+    async def stream_events(self):
+        if hasattr(self._agent, "respond_stream"):
+            # Routing and handoffs are decided up front, on the pool like respond(); each part of the reply is an event
+            parts, self.handoff = await Runner._in_pool(self._agent.respond_stream, self.input, self._context, self._timeout)
+            chunks = []
+            if parts is not None:
+                async for part in parts:
+                    chunks.append(part)
+                    yield StreamEvent("raw_response_event", ResponseDelta(part))
+            self.final_output = "".join(chunks)
+            return
+        self.final_output, self.handoff = await Runner._respond(self._agent, self.input, self._context, self._timeout)
+        if self.final_output:
+            yield StreamEvent("raw_response_event", ResponseDelta(self.final_output))
+
 class Runner:
+    # Sync respond() implementations run on this bounded pool so they never block the event loop
+    max_workers = int(os.getenv("AGENT_RUNNER_THREADS", "8"))
+    default_timeout = float(os.getenv("AGENT_RUNNER_TIMEOUT", "30"))
+    _executor = None
+
+    @classmethod
+    def _pool(cls):
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=cls.max_workers, thread_name_prefix="agent-respond")
+        return cls._executor
+
+    @classmethod
+    async def _in_pool(cls, func, input, context, timeout):
+        # Copy the caller's context so chainlit's user_session still resolves inside the thread
+        ctx = contextvars.copy_context()
+        call = asyncio.get_running_loop().run_in_executor(cls._pool(), ctx.run, func, input, context)
+        # On timeout the worker thread finishes in the background; only the caller is released
+        return await asyncio.wait_for(call, timeout if timeout is not None else cls.default_timeout)
+
+    @classmethod
+    async def _respond(cls, agent, input, context, timeout):
+        if asyncio.iscoroutinefunction(agent.respond):
+            return await asyncio.wait_for(agent.respond(input, context), timeout if timeout is not None else cls.default_timeout)
+        return await cls._in_pool(agent.respond, input, context, timeout)
+
+    @staticmethod
+    async def run(starting_agent, input, run_config=None, context=None, timeout=None):
+        response, handoff = await Runner._respond(starting_agent, input, context, timeout)
+        return RunResult(input, response, handoff)
+
+    @staticmethod
+    def run_streamed(starting_agent, input, run_config=None, context=None, timeout=None):
+        return RunResultStreaming(starting_agent, input, context, timeout)
+
     @staticmethod
-    def run_sync(starting_agent, input, run_config):
+    def run_sync(starting_agent, input, run_config, context=None):
         # Placeholder for OpenAI Agent SDK runner logic
         # For now, just call the agent's respond method
-        response, _ = starting_agent.respond(input)
-        class Result:
-            final_output = response
-            def to_input_list(self):
-                return input
-        return Result() 
\ No newline at end of file
+        response, handoff = starting_agent.respond(input, context)
+        return RunResult(input, response, handoff)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""Answer a JSONL file of conversations with the career mentor, offline.
+
+Each input line is one conversation: ``{"id": ..., "messages": [...]}`` where the
+messages are user strings (or ``{"role": "user", "content": ...}`` dicts), or a
+single message under ``--text-key``. Each output line holds the conversation's id
+and, per user turn, the reply and the advisor field that produced it, in input
+order. ``--expect`` compares the answers with an earlier output file and exits
+with status 1 on any difference, for regression checks.
+
+Conversations go through ``CareerMentorAgent.respond`` exactly as in the app,
+against the same catalog (``CAREER_CATALOG``, else the built-in one), chunked
+across a process pool; at most ``--max-in-flight`` chunks are read ahead,
+so memory stays flat however large the file is. No Chainlit and no API keys.
+
+    python career-mentor-agent/batch.py conversations.jsonl -o answers.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.history import ChatHistory
+from common.sessions import Session
+from advisors import career_agent
+from catalog_db import catalog_from_env
+
+HISTORY_TOKEN_BUDGET = 2000
+
+
+def conversation_messages(record: dict, text_key: str) -> List[str]:
+    messages = record.get("messages", record.get("turns"))
+    if messages is None:
+        return [record[text_key]]
+    return [message["content"] if isinstance(message, dict) else message for message in messages]
+
+
+def use_env_catalog() -> None:
+    """Answer from the catalog the app is configured with; run in each worker, which opens its own"""
+    career_agent.use_catalog(catalog_from_env())
+
+
+def answer(record: dict, text_key: str) -> dict:
+    """Run one conversation through the mentor the way the app's handler does"""
+    session = Session(str(record.get("id", "")), new_history=lambda: ChatHistory(max_tokens=HISTORY_TOKEN_BUDGET))
+    history = session.history
+    turns = []
+    for content in conversation_messages(record, text_key):
+        history.append({"role": "user", "content": content})
+        reply, field = career_agent.respond(history, session)
+        history.append({"role": "assistant", "content": reply})
+        turns.append({"user": content, "assistant": reply, "field": field})
+    return {"id": record.get("id"), "turns": turns}
+
+
+def answer_chunk(lines: List[str], text_key: str) -> Tuple[List[str], int]:
+    """Answer a chunk of raw input lines; returns output lines and the number of turns"""
+    out, turns = [], 0
+    for line in lines:
+        result = answer(json.loads(line), text_key)
+        turns += len(result["turns"])
+        out.append(json.dumps(result, ensure_ascii=False))
+    return out, turns
+
+
+def chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    lines = (line for line in lines if line.strip())
+    while True:
+        chunk = list(islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(source: Iterable[str], workers: int, chunk_size: int, max_in_flight: int, text_key: str) -> Iterator[Tuple[List[str], int]]:
+    """Answered chunks in input order, with a bounded number of chunks queued or running"""
+    if workers <= 1:
+        use_env_catalog()
+        for chunk in chunks(source, chunk_size):
+            yield answer_chunk(chunk, text_key)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_env_catalog) as pool:
+        pending = deque()
+        for chunk in chunks(source, chunk_size):
+            pending.append(pool.submit(answer_chunk, chunk, text_key))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def compare(produced: List[str], expected, mismatches: List[str]) -> None:
+    for line in produced:
+        want = next(expected, None)
+        got = json.loads(line)
+        if want is None or json.loads(want)["turns"] != got["turns"]:
+            mismatches.append(str(got["id"]))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL conversations, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL answers (default stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=256, help="conversations per task")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="chunks read ahead (default 2 per worker)")
+    parser.add_argument("--text-key", default="message", help="field holding the message when there is no messages list")
+    parser.add_argument("--expect", help="earlier output to compare the answers with")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    expected = (line for line in open(args.expect, encoding="utf-8") if line.strip()) if args.expect else None
+    mismatches: List[str] = []
+    conversations = turns = 0
+    started = time.perf_counter()
+    try:
+        for lines, count in run(source, args.workers, args.chunk_size, args.max_in_flight or 2 * args.workers, args.text_key):
+            output.write("\n".join(lines) + "\n")
+            conversations += len(lines)
+            turns += count
+            if expected is not None:
+                compare(lines, expected, mismatches)
+        if expected is not None:
+            mismatches.extend(str(json.loads(line)["id"]) for line in expected)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - started
+
+    rate = turns / elapsed if elapsed else 0.0
+    cores = max(1, min(args.workers, os.cpu_count() or 1))
+    print(f"{conversations} conversations, {turns} turns in {elapsed:.2f}s: {rate:.0f} turns/s, "
+          f"{rate / cores:.0f} turns/s per core ({args.workers} workers on {cores} cores)", file=sys.stderr)
+    if expected is not None:
+        print(f"{len(mismatches)} conversations differ from {args.expect}" +
+              (f" (first: {', '.join(mismatches[:5])})" if mismatches else ""), file=sys.stderr)
+        return 1 if mismatches else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
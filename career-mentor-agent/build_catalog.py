@@ -0,0 +1,66 @@
+"""Build the on-disk career catalog that CAREER_CATALOG points the app's tools at.
+
+The built-in fields, skills, market data, learning paths and aliases always go
+in (``--no-builtin`` leaves them out). Each ``--source`` file adds JSONL taxonomy
+records, one per line, in the shape of the catalog's records:
+
+    {"kind": "field", "field": "nursing", "description": "...", "skills": [...], "job_roles": [...]}
+    {"kind": "skill", "name": "triage", "field": "nursing", "description": "...", "learning_path": [...],
+     "resources": [...], "time_to_learn": "3-6 months"}
+    {"kind": "market", "field": "nursing", "demand": "High", "growth_rate": "6%", "average_salary": "$80,000",
+     "remote_work": "Rare", "top_companies": [...]}
+    {"kind": "path", "field": "nursing", "level": "beginner", "steps": [...]}
+    {"kind": "alias", "name": "RN", "field": "nursing"}
+
+Records are streamed into the new file, which replaces the old one only when
+complete; restart the workers to pick it up.
+
+    python career-mentor-agent/build_catalog.py catalog.db --source taxonomy.jsonl
+"""
+import argparse
+import json
+import sys
+import time
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from catalog_db import build_catalog, builtin_records
+
+
+def read_records(path: str, location: List[str]) -> Iterator[Dict]:
+    """The records of a JSONL file; ``location[0]`` names the line last read, for errors"""
+    with open(path, encoding="utf-8") as source:
+        for number, line in enumerate(source, 1):
+            if line.strip():
+                location[0] = f"{path}:{number}"
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as error:
+                    raise ValueError(str(error)) from None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="catalog file to write")
+    parser.add_argument("--source", action="append", default=[], help="JSONL taxonomy records (repeatable)")
+    parser.add_argument("--no-builtin", action="store_true", help="leave the built-in catalog out")
+    args = parser.parse_args(argv)
+
+    location = ["built-in catalog"]
+    sources = [read_records(path, location) for path in args.source]
+    records = chain(*sources) if args.no_builtin else chain(builtin_records(), *sources)
+    started = time.perf_counter()
+    try:
+        counts = build_catalog(args.output, records)
+    except ValueError as error:
+        print(f"error: {location[0]}: {error}", file=sys.stderr)
+        return 1
+    size = Path(args.output).stat().st_size
+    print(f"{sum(counts.values())} records ({', '.join(f'{count} {kind}' for kind, count in sorted(counts.items()))}) "
+          f"in {time.perf_counter() - started:.2f}s: {args.output}, {size / 1024:.0f} KB", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
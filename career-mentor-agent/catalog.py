@@ -0,0 +1,431 @@
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+# Career Fields and Data
+FIELDS = [
+    "software engineering",
+    "finance",
+    "medical"
+]
+
+FIELD_DESCRIPTIONS = {
+    "software engineering": "💻 Software Engineering is a dynamic field focused on designing, developing, and maintaining software applications. It combines technical expertise with problem-solving skills to create innovative solutions that power our digital world.",
+    "finance": "💰 Finance is a broad field encompassing investment, banking, and financial planning. It's crucial for business operations and personal wealth management in our global economy.",
+    "medical": "🏥 Medical field is dedicated to healthcare, patient care, and medical research. It's essential for improving human health and saving lives through various medical practices and innovations."
+}
+
+FIELD_SKILLS = {
+    "software engineering": ["Programming", "Data Structures", "Algorithms", "Version Control", "Databases", "System Design"],
+    "finance": ["Financial Analysis", "Excel", "Accounting", "Investment", "Risk Management"],
+    "medical": ["Anatomy & Physiology", "Medical Procedures", "Patient Care", "Medical Ethics", "Clinical Skills", "Medical Technology"]
+}
+
+FIELD_JOB_ROLES = {
+    "software engineering": ["Backend Developer", "Frontend Developer", "DevOps Engineer", "Mobile App Developer"],
+    "finance": ["Financial Analyst", "Investment Banker", "Accountant", "Auditor"],
+    "medical": ["Doctor", "Nurse", "Medical Researcher", "Healthcare Administrator"]
+}
+
+# Everyday words for each field, so "I like coding" or "nursing" find it without its name
+FIELD_ALIASES = {
+    "software engineering": ["Coding", "Programmer", "Software Developer", "Computer Science", "Web Development", "Tech"],
+    "finance": ["Banking", "Investing", "Stock Market", "Economics", "Money Management", "Trading"],
+    "medical": ["Medicine", "Nursing", "Healthcare", "Hospital", "Surgeon", "Pharmacy"]
+}
+
+SKILL_DETAILS = {
+    "programming": {
+        "field": "software engineering",
+        "description": "Ability to write code in various programming languages",
+        "learning_path": ["Start with Python/JavaScript", "Learn data structures", "Practice algorithms", "Build projects"],
+        "resources": ["Codecademy", "freeCodeCamp", "LeetCode", "GitHub"],
+        "time_to_learn": "6-12 months"
+    },
+    "financial analysis": {
+        "field": "finance",
+        "description": "Analyzing financial data to make business decisions",
+        "learning_path": ["Learn Excel", "Study accounting principles", "Understand financial statements", "Practice with real data"],
+        "resources": ["Coursera", "edX", "CFA Institute", "Bloomberg Terminal"],
+        "time_to_learn": "3-6 months"
+    },
+    "anatomy": {
+        "field": "medical",
+        "description": "Understanding human body structure and function",
+        "learning_path": ["Study basic biology", "Learn human anatomy", "Practice with models", "Clinical experience"],
+        "resources": ["Khan Academy", "Gray's Anatomy", "Medical school courses", "Clinical rotations"],
+        "time_to_learn": "2-4 years"
+    }
+}
+
+# Simulated job market data
+JOB_MARKET_DATA = {
+    "software engineering": {
+        "demand": "Very High",
+        "growth_rate": "22%",
+        "average_salary": "$110,000",
+        "remote_work": "Common",
+        "top_companies": ["Google", "Microsoft", "Amazon", "Apple", "Meta"]
+    },
+    "finance": {
+        "demand": "High",
+        "growth_rate": "8%",
+        "average_salary": "$85,000",
+        "remote_work": "Limited",
+        "top_companies": ["Goldman Sachs", "JPMorgan", "Morgan Stanley", "BlackRock", "Vanguard"]
+    },
+    "medical": {
+        "demand": "Very High",
+        "growth_rate": "16%",
+        "average_salary": "$120,000",
+        "remote_work": "Limited",
+        "top_companies": ["Mayo Clinic", "Cleveland Clinic", "Johns Hopkins", "Mass General", "Stanford Health"]
+    }
+}
+
+LEARNING_PATHS = {
+    "software engineering": {
+        "beginner": [
+            "Learn Python basics (2-3 months)",
+            "Study data structures and algorithms (3-4 months)",
+            "Build small projects (2-3 months)",
+            "Learn version control with Git (1 month)",
+            "Apply for internships or entry-level positions"
+        ],
+        "intermediate": [
+            "Learn a framework (React, Django, etc.) (2-3 months)",
+            "Study system design (3-4 months)",
+            "Contribute to open source (ongoing)",
+            "Build a portfolio (2-3 months)",
+            "Network and attend meetups"
+        ]
+    },
+    "finance": {
+        "beginner": [
+            "Learn Excel and financial modeling (2-3 months)",
+            "Study accounting principles (3-4 months)",
+            "Learn about financial markets (2-3 months)",
+            "Get certifications (CFA, CPA) (6-12 months)",
+            "Apply for internships"
+        ],
+        "intermediate": [
+            "Specialize in a finance area (2-3 months)",
+            "Build financial models (ongoing)",
+            "Network with professionals (ongoing)",
+            "Get advanced certifications (ongoing)",
+            "Apply for analyst positions"
+        ]
+    },
+    "medical": {
+        "beginner": [
+            "Complete pre-med requirements (2-4 years)",
+            "Take MCAT exam (3-6 months preparation)",
+            "Apply to medical schools (1 year)",
+            "Complete medical school (4 years)",
+            "Complete residency (3-7 years)"
+        ],
+        "intermediate": [
+            "Choose a medical specialty (ongoing)",
+            "Complete specialty training (2-5 years)",
+            "Get board certifications (ongoing)",
+            "Build clinical experience (ongoing)",
+            "Consider fellowship programs"
+        ]
+    }
+}
+
+# How each specialised advisor presents its field
+ADVISOR_PROFILES = {
+    "software engineering": {
+        "emoji": "💻",
+        "title": "Software Engineering",
+        "skill": "programming",
+        "topics": ["Skills and learning paths", "Job opportunities and market data", "Career guidance and advice"],
+        "subject": "software engineering"
+    },
+    "finance": {
+        "emoji": "💰",
+        "title": "Finance",
+        "skill": "financial analysis",
+        "topics": ["Financial analysis skills", "Investment and banking careers", "Market trends and opportunities"],
+        "subject": "finance"
+    },
+    "medical": {
+        "emoji": "🏥",
+        "title": "Medical",
+        "skill": "anatomy",
+        "topics": ["Medical education and training", "Healthcare career paths", "Clinical skills and procedures"],
+        "subject": "the medical field"
+    }
+}
+
+# Intents every advisor answers from the catalog (see advisors.ADVISOR_ROUTER)
+INTENTS = ("skills", "jobs", "overview", "market", "path")
+
+
+def advisor_profile(field: str) -> Dict[str, Any]:
+    """How ``field``'s advisor presents it: its own profile, or a plain one for fields only a catalog file has"""
+    profile = ADVISOR_PROFILES.get(field)
+    if profile is not None:
+        return profile
+    return {"emoji": "🎯", "title": field.title(), "skill": None,
+            "topics": ["Skills and learning paths", "Job opportunities and market data", "Career guidance and advice"],
+            "subject": field}
+
+
+@dataclass(frozen=True, slots=True)
+class FieldRecord:
+    field: str
+    description: str
+    skills: Tuple[str, ...]
+    job_roles: Tuple[str, ...]
+    growth_potential: str = "High"
+    salary_range: str = "$60,000 - $150,000+"
+    education_required: str = "Bachelor's degree or equivalent"
+
+
+@dataclass(frozen=True, slots=True)
+class SkillRecord:
+    name: str
+    field: str
+    description: str
+    learning_path: Tuple[str, ...]
+    resources: Tuple[str, ...]
+    time_to_learn: str
+
+
+@dataclass(frozen=True, slots=True)
+class MarketRecord:
+    field: str
+    demand: str
+    growth_rate: str
+    average_salary: str
+    remote_work: str
+    top_companies: Tuple[str, ...]
+
+
+class CatalogEntry(NamedTuple):
+    """What a similarity match points at: a field, skill, job role or alias, and its field"""
+    kind: str
+    name: str
+    field: str
+
+
+def _bullets(items) -> str:
+    return "\n".join([f"• {item}" for item in items])
+
+
+def _render_skills(profile, skill: SkillRecord) -> str:
+    return (f"{profile['emoji']} **{profile['title']} Skills Guide**\n\n{skill.description}\n\n**Learning Path:**\n" +
+            _bullets(skill.learning_path) +
+            f"\n\n**Resources:** {', '.join(skill.resources)}\n\n**Time to Learn:** {skill.time_to_learn}")
+
+
+def _render_jobs(profile, field: FieldRecord, market: MarketRecord) -> str:
+    return (f"💼 **{profile['title']} Career Opportunities**\n\n**Job Roles:**\n" +
+            _bullets(field.job_roles) +
+            f"\n\n**Market Data:**\n• Demand: {market.demand}\n• Growth Rate: {market.growth_rate}\n• Average Salary: {market.average_salary}\n• Top Companies: {', '.join(market.top_companies)}")
+
+
+def _render_overview(profile) -> str:
+    return (f"{profile['emoji']} **{profile['title']} Expert Here!**\n\nI can help you with:\n" +
+            _bullets(profile["topics"]) +
+            f"\n\nWhat would you like to know about {profile['subject']}?")
+
+
+def _render_market(market: MarketRecord) -> str:
+    return (f"📊 **Job Market Data for {market.field.title()}**\n\n" +
+            f"• Demand: {market.demand}\n" +
+            f"• Growth Rate: {market.growth_rate}\n" +
+            f"• Average Salary: {market.average_salary}\n" +
+            f"• Remote Work: {market.remote_work}\n" +
+            f"• Top Companies: {', '.join(market.top_companies)}")
+
+
+def _render_path(field: str, steps: Tuple[str, ...]) -> str:
+    return f"🎓 **Learning Path for {field.title()}**\n\n" + _bullets(steps)
+
+
+def _split_sections(text: str) -> Tuple[str, ...]:
+    """Split a reply at blank lines; the sections concatenate back to ``text``"""
+    head, *rest = text.split("\n\n")
+    return (head,) + tuple("\n\n" + part for part in rest)
+
+
+# Share of an entry's character n-grams a message must contain to match it; each of
+# the entry's words must also be a whole word of the message ("Excel" is not "excellent")
+MATCH_THRESHOLD = 0.7
+
+
+def catalog_names(fields: Iterable[FieldRecord], skills: Iterable[SkillRecord],
+                  aliases: Dict[str, Iterable[str]]) -> Iterator[Tuple[str, CatalogEntry]]:
+    """Every name a message may use for a field: its own, its skills, job roles and aliases"""
+    for record in fields:
+        yield record.field, CatalogEntry("field", record.field, record.field)
+        yield from ((skill, CatalogEntry("skill", skill.lower(), record.field)) for skill in record.skills)
+        yield from ((role, CatalogEntry("role", role, record.field)) for role in record.job_roles)
+        yield from ((alias, CatalogEntry("alias", alias, record.field)) for alias in aliases.get(record.field, ()))
+    yield from ((record.name, CatalogEntry("skill", record.name, record.field)) for record in skills)
+
+
+class CatalogLookup(ABC):
+    """Record lookups and fuzzy matching shared by the in-memory and on-disk catalogs.
+
+    Subclasses look records up by lowercase key (``field``, ``skill``, ``market``,
+    ``path``) and score catalog entries against a message (``match``).
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def field(self, name: str) -> Optional[FieldRecord]:
+        ...
+
+    @abstractmethod
+    def skill(self, name: str) -> Optional[SkillRecord]:
+        ...
+
+    @abstractmethod
+    def market(self, field: str) -> Optional[MarketRecord]:
+        ...
+
+    @abstractmethod
+    def path(self, field: str, level: str) -> Optional[Tuple[str, ...]]:
+        ...
+
+    @abstractmethod
+    def match(self, text: str, k: int = 5, min_score: float = MATCH_THRESHOLD) -> List[Tuple[CatalogEntry, float]]:
+        """Catalog entries whose words all appear in ``text`` as whole words, best first"""
+
+    @abstractmethod
+    def field_names(self) -> List[str]:
+        """Every field's lowercase key, for routing messages that name one and listing them"""
+
+    def match_field(self, text: str, min_score: float = MATCH_THRESHOLD) -> Optional[str]:
+        """The field ``text`` is most likely about, when it names none literally"""
+        matches = self.match(text, k=1, min_score=min_score)
+        return matches[0][0].field if matches else None
+
+    def match_skill(self, text: str, min_score: float = MATCH_THRESHOLD) -> Optional[SkillRecord]:
+        """The detailed skill closest to ``text``: the matched one, or its field's main skill"""
+        for entry, _ in self.match(text, min_score=min_score):
+            record = self.skill(entry.name)
+            if record is None and entry.field in ADVISOR_PROFILES:
+                record = self.skill(ADVISOR_PROFILES[entry.field]["skill"])
+            if record is not None:
+                return record
+        return None
+
+    def render_reply(self, field: str, intent: str) -> Optional[str]:
+        """Markdown answer for a field and intent from its records; the overview when those are missing.
+
+        None when the catalog has no such field.
+        """
+        record = self.field(field)
+        if record is None:
+            return None
+        profile = advisor_profile(field)
+        if intent == "skills":
+            # The profile's skill, else the first of the field's skills with details
+            names = [profile["skill"]] if profile["skill"] else [skill.lower() for skill in record.skills]
+            skill = next((skill for skill in map(self.skill, names) if skill is not None), None)
+            if skill is not None:
+                return _render_skills(profile, skill)
+        elif intent in ("jobs", "market"):
+            market = self.market(field)
+            if market is not None:
+                return _render_jobs(profile, record, market) if intent == "jobs" else _render_market(market)
+        elif intent == "path":
+            steps = self.path(field, "beginner")
+            if steps:
+                return _render_path(field, steps)
+        return _render_overview(profile)
+
+    def reply_sections(self, field: str, intent: str) -> Optional[Tuple[str, ...]]:
+        """The same answer as ``render_reply``, section by section"""
+        text = self.render_reply(field, intent)
+        return _split_sections(text) if text is not None else None
+
+
+class CareerCatalog(CatalogLookup):
+    """Read-only career data, indexed once by field, skill and experience level.
+
+    ``replies`` holds the fully rendered markdown for every ``(field, intent)``
+    pair so that deterministic advisor answers are a single dict lookup, and
+    ``sections`` the same replies split at blank lines for streaming.
+    """
+
+    __slots__ = ("fields", "skills", "markets", "paths", "replies", "sections", "_index")
+
+    def __init__(self):
+        self.fields: Dict[str, FieldRecord] = {
+            name: FieldRecord(name, FIELD_DESCRIPTIONS[name], tuple(FIELD_SKILLS.get(name, [])), tuple(FIELD_JOB_ROLES.get(name, [])))
+            for name in FIELDS
+        }
+        self.skills: Dict[str, SkillRecord] = {
+            name: SkillRecord(name, data["field"], data["description"], tuple(data["learning_path"]), tuple(data["resources"]), data["time_to_learn"])
+            for name, data in SKILL_DETAILS.items()
+        }
+        self.markets: Dict[str, MarketRecord] = {
+            name: MarketRecord(name, data["demand"], data["growth_rate"], data["average_salary"], data["remote_work"], tuple(data["top_companies"]))
+            for name, data in JOB_MARKET_DATA.items()
+        }
+        self.paths: Dict[Tuple[str, str], Tuple[str, ...]] = {
+            (name, level): tuple(steps)
+            for name, levels in LEARNING_PATHS.items()
+            for level, steps in levels.items()
+        }
+        self.replies: Dict[Tuple[str, str], str] = {(name, intent): self.render_reply(name, intent)
+                                                    for name in FIELDS for intent in INTENTS}
+        self.sections: Dict[Tuple[str, str], Tuple[str, ...]] = {key: _split_sections(text) for key, text in self.replies.items()}
+        self._index = None
+
+    def field(self, name: str) -> Optional[FieldRecord]:
+        return self.fields.get(name)
+
+    def skill(self, name: str) -> Optional[SkillRecord]:
+        return self.skills.get(name)
+
+    def market(self, field: str) -> Optional[MarketRecord]:
+        return self.markets.get(field)
+
+    def path(self, field: str, level: str) -> Optional[Tuple[str, ...]]:
+        return self.paths.get((field, level))
+
+    def field_names(self) -> List[str]:
+        return list(self.fields)
+
+    def names(self) -> Iterable[Tuple[str, CatalogEntry]]:
+        return catalog_names(self.fields.values(), self.skills.values(), FIELD_ALIASES)
+
+    @property
+    def index(self):
+        """``SimilarityIndex`` over field names, skills, job roles and aliases, built on first use"""
+        if self._index is None:
+            from common.similarity import SimilarityIndex
+
+            self._index = SimilarityIndex(self.names())
+        return self._index
+
+    def match(self, text: str, k: int = 5, min_score: float = MATCH_THRESHOLD) -> List[Tuple[CatalogEntry, float]]:
+        return [(match.key, match.score) for match in self.index.search(text, k=k, min_score=min_score, whole_words=True)]
+
+    def reply(self, field: str, intent: str) -> str:
+        """Pre-rendered markdown answer for a field and intent"""
+        return self.replies[(field, intent)]
+
+    def reply_sections(self, field: str, intent: str) -> Optional[Tuple[str, ...]]:
+        """The same answer as ``reply``, section by section"""
+        return self.sections.get((field, intent))
+
+
+def as_dict(record, exclude: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """Plain dict copy of a catalog record, lists instead of tuples"""
+    return {key: list(value) if isinstance(value, tuple) else value for key, value in asdict(record).items() if key not in exclude}
+
+
+CATALOG = CareerCatalog()
\ No newline at end of file
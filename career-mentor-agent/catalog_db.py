@@ -0,0 +1,275 @@
+"""The career catalog in a SQLite file, for taxonomies too large to hold in every worker.
+
+``build_catalog`` writes one from taxonomy records (see build_catalog.py) and
+``DiskCatalog`` reads it: records are paged in as lookups ask for them and kept in
+a small LRU, and fuzzy matching runs over posting lists stored in the same file.
+CAREER_CATALOG points the app's tools at a file (``catalog_from_env``).
+
+Layout: ``records`` holds each field, skill, market and learning path as
+zlib-compressed JSON, clustered by ``(kind, key)``; ``names`` every name a message may use for a field
+(as ``CareerCatalog.names``, each entry once); ``postings`` SimilarityIndex's
+posting list for each n-gram bucket, packed, so a message reads only the buckets
+of its own n-grams.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.similarity import (_load_numpy, bucket, gram_weights, ngrams, rank_arrays, rank_postings,
+                               whole_word_rank)
+from catalog import (CATALOG, FIELD_ALIASES, MATCH_THRESHOLD, CareerCatalog, CatalogEntry, CatalogLookup,
+                     FieldRecord, MarketRecord, SkillRecord, as_dict, catalog_names)
+
+FORMAT_VERSION = "1"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE records (kind TEXT NOT NULL, key TEXT NOT NULL, data BLOB NOT NULL, PRIMARY KEY (kind, key)) WITHOUT ROWID;
+CREATE TABLE names (row INTEGER PRIMARY KEY, kind TEXT NOT NULL, name TEXT NOT NULL, field TEXT NOT NULL);
+CREATE TABLE postings (bucket INTEGER PRIMARY KEY, rows BLOB NOT NULL, weights BLOB NOT NULL);
+"""
+
+# Posting lists are native int32 rows and float64 weights; the file records the byte order
+ROW_TYPE, WEIGHT_TYPE = "i", "d"
+
+RECORD_TYPES = {"field": FieldRecord, "skill": SkillRecord, "market": MarketRecord}
+
+
+def _path_key(field: str, level: str) -> str:
+    return f"{field}\t{level}"
+
+
+def _decode(kind: str, value: Any) -> Any:
+    """A stored value as CareerCatalog holds it: a record or a path, with tuples for lists"""
+    if kind == "path":
+        return tuple(value)
+    return RECORD_TYPES[kind](**{key: tuple(item) if isinstance(item, list) else item for key, item in value.items()})
+
+
+def _parse(data: Dict[str, Any]) -> Tuple[str, str, Any, List[Tuple[str, CatalogEntry]]]:
+    """Kind, lowercase key, stored value and names of one taxonomy record"""
+    data = dict(data)
+    kind = data.pop("kind")
+    if kind == "path":
+        return kind, _path_key(data["field"].lower(), data["level"]), list(data["steps"]), []
+    if kind == "alias":
+        field = data["field"].lower()
+        return kind, data["name"].lower(), field, [(data["name"], CatalogEntry("alias", data["name"], field))]
+    if kind not in RECORD_TYPES:
+        raise ValueError(f"unknown kind {kind!r}")
+    record = _decode(kind, data)
+    if kind == "field":
+        return kind, record.field.lower(), as_dict(record), list(catalog_names([record], [], {}))
+    if kind == "skill":
+        return kind, record.name.lower(), as_dict(record), list(catalog_names([], [record], {}))
+    return kind, record.field.lower(), as_dict(record), []
+
+
+def builtin_records(catalog: CareerCatalog = CATALOG) -> Iterator[Dict[str, Any]]:
+    """The built-in catalog as taxonomy records, the same shape as a ``--source`` file's lines"""
+    for record in catalog.fields.values():
+        yield {"kind": "field", **as_dict(record)}
+    for record in catalog.skills.values():
+        yield {"kind": "skill", **as_dict(record)}
+    for record in catalog.markets.values():
+        yield {"kind": "market", **as_dict(record)}
+    for (field, level), steps in catalog.paths.items():
+        yield {"kind": "path", "field": field, "level": level, "steps": list(steps)}
+    for field, aliases in FIELD_ALIASES.items():
+        yield from ({"kind": "alias", "name": alias, "field": field} for alias in aliases)
+
+
+def _packed(postings: Iterable[Tuple[int, int, float]]) -> Iterator[Tuple[int, bytes, bytes]]:
+    """(bucket, rows, weights) rows of the postings table, from postings sorted by bucket"""
+    current, rows, weights = None, array(ROW_TYPE), array(WEIGHT_TYPE)
+    for index, row, weight in postings:
+        if index != current:
+            if current is not None:
+                yield current, rows.tobytes(), weights.tobytes()
+            current, rows, weights = index, array(ROW_TYPE), array(WEIGHT_TYPE)
+        rows.append(row)
+        weights.append(weight)
+    if current is not None:
+        yield current, rows.tobytes(), weights.tobytes()
+
+
+def build_catalog(path, records: Iterable[Dict[str, Any]], dims: int = 1 << 16, n: int = 3) -> Dict[str, int]:
+    """Write ``records`` to a new catalog file at ``path`` and return counts by kind.
+
+    Records are streamed, so the taxonomy never has to fit in memory. A later record
+    with the same kind and key replaces an earlier one's data; the names of both
+    stay matchable. The file is written beside
+    ``path`` and moved over it when complete, so workers with the old file open keep
+    reading it. Raises ValueError naming the first malformed record.
+    """
+    target = Path(path)
+    building = target.with_name(target.name + ".building")
+    building.unlink(missing_ok=True)
+    db = sqlite3.connect(building)
+    counts: Dict[str, int] = {}
+    try:
+        db.execute("PRAGMA journal_mode = OFF")
+        db.execute("PRAGMA synchronous = OFF")
+        db.execute("PRAGMA cache_size = -65536")
+        db.executescript(SCHEMA)
+        # Only needed while building: the names seen so far, and postings staged by name to be packed by bucket
+        db.execute("CREATE TEMP TABLE seen (kind TEXT, name TEXT, field TEXT, PRIMARY KEY (kind, name, field)) WITHOUT ROWID")
+        db.execute("CREATE TEMP TABLE grams (bucket INTEGER NOT NULL, row INTEGER NOT NULL, weight REAL NOT NULL)")
+        for number, data in enumerate(records, 1):
+            try:
+                kind, key, value, names = _parse(data)
+            except (KeyError, TypeError, ValueError, AttributeError) as error:
+                raise ValueError(f"record {number}: {type(error).__name__}: {error}") from None
+            data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+            db.execute("INSERT OR REPLACE INTO records VALUES (?, ?, ?)", (kind, key, zlib.compress(data)))
+            for text, entry in names:
+                if not db.execute("INSERT OR IGNORE INTO seen VALUES (?, ?, ?)", entry).rowcount:
+                    continue
+                row = db.execute("INSERT INTO names (kind, name, field) VALUES (?, ?, ?)", entry).lastrowid
+                db.executemany("INSERT INTO grams VALUES (?, ?, ?)",
+                               [(index, row, weight) for index, weight in gram_weights(text, dims, n).items()])
+            counts[kind] = counts.get(kind, 0) + 1
+        db.executemany("INSERT INTO postings VALUES (?, ?, ?)", _packed(db.execute(
+            "SELECT bucket, row, weight FROM grams ORDER BY bucket, row")))
+        db.execute("DROP TABLE grams")
+        db.execute("DROP TABLE seen")
+        db.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("format", FORMAT_VERSION), ("dims", str(dims)), ("n", str(n)), ("byteorder", sys.byteorder),
+            ("names", str(db.execute("SELECT MAX(row) FROM names").fetchone()[0] or 0))])
+        db.commit()
+        # Rewrite the pages in key order, dropping the slack left by out-of-order inserts
+        db.execute("VACUUM")
+    except BaseException:
+        db.close()
+        building.unlink(missing_ok=True)
+        raise
+    db.close()
+    os.replace(building, target)
+    return counts
+
+
+class DiskCatalog(CatalogLookup):
+    """Read-only lookups into a catalog file, paged in as they are asked for.
+
+    Only the records looked up are read, and the last ``cache_size`` of them
+    (misses included) stay in memory. SQLite maps the file (``mmap_size``), so
+    workers serving the same file share its pages through the OS page cache
+    instead of each holding a copy. ``match`` reads the posting lists of the
+    message's n-gram buckets and scores them as SimilarityIndex does (whole words
+    only), with NumPy when it is installed. One connection serves every thread,
+    behind a lock.
+    """
+
+    __slots__ = ("file", "cache_size", "hits", "misses", "dims", "n", "size", "_db", "_lock", "_cache")
+
+    def __init__(self, path, cache_size: int = 1024, mmap_size: int = 1 << 28):
+        self.file = Path(path)
+        if not self.file.is_file():
+            raise FileNotFoundError(f"No career catalog at {self.file}; build one with build_catalog.py")
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        # immutable: the file is replaced, never written in place, so readers skip locking
+        self._db = sqlite3.connect(f"{self.file.resolve().as_uri()}?mode=ro&immutable=1", uri=True,
+                                   check_same_thread=False)
+        self._db.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        if meta.get("format") != FORMAT_VERSION or meta.get("byteorder") != sys.byteorder:
+            self._db.close()
+            raise ValueError(f"{self.file} is catalog format {meta.get('format')} ({meta.get('byteorder')}-endian), "
+                             f"expected {FORMAT_VERSION} ({sys.byteorder}-endian); rebuild it")
+        self.dims = int(meta["dims"])
+        self.n = int(meta["n"])
+        self.size = int(meta["names"]) + 1
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+
+    def _get(self, kind: str, key: str) -> Any:
+        with self._lock:
+            if (kind, key) in self._cache:
+                self.hits += 1
+                self._cache.move_to_end((kind, key))
+                return self._cache[(kind, key)]
+            self.misses += 1
+            row = self._db.execute("SELECT data FROM records WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+            value = _decode(kind, json.loads(zlib.decompress(row[0]))) if row else None
+            self._cache[(kind, key)] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return value
+
+    def field(self, name: str) -> Optional[FieldRecord]:
+        return self._get("field", name)
+
+    def skill(self, name: str) -> Optional[SkillRecord]:
+        return self._get("skill", name)
+
+    def market(self, field: str) -> Optional[MarketRecord]:
+        return self._get("market", field)
+
+    def path(self, field: str, level: str) -> Optional[Tuple[str, ...]]:
+        return self._get("path", _path_key(field, level))
+
+    def field_names(self) -> List[str]:
+        # In taxonomy order, as the built-in catalog lists its fields
+        with self._lock:
+            rows = self._db.execute("SELECT field FROM names WHERE kind = 'field' ORDER BY row").fetchall()
+        return list(dict.fromkeys(field.lower() for field, in rows))
+
+    def match(self, text: str, k: int = 5, min_score: float = MATCH_THRESHOLD) -> List[Tuple[CatalogEntry, float]]:
+        buckets = sorted({bucket(gram, self.dims) for gram in ngrams(text, self.n)})
+        if not buckets or k <= 0:
+            return []
+        with self._lock:
+            postings = self._db.execute(f"SELECT rows, weights FROM postings WHERE bucket IN "
+                                        f"({', '.join('?' * len(buckets))})", buckets).fetchall()
+        np = _load_numpy()
+        if np is not None:
+            all_rows = np.concatenate([np.frombuffer(rows, dtype=np.int32) for rows, _ in postings] or [[]])
+            all_weights = np.concatenate([np.frombuffer(weights) for _, weights in postings] or [[]])
+        else:
+            decoded = [(array(ROW_TYPE, rows), array(WEIGHT_TYPE, weights)) for rows, weights in postings]
+
+        def rank(count: int) -> List[Tuple[int, float]]:
+            if np is not None:
+                scored = rank_arrays(all_rows, all_weights, self.size, count, min_score)
+            else:
+                scored = rank_postings(decoded, count, min_score)
+            return [(row, score) for row, score in scored if score > min_score]
+
+        entries: Dict[int, CatalogEntry] = {}
+
+        def names(rows: List[int]) -> List[str]:
+            missing = [row for row in rows if row not in entries]
+            # In slices, as a widened search can pass SQLite's limit on query parameters
+            for start in range(0, len(missing), 500):
+                batch = missing[start:start + 500]
+                with self._lock:
+                    entries.update((row, CatalogEntry(kind, name, field)) for row, kind, name, field in self._db.execute(
+                        f"SELECT row, kind, name, field FROM names WHERE row IN ({', '.join('?' * len(batch))})",
+                        batch))
+            return [entries[row].name for row in rows]
+
+        return [(entries[row], score) for row, score in whole_word_rank(text, k, rank, names)]
+
+    def cache_info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "max_size": self.cache_size}
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def catalog_from_env() -> CatalogLookup:
+    """The catalog at CAREER_CATALOG (caching CAREER_CATALOG_CACHE records), else the built-in one"""
+    path = os.getenv("CAREER_CATALOG")
+    if not path:
+        return CATALOG
+    return DiskCatalog(path, cache_size=int(os.getenv("CAREER_CATALOG_CACHE", "1024")))
\ No newline at end of file
@@ -0,0 +1,8 @@
+from .router import IntentRouter, RouteMatch
+from .history import ChatHistory, estimate_tokens
+from .streaming import BufferedStream
+from .clients import ClientRegistry, model_clients
+from .cache import ResponseCache
+from .tools import ToolExecutor
+from .sessions import MemorySessionStore, Session, SessionStore, SQLiteSessionStore
+from .tracing import Tracer, tracer
\ No newline at end of file
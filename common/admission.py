@@ -0,0 +1,242 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+class Overloaded(Exception):
+    """Raised instead of queueing when a model call could not start before its deadline"""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} is overloaded, retry in {retry_after:.1f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "level", "updated", "clock")
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until ``amount`` (capped at capacity) is available"""
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        """Consume ``amount``; the level may go negative when usage is reconciled upwards"""
+        self._refill()
+        self.level -= amount
+
+
+class _Waiter:
+    __slots__ = ("session_id", "tokens", "future", "enqueued")
+
+    def __init__(self, session_id: str, tokens: int, future: asyncio.Future, enqueued: float):
+        self.session_id = session_id
+        self.tokens = tokens
+        self.future = future
+        self.enqueued = enqueued
+
+
+class Permit:
+    """Granted model call; ``record`` the real token usage once known"""
+
+    __slots__ = ("tokens", "used", "started")
+
+    def __init__(self, tokens: int, started: float):
+        self.tokens = tokens
+        self.used: Optional[int] = None
+        self.started = started
+
+    def record(self, tokens: int) -> None:
+        self.used = tokens
+
+
+class AdmissionController:
+    """Gate in front of one provider's model calls.
+
+    At most ``max_concurrency`` calls run at once, new calls are paced by
+    request/s and token/min buckets, and waiting calls are granted round-robin
+    across sessions so one chatty user cannot starve the rest. A call whose
+    estimated queue wait exceeds ``deadline`` is rejected at once with
+    ``Overloaded``, and one still waiting at the deadline is rejected then.
+    """
+
+    def __init__(self, provider: str, max_concurrency: int = 8, requests_per_second: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, burst: Optional[float] = None, deadline: float = 10.0,
+                 service_time: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.deadline = deadline
+        self.clock = clock
+        self.requests = TokenBucket(requests_per_second, burst or max(1.0, requests_per_second), clock) if requests_per_second else None
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute, clock) if tokens_per_minute else None
+        # Moving averages used to turn queue length into an expected wait
+        self.service_time = service_time
+        self.mean_tokens = 0.0
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _pacing_delay(self, tokens: int) -> float:
+        delay = self.requests.delay(1) if self.requests else 0.0
+        if self.tokens:
+            delay = max(delay, self.tokens.delay(tokens))
+        return delay
+
+    def estimate_wait(self, session_id: str, tokens: int = 0) -> float:
+        """Expected seconds before a new call from ``session_id`` would start"""
+        own = len(self._queues.get(session_id, ()))
+        # Round-robin: every other session with work gets up to own + 1 grants first
+        ahead = own + sum(min(len(queue), own + 1) for key, queue in self._queues.items() if key != session_id)
+        if self.active + ahead < self.max_concurrency:
+            return self._pacing_delay(tokens) if not ahead else ahead / self._throughput()
+        return (self.active + ahead - self.max_concurrency + 1) / self._throughput()
+
+    def _throughput(self) -> float:
+        rate = self.max_concurrency / max(self.service_time, 1e-3)
+        if self.requests:
+            rate = min(rate, self.requests.rate)
+        if self.tokens and self.mean_tokens:
+            rate = min(rate, self.tokens.rate / self.mean_tokens)
+        return rate
+
+    async def acquire(self, session_id: str, tokens: int = 0) -> Permit:
+        estimate = self.estimate_wait(session_id, tokens)
+        if estimate > self.deadline:
+            self.shed += 1
+            raise Overloaded(self.provider, estimate)
+        waiter = _Waiter(session_id, tokens, asyncio.get_running_loop().create_future(), self.clock())
+        self._queues.setdefault(session_id, deque()).append(waiter)
+        self.queued += 1
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.deadline)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as we gave up: hand the slot back
+                self.active -= 1
+                self._dispatch()
+            else:
+                waiter.future.cancel()
+                self._remove(waiter)
+            if isinstance(error, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise Overloaded(self.provider, self.estimate_wait(session_id, tokens)) from None
+            raise
+        waited = self.clock() - waiter.enqueued
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return Permit(tokens, self.clock())
+
+    def _remove(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.session_id)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self.queued -= 1
+            if not queue:
+                del self._queues[waiter.session_id]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant waiting calls round-robin while concurrency and both buckets allow"""
+        while self._queues and self.active < self.max_concurrency:
+            session_id, queue = next(iter(self._queues.items()))
+            waiter = queue[0]
+            delay = self._pacing_delay(waiter.tokens)
+            if delay > 0:
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+                return
+            queue.popleft()
+            self.queued -= 1
+            if queue:
+                self._queues.move_to_end(session_id)
+            else:
+                del self._queues[session_id]
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(waiter.tokens)
+            self.active += 1
+            self.admitted += 1
+            waiter.future.set_result(None)
+
+    def _wake(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def release(self, permit: Permit) -> None:
+        self.active -= 1
+        elapsed = self.clock() - permit.started
+        self.service_time += 0.2 * (elapsed - self.service_time)
+        used = permit.used if permit.used is not None else permit.tokens
+        if self.tokens and used != permit.tokens:
+            self.tokens.take(used - permit.tokens)
+        self.mean_tokens = used if not self.mean_tokens else self.mean_tokens + 0.2 * (used - self.mean_tokens)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, session_id: str, tokens: int = 0):
+        """``async with controller.slot(session_id, tokens=estimate) as permit:`` around one model call"""
+        permit = await self.acquire(session_id, tokens)
+        try:
+            yield permit
+        finally:
+            self.release(permit)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+            "mean_wait_ms": self.total_wait / self.admitted * 1e3 if self.admitted else 0.0,
+            "max_wait_ms": self.max_wait * 1e3,
+        }
+
+
+_controllers: Dict[str, AdmissionController] = {}
+
+
+def provider_admission(provider: str, max_concurrency: int = 8, requests_per_second: Optional[float] = None,
+                       tokens_per_minute: Optional[float] = None) -> AdmissionController:
+    """Process-wide controller for ``provider``, created on first use.
+
+    The arguments are defaults; ``{PROVIDER}_MAX_CONCURRENCY``, ``{PROVIDER}_RPS`` and
+    ``{PROVIDER}_TPM`` override them (0 disables a rate limit) and
+    ``MODEL_QUEUE_DEADLINE`` sets the queue deadline in seconds.
+    """
+    if provider not in _controllers:
+        prefix = provider.upper()
+        rps = float(os.getenv(f"{prefix}_RPS", requests_per_second or 0))
+        tpm = float(os.getenv(f"{prefix}_TPM", tokens_per_minute or 0))
+        _controllers[provider] = AdmissionController(
+            provider,
+            max_concurrency=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", max_concurrency)),
+            requests_per_second=rps or None,
+            tokens_per_minute=tpm or None,
+            deadline=float(os.getenv("MODEL_QUEUE_DEADLINE", "10")),
+        )
+    return _controllers[provider]
\ No newline at end of file
@@ -0,0 +1,124 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a provider while its circuit is open"""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} is unavailable, retry in {retry_after:.1f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fails a provider's calls fast while it is unhealthy.
+
+    ``failure_threshold`` failed calls in a row open the circuit: for the next
+    ``reset_timeout`` seconds ``check`` and ``attempt`` raise ``CircuitOpen``
+    without reaching the provider. After that a single call is let through as a
+    probe (half-open). Its success closes the circuit; its failure opens it for
+    another ``reset_timeout``. A streamed call counts as a success from its first
+    ``responded()``, so a reply cut short later is not held against the provider.
+    Cancelled calls count as neither.
+    """
+
+    def __init__(self, provider: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if self.probing or self.clock() - self.opened_at < self.reset_timeout else "half_open"
+
+    def check(self) -> None:
+        """Raise ``CircuitOpen`` unless a call may go ahead now"""
+        if self.opened_at is None:
+            return
+        retry_after = self.opened_at + self.reset_timeout - self.clock()
+        if retry_after > 0 or self.probing:
+            self.rejected += 1
+            raise CircuitOpen(self.provider, max(retry_after, 0.0))
+
+    @contextmanager
+    def attempt(self) -> Iterator["_Call"]:
+        """Guard one provider call; an exception leaving the block before it responded is a failure"""
+        self.check()
+        probe = self.opened_at is not None
+        self.probing = self.probing or probe
+        call = _Call(self)
+        try:
+            yield call
+        except Exception:
+            if not call.answered:
+                self.record_failure()
+            raise
+        else:
+            call.responded()
+        finally:
+            if probe:
+                self.probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                self.trips += 1
+            self.opened_at = self.clock()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class _Call:
+    __slots__ = ("breaker", "answered")
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+        self.answered = False
+
+    def responded(self) -> None:
+        """The provider answered (e.g. the first streamed token); cheap to call for every one"""
+        if not self.answered:
+            self.answered = True
+            self.breaker.record_success()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def provider_breaker(provider: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> CircuitBreaker:
+    """Process-wide breaker for ``provider``, created on first use.
+
+    ``{PROVIDER}_BREAKER_FAILURES`` and ``{PROVIDER}_BREAKER_RESET`` (seconds)
+    override the defaults.
+    """
+    if provider not in _breakers:
+        prefix = provider.upper()
+        _breakers[provider] = CircuitBreaker(
+            provider,
+            failure_threshold=int(os.getenv(f"{prefix}_BREAKER_FAILURES", failure_threshold)),
+            reset_timeout=float(os.getenv(f"{prefix}_BREAKER_RESET", reset_timeout)),
+        )
+    return _breakers[provider]
\ No newline at end of file
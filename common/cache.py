@@ -0,0 +1,81 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace so near-identical questions share a key"""
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", text.lower())).strip()
+
+
+class ResponseCache:
+    """LRU cache of model replies with a time-to-live.
+
+    Keys combine the agent name, its instructions, the model that answered, any
+    ``context`` the reply depends on beyond the messages (such as the session's
+    destination) and the messages the model was given, all normalized. The whole
+    conversation is keyed by default, summary included, so a follow-up like "what
+    should I eat there?" is only answered from the cache after the same
+    conversation; ``history_turns`` keys only the last few messages instead.
+    Entries are evicted least recently used first once ``max_entries`` is
+    reached, and lazily once older than ``ttl``.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 600.0, history_turns: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.history_turns = history_turns
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def key(self, agent_name: str, instructions: str, model: str, messages: Iterable[Dict[str, str]],
+            context: Iterable[str] = ()) -> str:
+        messages = list(messages)
+        recent = messages if self.history_turns is None else messages[-self.history_turns:] if self.history_turns else []
+        parts = ([agent_name, normalize(instructions), model] + [normalize(value) for value in context] +
+                 [f"{m['role']}:{normalize(m['content'])}" for m in recent])
+        return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, text = entry
+        if self.clock() - stored_at > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        self._entries[key] = (self.clock(), text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
\ No newline at end of file
@@ -0,0 +1,129 @@
+import asyncio
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# (base_url, api_key, default headers as sorted pairs, client class): one pooled client each
+ClientKey = Tuple[str, str, Tuple[Tuple[str, str], ...], type]
+
+
+class ClientRegistry:
+    """Process-wide pool of model clients shared by every chat session.
+
+    One ``AsyncOpenAI`` client (and one keep-alive HTTP connection pool) is built per
+    ``(base_url, api_key, default_headers)`` and one chat-completions model per client and
+    model name, so new sessions reuse warm connections instead of paying connection and
+    TLS setup. Pooling needs ``httpx`` (a requirement of every app); without it each
+    client uses its own default transport.
+    The classes default to the SDK's ``agents.AsyncOpenAI`` and ``OpenAIChatCompletionsModel``;
+    an app that brings its own (``client_cls``, ``model_cls``) gets entries of its own, so
+    apps hosted in one process never receive each other's clients.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0, timeout: float = 60.0):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self._clients: Dict[ClientKey, Any] = {}
+        self._http_clients: Dict[ClientKey, Any] = {}
+        self._models: Dict[Tuple[ClientKey, str, type], Any] = {}
+
+    def _http_client(self):
+        try:
+            import httpx
+        except ImportError:
+            return None  # The client falls back to its own default transport
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=self.timeout,
+        )
+
+    def client(self, base_url: str, api_key: str, default_headers: Optional[Dict[str, str]] = None, client_cls=None):
+        """Shared ``AsyncOpenAI`` client for an endpoint, key and set of default headers"""
+        return self._clients[self._client(base_url, api_key, default_headers, client_cls)]
+
+    def _client(self, base_url: str, api_key: str, default_headers: Optional[Dict[str, str]], client_cls) -> ClientKey:
+        """The registry key of the matching client, built on first use"""
+        if client_cls is None:
+            from agents import AsyncOpenAI as client_cls
+        key = (base_url, api_key, tuple(sorted((default_headers or {}).items())), client_cls)
+        if key not in self._clients:
+            kwargs: Dict[str, Any] = {"api_key": api_key, "base_url": base_url}
+            if default_headers:
+                kwargs["default_headers"] = default_headers
+            http_client = self._http_client()
+            if http_client is not None:
+                kwargs["http_client"] = http_client
+                self._http_clients[key] = http_client
+            self._clients[key] = client_cls(**kwargs)
+        return key
+
+    def get(self, base_url: str, api_key: str, model: str, default_headers: Optional[Dict[str, str]] = None,
+            client_cls=None, model_cls=None):
+        """Shared ``(client, model)`` pair for an endpoint, key and model name"""
+        client_key = self._client(base_url, api_key, default_headers, client_cls)
+        client = self._clients[client_key]
+        if model_cls is None:
+            from agents import OpenAIChatCompletionsModel as model_cls
+        key = (client_key, model, model_cls)
+        if key not in self._models:
+            self._models[key] = model_cls(model=model, openai_client=client)
+        return client, self._models[key]
+
+    async def warm_up(self) -> Dict[ClientKey, bool]:
+        """Open a connection for every pooled client so the first chat skips the handshake.
+
+        Returns whether each client (by its registry key) reached its endpoint.
+        """
+        async def ping(key: ClientKey, http_client) -> bool:
+            base_url, api_key, headers, _ = key
+            try:
+                await http_client.get(base_url.rstrip("/") + "/models",
+                                      headers={**dict(headers), "Authorization": f"Bearer {api_key}"})
+                return True
+            except Exception:
+                return False
+
+        keys = list(self._http_clients)
+        results = await asyncio.gather(*(ping(key, self._http_clients[key]) for key in keys))
+        return dict(zip(keys, results))
+
+    async def aclose(self) -> None:
+        """Close every pooled connection; the registry can be reused afterwards"""
+        http_clients = list(self._http_clients.values())
+        self._clients.clear()
+        self._http_clients.clear()
+        self._models.clear()
+        await asyncio.gather(*(http_client.aclose() for http_client in http_clients), return_exceptions=True)
+
+
+model_clients = ClientRegistry(
+    max_connections=int(os.getenv("MODEL_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("MODEL_MAX_KEEPALIVE_CONNECTIONS", "20")),
+    keepalive_expiry=float(os.getenv("MODEL_KEEPALIVE_EXPIRY", "30")),
+)
+
+
+def register_lifecycle(cl, registry: ClientRegistry = model_clients, prepare: Optional[Callable[[], Any]] = None) -> None:
+    """Warm the pool at app startup (when MODEL_WARM_UP=1) and close it at shutdown.
+
+    Apps that build their clients lazily pass ``prepare`` (their app factory), which
+    runs first so there is something to warm. Older Chainlit releases have no app
+    lifecycle hooks; the pool is then simply released when the process exits.
+    """
+    if hasattr(cl, "on_app_startup") and os.getenv("MODEL_WARM_UP") == "1":
+        @cl.on_app_startup
+        async def warm_up_model_clients():
+            if prepare is not None:
+                prepare()
+            await registry.warm_up()
+
+    if hasattr(cl, "on_app_shutdown"):
+        @cl.on_app_shutdown
+        async def close_model_clients():
+            await registry.aclose()
\ No newline at end of file
@@ -0,0 +1,66 @@
+import os
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Read ``.env`` into the environment once, on first use rather than at import.
+
+    ``chainlit run`` has already loaded the app's ``.env`` by then; this covers
+    scripts and tools that build an app outside Chainlit. Variables already set win.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
+def require_env(name: str) -> str:
+    """The value of ``name`` (after loading ``.env``); ValueError when it is unset or empty"""
+    load_env()
+    value = os.getenv(name)
+    if not value:
+        raise ValueError(f"{name} is not set. Please ensure it is defined in your .env file.")
+    return value
+
+
+class LazyApp(Generic[T]):
+    """An app's clients, agents and env-configured state, built on first call.
+
+    Attribute access is forwarded, so handlers write ``app.sessions``. Importing an
+    app module then reads no keys, opens no connections or files and imports no
+    SDKs, so tooling, tests and benchmarks can import it freely. A factory that
+    raises (a missing key) is retried on the next call.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self.factory = factory
+        self._app: Optional[T] = None
+
+    def __call__(self) -> T:
+        if self._app is None:
+            load_env()
+            self._app = self.factory()
+        return self._app
+
+    def __getattr__(self, name: str):
+        # Only reached for names LazyApp lacks: ``app.sessions`` builds the app if needed
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self(), name)
+
+    @property
+    def built(self) -> bool:
+        return self._app is not None
+
+    def reset(self) -> None:
+        """Forget the built app so the next call rebuilds it (e.g. after changing the environment)"""
+        self._app = None
\ No newline at end of file
@@ -0,0 +1,95 @@
+import asyncio
+import contextvars
+import os
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Optional
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when a turn runs out of time; what it streamed before that is still good"""
+
+    def __init__(self, seconds: Optional[float]):
+        super().__init__(f"turn deadline of {seconds:.1f}s exceeded" if seconds is not None else "turn deadline exceeded")
+        self.seconds = seconds
+
+
+class Deadline:
+    """The time a turn has to finish, shared by everything the turn awaits.
+
+    ``bound`` caps a step's own timeout by the time left, ``wait`` awaits something
+    within it and ``iterate`` streams until it passes. Running out raises
+    ``DeadlineExceeded`` after cancelling the step that was waiting.
+    ``seconds=None`` never expires.
+    """
+
+    __slots__ = ("seconds", "expires", "clock")
+
+    def __init__(self, seconds: Optional[float], clock: Callable[[], float] = time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+        self.expires = clock() + seconds if seconds is not None else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a deadline"""
+        return None if self.expires is None else max(0.0, self.expires - self.clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.expires is not None and self.clock() >= self.expires
+
+    def bound(self, timeout: Optional[float]) -> Optional[float]:
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return remaining if timeout is None else min(timeout, remaining)
+
+    async def wait(self, awaitable: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Await within the deadline (and ``timeout``); a plain TimeoutError means ``timeout`` ran out first"""
+        try:
+            return await asyncio.wait_for(awaitable, self.bound(timeout))
+        except asyncio.TimeoutError:
+            if self.expired:
+                raise DeadlineExceeded(self.seconds) from None
+            raise
+
+    async def iterate(self, stream: AsyncIterable) -> AsyncIterator:
+        """Items of ``stream`` as they arrive, until it ends or the deadline passes.
+
+        The stream is closed either way, so a stalled upstream's connection is
+        released rather than left waiting.
+        """
+        iterator = stream.__aiter__()
+        try:
+            while True:
+                try:
+                    item = await self.wait(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+NO_DEADLINE = Deadline(None)
+
+# The deadline of the turn being handled in this task, for library code such as ToolExecutor
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar("turn_deadline", default=NO_DEADLINE)
+
+
+def start_deadline(seconds: Optional[float]) -> Deadline:
+    """Start the current turn's deadline; tasks the turn starts from here on share it"""
+    deadline = Deadline(seconds)
+    _current_deadline.set(deadline)
+    return deadline
+
+
+def current_deadline() -> Deadline:
+    return _current_deadline.get()
+
+
+def turn_deadline_from_env(default: str = "60") -> Optional[float]:
+    """TURN_DEADLINE in seconds, or None (no deadline) when set to ``off``"""
+    value = os.getenv("TURN_DEADLINE", default)
+    return None if value == "off" else float(value)
\ No newline at end of file
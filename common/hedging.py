@@ -0,0 +1,202 @@
+import asyncio
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .tracing import span
+
+try:
+    # Subclassing the SDK's Model lets RunConfig/Agent accept a HedgedModel as-is
+    from agents.models.interface import Model as _ModelBase
+except ImportError:
+    _ModelBase = object
+
+
+class ProviderStats:
+    __slots__ = ("requests", "wins", "hedges", "errors", "cancelled", "ttft", "failed_at")
+
+    def __init__(self):
+        self.requests = 0
+        self.wins = 0
+        self.hedges = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.ttft: Optional[float] = None
+        self.failed_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "wins": self.wins,
+            "hedges": self.hedges,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "ttft_ms": self.ttft * 1e3 if self.ttft is not None else None,
+        }
+
+
+_EMPTY = object()
+
+# Names of the candidates that won the calls made under ``HedgedModel.track_winners``
+_winners: contextvars.ContextVar = contextvars.ContextVar("hedged_winners", default=None)
+
+
+async def _first_event(stream):
+    async for event in stream:
+        return event
+    return _EMPTY
+
+
+class _Attempt:
+    __slots__ = ("name", "stream", "task", "started", "span")
+
+    def __init__(self, name, stream, task, started, span):
+        self.name = name
+        self.stream = stream
+        self.task = task
+        self.started = started
+        self.span = span
+
+
+class HedgedModel(_ModelBase):
+    """Model that races several providers/models for one request.
+
+    The fastest-looking candidate (by a moving average of time to first event) is
+    tried first. If it has produced nothing after ``hedge_delay`` seconds the next
+    one is started too; whichever streams first is kept and the others are
+    cancelled. An error before the first event fails over to the next candidate at
+    once, and the failing one is ranked last for ``error_cooldown`` seconds.
+    ``hedge_delay=None`` disables hedging and keeps only failover.
+    """
+
+    def __init__(self, candidates: Sequence[Tuple[str, Any]], hedge_delay: Optional[float] = 2.0,
+                 error_cooldown: float = 30.0, smoothing: float = 0.2, clock: Callable[[], float] = time.monotonic):
+        if not candidates:
+            raise ValueError("HedgedModel needs at least one candidate")
+        self.candidates = list(candidates)
+        self.hedge_delay = hedge_delay
+        self.error_cooldown = error_cooldown
+        self.smoothing = smoothing
+        self.clock = clock
+        self.stats: Dict[str, ProviderStats] = {name: ProviderStats() for name, _ in self.candidates}
+
+    def ranked(self) -> List[Tuple[str, Any]]:
+        """Candidates in the order they will be tried; unmeasured ones keep their configured order"""
+        now = self.clock()
+
+        def score(item):
+            position, (name, _) = item
+            stats = self.stats[name]
+            cooling = stats.failed_at is not None and now - stats.failed_at < self.error_cooldown
+            return (cooling, stats.ttft if stats.ttft is not None else 0.0, position)
+
+        return [candidate for _, candidate in sorted(enumerate(self.candidates), key=score)]
+
+    def _observe(self, name: str, elapsed: float) -> None:
+        stats = self.stats[name]
+        stats.ttft = elapsed if stats.ttft is None else stats.ttft + self.smoothing * (elapsed - stats.ttft)
+
+    def _fail(self, name: str) -> None:
+        stats = self.stats[name]
+        stats.errors += 1
+        stats.failed_at = self.clock()
+
+    async def _race(self, start: Callable[[str, Any], Tuple[Any, Any]]) -> Tuple[_Attempt, Any]:
+        """Run candidates per the hedging policy; returns the winning attempt and its first result"""
+        order = self.ranked()
+        attempts: Dict[asyncio.Future, _Attempt] = {}
+        error: Optional[BaseException] = None
+
+        def launch(hedge: bool) -> None:
+            name, model = order[len(launched)]
+            launched.append(name)
+            stats = self.stats[name]
+            stats.requests += 1
+            stats.hedges += hedge
+            stream, awaitable = start(name, model)
+            task = asyncio.ensure_future(awaitable)
+            attempts[task] = _Attempt(name, stream, task, time.perf_counter(), span("model.attempt", provider=name, hedge=hedge))
+
+        launched: List[str] = []
+        launch(False)
+        try:
+            while attempts:
+                can_hedge = self.hedge_delay is not None and len(launched) < len(order)
+                done, _ = await asyncio.wait(attempts, timeout=self.hedge_delay if can_hedge else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    launch(True)
+                    continue
+                for task in done:
+                    attempt = attempts.pop(task)
+                    elapsed = time.perf_counter() - attempt.started
+                    attempt.span.end()
+                    if task.exception() is None:
+                        self._observe(attempt.name, elapsed)
+                        self.stats[attempt.name].wins += 1
+                        winners = _winners.get()
+                        if winners is not None:
+                            winners.append(attempt.name)
+                        attempt.span.set("outcome", "won")
+                        return attempt, task
+                    error = task.exception()
+                    self._fail(attempt.name)
+                    attempt.span.set("outcome", type(error).__name__)
+                    if len(launched) < len(order):
+                        launch(False)
+            raise error
+        finally:
+            for task, attempt in attempts.items():
+                task.cancel()
+                stats = self.stats[attempt.name]
+                stats.cancelled += 1
+                # A cancelled loser was at least this slow; don't let a stale average keep it first
+                elapsed = time.perf_counter() - attempt.started
+                if stats.ttft is None or elapsed > stats.ttft:
+                    self._observe(attempt.name, elapsed)
+                attempt.span.set("outcome", "cancelled")
+                attempt.span.end()
+            if attempts:
+                await asyncio.gather(*attempts, return_exceptions=True)
+                for attempt in attempts.values():
+                    if attempt.stream is not None:
+                        await attempt.stream.aclose()
+
+    async def get_response(self, *args, **kwargs):
+        _, task = await self._race(lambda name, model: (None, model.get_response(*args, **kwargs)))
+        return task.result()
+
+    async def stream_response(self, *args, **kwargs) -> AsyncIterator[Any]:
+        def start(name, model):
+            stream = model.stream_response(*args, **kwargs)
+            return stream, _first_event(stream)
+
+        attempt, task = await self._race(start)
+        try:
+            if task.result() is _EMPTY:
+                return
+            yield task.result()
+            async for event in attempt.stream:
+                yield event
+        finally:
+            await attempt.stream.aclose()
+
+    @contextmanager
+    def track_winners(self) -> Iterator[List[str]]:
+        """Collect which candidate answered each call made in the block (and in tasks it starts)"""
+        token = _winners.set([])
+        try:
+            yield _winners.get()
+        finally:
+            _winners.reset(token)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
+
+
+def hedge_delay_from_env(default: str = "2.0") -> Optional[float]:
+    """MODEL_HEDGE_DELAY in seconds, or None (failover only) when set to ``off``"""
+    value = os.getenv("MODEL_HEDGE_DELAY", default)
+    return None if value == "off" else float(value)
\ No newline at end of file
@@ -0,0 +1,96 @@
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Tuple
+
+Message = Dict[str, str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) that needs no tokenizer"""
+    return len(text) // 4 + 1
+
+
+class ChatHistory:
+    """Conversation history held under a token budget.
+
+    Behaves like the plain ``chat_history`` list for appends, ``len`` and indexing
+    of recent turns. Once the running token count exceeds ``max_tokens`` the oldest
+    turns are folded into a short rolling summary (or dropped when
+    ``summarize=False``); the newest ``keep_recent`` turns are always kept verbatim.
+    Token counts are updated per append, never recounted.
+    """
+
+    def __init__(self, max_tokens: int = 2000, keep_recent: int = 6, summarize: bool = True,
+                 summary_tokens: int = 300, snippet_chars: int = 120,
+                 count_tokens: Callable[[str], int] = estimate_tokens):
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.summarize = summarize
+        self.summary_tokens = summary_tokens
+        self.snippet_chars = snippet_chars
+        self.count_tokens = count_tokens
+        self._recent: Deque[Tuple[Message, int]] = deque()
+        self._summary: Deque[Tuple[str, int]] = deque()
+        self._recent_tokens = 0
+        self._summary_tokens = 0
+        self.folded_turns = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self._recent_tokens + self._summary_tokens
+
+    def append(self, message: Message) -> None:
+        tokens = self.count_tokens(message["content"])
+        self._recent.append((message, tokens))
+        self._recent_tokens += tokens
+        while self.total_tokens > self.max_tokens and len(self._recent) > self.keep_recent:
+            self._fold(*self._recent.popleft())
+
+    def _fold(self, message: Message, tokens: int) -> None:
+        self._recent_tokens -= tokens
+        self.folded_turns += 1
+        if not self.summarize:
+            return
+        snippet = " ".join(message["content"].split())
+        if len(snippet) > self.snippet_chars:
+            snippet = snippet[:self.snippet_chars].rstrip() + "..."
+        line = f"- {message['role']}: {snippet}"
+        line_tokens = self.count_tokens(line)
+        self._summary.append((line, line_tokens))
+        self._summary_tokens += line_tokens
+        while self._summary_tokens > self.summary_tokens and len(self._summary) > 1:
+            _, dropped = self._summary.popleft()
+            self._summary_tokens -= dropped
+
+    def messages(self) -> List[Message]:
+        """Input list for the model: the rolling summary (if any) followed by recent turns"""
+        recent = [message for message, _ in self._recent]
+        if not self._summary:
+            return recent
+        summary = "Summary of earlier conversation:\n" + "\n".join(line for line, _ in self._summary)
+        return [{"role": "system", "content": summary}] + recent
+
+    def state(self) -> Dict[str, Any]:
+        """Compact JSON-able snapshot: recent turns as [role, content] pairs plus summary lines"""
+        return {
+            "recent": [[message["role"], message["content"]] for message, _ in self._recent],
+            "summary": [line for line, _ in self._summary],
+            "folded": self.folded_turns,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> "ChatHistory":
+        """Load a ``state()`` snapshot; token counts are recomputed, nothing is refolded"""
+        self._recent = deque(({"role": role, "content": content}, self.count_tokens(content)) for role, content in state["recent"])
+        self._summary = deque((line, self.count_tokens(line)) for line in state["summary"])
+        self._recent_tokens = sum(tokens for _, tokens in self._recent)
+        self._summary_tokens = sum(tokens for _, tokens in self._summary)
+        self.folded_turns = state["folded"]
+        return self
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def __getitem__(self, index: int) -> Message:
+        return self._recent[index][0]
+
+    def __iter__(self) -> Iterator[Message]:
+        return (message for message, _ in self._recent)
\ No newline at end of file
@@ -0,0 +1,131 @@
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Entry:
+    __slots__ = ("task", "created")
+
+    def __init__(self, task: asyncio.Future, created: float):
+        self.task = task
+        self.created = created
+
+
+class Prefetcher:
+    """Per-session cache of results computed in the background before they are asked for.
+
+    ``prefetch`` starts a factory as a detached task under a key. ``get`` returns the
+    result when it is ready, waits for it when still in flight, and otherwise
+    returns ``default`` so the caller computes it as usual. Entries expire after
+    ``ttl`` seconds and ``cancel`` drops a session's entries (cancelling any still
+    running) when the user changes course. Only the ``max_sessions`` most recently
+    active sessions keep entries.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_sessions: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self.started = 0
+        self.hits = 0
+        self.joined = 0
+        self.misses = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.wasted = 0
+        self._sessions: "OrderedDict[str, Dict[Hashable, _Entry]]" = OrderedDict()
+
+    def prefetch(self, session_id: str, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> None:
+        entries = self._sessions.get(session_id)
+        if entries is None:
+            entries = self._sessions[session_id] = {}
+        self._sessions.move_to_end(session_id)
+        entry = entries.get(key)
+        if entry is not None and self.clock() - entry.created <= self.ttl:
+            return
+        if entry is not None:
+            self._drop(entry)
+        # An empty context keeps the task out of the current turn's trace, which ends first
+        task = contextvars.Context().run(asyncio.ensure_future, factory())
+        task.add_done_callback(_consume)
+        entries[key] = _Entry(task, self.clock())
+        self.started += 1
+        # Least recently active first: evict past the session cap, or while all of a session's entries are stale
+        now = self.clock()
+        while len(self._sessions) > self.max_sessions or all(
+                now - entry.created > self.ttl for entry in next(iter(self._sessions.values())).values()):
+            _, evicted = self._sessions.popitem(last=False)
+            for entry in evicted.values():
+                self._drop(entry)
+
+    async def get(self, session_id: str, key: Hashable, default: Any = None) -> Any:
+        """The prefetched result for ``key``, waiting for it if needed; ``default`` on a miss"""
+        entries = self._sessions.get(session_id)
+        entry = entries.get(key) if entries else None
+        if entry is None:
+            self.misses += 1
+            return default
+        if self.clock() - entry.created > self.ttl:
+            self._pop(session_id, key)
+            self._drop(entry)
+            self.misses += 1
+            return default
+        if entry.task.done():
+            self.hits += 1
+        else:
+            self.joined += 1
+        try:
+            # Shielded so a superseded turn leaves the prefetch for the next one
+            result = await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            if not entry.task.cancelled():
+                raise
+            self.misses += 1
+            return default
+        except Exception:
+            self._pop(session_id, key)
+            self.failed += 1
+            return default
+        self._pop(session_id, key)
+        return result
+
+    def cancel(self, session_id: str) -> None:
+        """Drop everything prefetched for ``session_id``"""
+        for entry in self._sessions.pop(session_id, {}).values():
+            self._drop(entry)
+
+    def _pop(self, session_id: str, key: Hashable) -> None:
+        entries = self._sessions.get(session_id)
+        if entries is not None:
+            entries.pop(key, None)
+            if not entries:
+                del self._sessions[session_id]
+
+    def _drop(self, entry: _Entry) -> None:
+        if entry.task.done():
+            self.wasted += 1
+        else:
+            entry.task.cancel()
+            self.cancelled += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        served = self.hits + self.joined
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "joined": self.joined,
+            "misses": self.misses,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "wasted": self.wasted,
+            "hit_rate": served / (served + self.misses + self.failed) if served + self.misses + self.failed else 0.0,
+            "sessions": len(self._sessions),
+        }
+
+
+def _consume(task: asyncio.Future) -> None:
+    # Failures surface through get(); this keeps unused ones from being logged as never retrieved
+    if not task.cancelled():
+        task.exception()
\ No newline at end of file
@@ -0,0 +1,202 @@
+import atexit
+import contextvars
+import json
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+# Session values that record which agent or advisor handled the turn
+ROUTE_KEYS = ("current_agent", "current_field")
+
+
+class ModelRecord:
+    """One streamed model call: the deltas with their offsets from the call's start"""
+
+    __slots__ = ("agent", "started", "deltas")
+
+    def __init__(self, agent: str):
+        self.agent = agent
+        self.started = time.perf_counter()
+        self.deltas: List[list] = []
+
+    def delta(self, text: str) -> None:
+        self.deltas.append([round((time.perf_counter() - self.started) * 1e3, 3), text])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class _NoopModelRecord:
+    __slots__ = ()
+
+    def delta(self, text):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NOOP_MODEL = _NoopModelRecord()
+
+
+class TurnRecord:
+    """What one turn of a sampled session did, written as one JSON line on ``end``"""
+
+    def __init__(self, recorder: "Recorder", app: str, session_id: str, user: str):
+        self.recorder = recorder
+        self.app = app
+        self.session_id = session_id
+        self.user = user
+        self.at = time.time()
+        self.started = time.perf_counter()
+        self.tools: List[Dict[str, Any]] = []
+        self.models: List[ModelRecord] = []
+        self.ended = False
+
+    def model(self, agent: str) -> ModelRecord:
+        record = ModelRecord(agent)
+        self.models.append(record)
+        return record
+
+    def tool(self, name: str, args: Dict[str, Any], seconds: float) -> None:
+        self.tools.append({"name": name, "args": args, "ms": round(seconds * 1e3, 3)})
+
+    def end(self, session, reply: str, **state) -> None:
+        """Write the turn; ``state`` holds whatever replay needs to reproduce it (e.g. a game seed)"""
+        if self.ended:
+            return
+        self.ended = True
+        record = {
+            "app": self.app,
+            "session_id": self.session_id,
+            "at": self.at,
+            "user": self.user,
+            "route": {key: session.get(key) for key in ROUTE_KEYS if key in session.values},
+            "tools": self.tools,
+            "model": [
+                {"agent": model.agent, "offset_ms": round((model.started - self.started) * 1e3, 3), "deltas": model.deltas}
+                for model in self.models
+            ],
+            "reply": reply,
+            "ms": round((time.perf_counter() - self.started) * 1e3, 3),
+        }
+        if state:
+            record["state"] = state
+        self.recorder._buffer.append(record)
+
+
+class _NoopTurnRecord:
+    __slots__ = ()
+
+    def model(self, agent):
+        return NOOP_MODEL
+
+    def tool(self, name, args, seconds):
+        pass
+
+    def end(self, session, reply, **state):
+        pass
+
+
+NOOP_RECORD = _NoopTurnRecord()
+
+# The record of the turn being handled in this task, for library code such as ToolExecutor
+_current_record: contextvars.ContextVar = contextvars.ContextVar("recorded_turn", default=NOOP_RECORD)
+
+
+def record_tool(name: str, args: Dict[str, Any], seconds: float) -> None:
+    """Note a tool call on the current turn's record (no-op outside a recorded turn)"""
+    _current_record.get().tool(name, args, seconds)
+
+
+class Recorder:
+    """Captures sampled conversations as JSONL for replay (see benchmarks/replay.py).
+
+    Sampling is per session, by a hash of the app and session id, so a sampled
+    conversation is recorded whole and by every worker process. Finished turns are
+    buffered and appended to ``path`` by a daemon thread, off the request path.
+    """
+
+    def __init__(self, path: Optional[str] = None, sample_rate: float = 1.0, flush_interval: float = 1.0,
+                 max_buffer: int = 10000):
+        self.path = Path(path) if path else None
+        self.sample_rate = sample_rate if path else 0.0
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=max_buffer)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def sampled(self, app: str, session_id: str) -> bool:
+        if self.sample_rate <= 0.0:
+            return False
+        return self.sample_rate >= 1.0 or zlib.crc32(f"{app}:{session_id}".encode()) / 2 ** 32 < self.sample_rate
+
+    def start_turn(self, app: str, session_id: Optional[str], user: str):
+        """Begin recording a turn; sessions outside the sample get a shared no-op record"""
+        session_id = session_id or ""
+        if not self.sampled(app, session_id):
+            record = NOOP_RECORD
+        else:
+            if self._thread is None:
+                self._start_writer()
+            record = TurnRecord(self, app, session_id, user)
+        _current_record.set(record)
+        return record
+
+    def _start_writer(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="recording-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self) -> None:
+        """Append everything buffered so far to the recording file"""
+        with self._lock:
+            batch = []
+            while self._buffer:
+                batch.append(self._buffer.popleft())
+            if not batch:
+                return
+            try:
+                with self.path.open("a", encoding="utf-8") as handle:
+                    handle.writelines(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in batch)
+            except OSError:
+                self.dropped += len(batch)
+
+
+def recorder_from_env() -> Recorder:
+    """Recorder configured by RECORD_FILE and RECORD_SAMPLE_RATE (share of sessions, default 1.0)"""
+    return Recorder(os.getenv("RECORD_FILE"), sample_rate=float(os.getenv("RECORD_SAMPLE_RATE", "1.0")))
+
+
+recorder = recorder_from_env()
+
+
+def load_recording(path: str) -> Dict[tuple, List[Dict[str, Any]]]:
+    """Recorded turns grouped into conversations by ``(app, session_id)``, in order"""
+    conversations: Dict[tuple, List[Dict[str, Any]]] = {}
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                conversations.setdefault((record["app"], record["session_id"]), []).append(record)
+    for turns in conversations.values():
+        turns.sort(key=lambda record: record["at"])
+    return conversations
\ No newline at end of file
@@ -0,0 +1,70 @@
+import re
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+
+class RouteMatch(NamedTuple):
+    route: Optional[str]
+    keyword: Optional[str]
+    entity: Optional[str]
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex whose alternation branches on one character at a time"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        optional = "" in node
+        branches = []
+        for char in sorted(key for key in node if key):
+            branches.append(re.escape(char) + build(node[char]))
+        if not branches:
+            return ""
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if optional else body
+
+    return build(trie)
+
+
+class IntentRouter:
+    """Routes a message to an intent and entity with a single compiled regex scan.
+
+    ``routes`` is an ordered sequence of ``(route, keywords)`` pairs; when a message
+    contains keywords from several routes the earliest route wins. ``entities`` maps
+    an entity value (e.g. a destination) to the phrases that mention it. Keywords
+    only match whole words, so "hi" no longer matches "this".
+    """
+
+    def __init__(self, routes: Sequence[Tuple[str, Iterable[str]]], entities: Optional[Dict[str, Iterable[str]]] = None, default: Optional[str] = None):
+        self.routes = [name for name, _ in routes]
+        self.default = default
+        self._lookup: Dict[str, Tuple[Optional[int], Optional[str]]] = {}
+        for priority, (name, keywords) in enumerate(routes):
+            for keyword in keywords:
+                self._lookup.setdefault(keyword.lower(), (priority, None))
+        for value, aliases in (entities or {}).items():
+            for alias in aliases:
+                priority, _ = self._lookup.get(alias.lower(), (None, None))
+                self._lookup[alias.lower()] = (priority, value)
+        self._pattern = re.compile(r"(?<!\w)" + _trie_pattern(self._lookup) + r"(?!\w)", re.IGNORECASE)
+
+    def route(self, text: str) -> RouteMatch:
+        """Return the winning route, the keyword that selected it and the first entity"""
+        best: Optional[int] = None
+        keyword = entity = None
+        for found in self._pattern.finditer(text):
+            phrase = found.group().lower()
+            priority, value = self._lookup[phrase]
+            if value is not None and entity is None:
+                entity = value
+            if priority is not None and (best is None or priority < best):
+                best, keyword = priority, phrase
+        if best is None:
+            return RouteMatch(self.default, None, entity)
+        return RouteMatch(self.routes[best], keyword, entity)
\ No newline at end of file
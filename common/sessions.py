@@ -0,0 +1,266 @@
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from .history import ChatHistory
+
+HistoryFactory = Callable[[], ChatHistory]
+
+
+def encode_history(history: ChatHistory) -> bytes:
+    return zlib.compress(json.dumps(history.state(), separators=(",", ":")).encode(), 1)
+
+
+def decode_history(blob: bytes, history: ChatHistory) -> ChatHistory:
+    return history.restore(json.loads(zlib.decompress(blob)))
+
+
+class Session:
+    """One user's conversation state.
+
+    ``values`` holds small JSON-able entries (current agent name, current field...)
+    behind the same ``get``/``set`` interface as ``cl.user_session``, so agents can be
+    handed either. The history is kept as a compressed blob until ``history`` is
+    first read.
+    """
+
+    __slots__ = ("id", "values", "touched", "_history", "_blob", "_new_history")
+
+    def __init__(self, session_id: str, values: Optional[Dict[str, Any]] = None, blob: Optional[bytes] = None,
+                 new_history: HistoryFactory = ChatHistory):
+        self.id = session_id
+        self.values = values or {}
+        self.touched = 0.0
+        self._history: Optional[ChatHistory] = None
+        self._blob = blob
+        self._new_history = new_history
+
+    def get(self, key: str, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key: str, value) -> None:
+        self.values[key] = value
+
+    @property
+    def history(self) -> ChatHistory:
+        if self._history is None:
+            history = self._new_history()
+            self._history = decode_history(self._blob, history) if self._blob else history
+            self._blob = None
+        return self._history
+
+    def dump(self) -> Optional[bytes]:
+        """History as a compressed blob, without decoding it if it was never read"""
+        return encode_history(self._history) if self._history is not None else self._blob
+
+    def compact(self) -> None:
+        self._blob = self.dump()
+        self._history = None
+
+
+class SessionStore(ABC):
+    """Where handlers keep per-user state instead of ``cl.user_session``.
+
+    Handlers use the async ``asession``/``asave``/``areset``, which run the store's
+    calls in a worker thread when it does blocking I/O (``blocking``), so a slow
+    disk or a locked database never stalls the event loop.
+    """
+
+    blocking = False
+
+    def __init__(self, new_history: HistoryFactory = ChatHistory):
+        self.new_history = new_history
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[Session]:
+        ...
+
+    @abstractmethod
+    def save(self, session: Session) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    def session(self, session_id: str) -> Session:
+        """The stored session, or a fresh one (not saved until ``save``)"""
+        session = self.load(session_id)
+        return session if session is not None else Session(session_id, new_history=self.new_history)
+
+    def reset(self, session_id: str) -> Session:
+        self.delete(session_id)
+        return Session(session_id, new_history=self.new_history)
+
+    async def _run(self, func: Callable, *args):
+        return await asyncio.to_thread(func, *args) if self.blocking else func(*args)
+
+    async def asession(self, session_id: str) -> Session:
+        return await self._run(self.session, session_id)
+
+    async def asave(self, session: Session) -> None:
+        await self._run(self.save, session)
+
+    async def areset(self, session_id: str) -> Session:
+        return await self._run(self.reset, session_id)
+
+
+class MemorySessionStore(SessionStore):
+    """In-process store with idle eviction.
+
+    Sessions untouched for ``idle_ttl`` seconds are moved to ``spill`` (e.g. a
+    SQLiteSessionStore) when one is given, otherwise compacted in place to their
+    history blob; past ``max_idle`` compacted sessions the oldest are dropped. The
+    sweep runs on access and only looks at the oldest sessions. With a spill the
+    store blocks on its I/O, and a lock keeps the worker threads from interleaving.
+    """
+
+    def __init__(self, new_history: HistoryFactory = ChatHistory, idle_ttl: float = 300.0,
+                 spill: Optional[SessionStore] = None, clock: Callable[[], float] = time.monotonic,
+                 max_idle: int = 10000):
+        super().__init__(new_history)
+        self.idle_ttl = idle_ttl
+        self.spill = spill
+        self.clock = clock
+        self.max_idle = max_idle
+        self.blocking = spill is not None and spill.blocking
+        self.evictions = 0
+        self.dropped = 0
+        self._lock = threading.RLock()
+        self._live: "OrderedDict[str, Session]" = OrderedDict()
+        self._idle: Dict[str, Session] = {}
+
+    def load(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            self.evict_idle()
+            session = self._live.get(session_id) or self._idle.pop(session_id, None)
+            if session is None and self.spill is not None:
+                session = self.spill.load(session_id)
+                if session is not None:
+                    self.spill.delete(session_id)
+            if session is not None:
+                self._touch(session)
+            return session
+
+    def save(self, session: Session) -> None:
+        with self._lock:
+            self._idle.pop(session.id, None)
+            self._touch(session)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._live.pop(session_id, None)
+            self._idle.pop(session_id, None)
+            if self.spill is not None:
+                self.spill.delete(session_id)
+
+    def _touch(self, session: Session) -> None:
+        session.touched = self.clock()
+        self._live[session.id] = session
+        self._live.move_to_end(session.id)
+
+    def evict_idle(self) -> int:
+        """Move sessions idle for longer than ``idle_ttl`` out of the live set"""
+        with self._lock:
+            cutoff = self.clock() - self.idle_ttl
+            evicted = 0
+            while self._live:
+                session = next(iter(self._live.values()))
+                if session.touched > cutoff:
+                    break
+                self._live.popitem(last=False)
+                if self.spill is not None:
+                    self.spill.save(session)
+                else:
+                    session.compact()
+                    self._idle[session.id] = session
+                evicted += 1
+            # Compacted in eviction order: the first are the longest idle
+            while len(self._idle) > self.max_idle:
+                del self._idle[next(iter(self._idle))]
+                self.dropped += 1
+            self.evictions += evicted
+            return evicted
+
+    def stats(self) -> Dict[str, int]:
+        return {"live": len(self._live), "idle": len(self._idle), "evictions": self.evictions, "dropped": self.dropped}
+
+    def __len__(self) -> int:
+        return len(self._live) + len(self._idle)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions in a local SQLite file (WAL mode), shared by every worker process that opens it.
+
+    Each app uses its own table (``namespace``). Values must be JSON-serializable;
+    the history is stored as a compressed blob and decoded only when read.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str = "sessions.db", namespace: str = "sessions",
+                 new_history: HistoryFactory = ChatHistory):
+        super().__init__(new_history)
+        if not re.fullmatch(r"\w+", namespace):
+            raise ValueError(f"Invalid session namespace: {namespace!r}")
+        self.path = path
+        self.table = namespace
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS {self.table} "
+                         "(id TEXT PRIMARY KEY, session_values TEXT NOT NULL, history BLOB, updated REAL NOT NULL)")
+
+    def load(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            row = self._db.execute(f"SELECT session_values, history FROM {self.table} WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        return Session(session_id, json.loads(row[0]), row[1], new_history=self.new_history)
+
+    def save(self, session: Session) -> None:
+        values = json.dumps(session.values, separators=(",", ":"))
+        blob = session.dump()
+        with self._lock:
+            self._db.execute(f"INSERT OR REPLACE INTO {self.table} (id, session_values, history, updated) VALUES (?, ?, ?, ?)",
+                             (session.id, values, blob, time.time()))
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._db.execute(f"DELETE FROM {self.table} WHERE id = ?", (session_id,))
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+def store_from_env(namespace: str, new_history: HistoryFactory = ChatHistory) -> SessionStore:
+    """Session store chosen by SESSION_STORE.
+
+    ``memory`` (default) keeps sessions in-process and evicts those idle for
+    SESSION_IDLE_TTL seconds to SESSION_DB when it is set, or else keeps at most
+    SESSION_MAX_IDLE (default 10000) of them compacted. ``sqlite`` reads and writes
+    every turn through SESSION_DB (default ``sessions.db``) so several workers can
+    serve the same users.
+    """
+    backend = os.getenv("SESSION_STORE", "memory")
+    path = os.getenv("SESSION_DB")
+    if backend == "sqlite":
+        return SQLiteSessionStore(path or "sessions.db", namespace, new_history)
+    if backend != "memory":
+        raise ValueError(f"Unknown SESSION_STORE: {backend}")
+    spill = SQLiteSessionStore(path, namespace, new_history) if path else None
+    return MemorySessionStore(new_history, idle_ttl=float(os.getenv("SESSION_IDLE_TTL", "300")), spill=spill,
+                              max_idle=int(os.getenv("SESSION_MAX_IDLE", "10000")))
\ No newline at end of file
@@ -0,0 +1,215 @@
+import heapq
+import re
+import zlib
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+_WORDS = re.compile(r"[a-z0-9]+")
+
+# Candidates first ranked for a whole-word search, on top of k; widened while the word check leaves too few
+WHOLE_WORD_SLACK = 16
+
+_numpy: Any = None
+
+
+def _load_numpy():
+    """NumPy if installed, imported on first use so importing an app stays light"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def ngrams(text: str, n: int = 3) -> List[str]:
+    """Character n-grams of each word, padded with spaces so word starts and ends count"""
+    grams = []
+    for word in _WORDS.findall(text.lower()):
+        padded = f" {word} "
+        grams.extend(padded[index:index + n] for index in range(max(1, len(padded) - n + 1)))
+    return grams
+
+
+def word_forms(text: str) -> Set[str]:
+    """The words of ``text``, each also without a plural ending ("nurses": "nurse", "classes": "class")"""
+    forms = set()
+    for word in _WORDS.findall(text.lower()):
+        forms.add(word)
+        if word.endswith("s"):
+            forms.add(word[:-1])
+            if word.endswith("es"):
+                forms.add(word[:-2])
+    return forms
+
+
+def has_words(name: str, forms: Set[str]) -> bool:
+    """Whether every word of ``name`` is one of ``forms`` (so the word "Excel" is not in "excellent")"""
+    words = _WORDS.findall(name.lower())
+    return bool(words) and all(word in forms for word in words)
+
+
+def whole_word_rank(text: str, k: int, rank: Callable[[int], List[Tuple[int, float]]],
+                    names: Callable[[List[int]], List[str]]) -> List[Tuple[int, float]]:
+    """The ``k`` best (row, score) pairs of ``rank`` whose name ``has_words`` of ``text``.
+
+    ``rank(n)`` gives the ``n`` best rows, best first; ``names(rows)`` their names.
+    Substring hits ("excellent" for "Excel") can outrank every whole-word match,
+    so the candidates are widened until ``k`` survive or the ranking runs out.
+    """
+    forms = word_forms(text)
+    wanted = k + WHOLE_WORD_SLACK
+    while True:
+        scored = rank(wanted)
+        names_of = names([row for row, _ in scored]) if scored else []
+        kept = [item for item, name in zip(scored, names_of) if has_words(name, forms)]
+        if len(kept) >= k or len(scored) < wanted:
+            return kept[:k]
+        wanted *= 4
+
+
+def bucket(gram: str, dims: int) -> int:
+    """The hashed bucket of an n-gram: stable across processes, unlike ``hash``"""
+    return zlib.crc32(gram.encode()) % dims
+
+
+def gram_weights(text: str, dims: int = 1 << 16, n: int = 3) -> Dict[int, float]:
+    """Buckets of ``text``'s n-grams, each weighted by its share so they sum to 1"""
+    counts: Dict[int, int] = {}
+    for gram in ngrams(text, n):
+        index = bucket(gram, dims)
+        counts[index] = counts.get(index, 0) + 1
+    total = sum(counts.values())
+    return {index: count / total for index, count in counts.items()}
+
+
+def rank_arrays(rows, weights, size: int, k: int, min_score: float = 0.0) -> List[Tuple[int, float]]:
+    """The ``k`` rows of ``0..size`` with the largest summed weight, with NumPy.
+
+    ``rows`` and ``weights`` are parallel arrays of postings; a row may appear in
+    several. Best first, ties to the lower row.
+    """
+    np = _load_numpy()
+    if not len(rows) or k <= 0:
+        return []
+    scores = np.bincount(rows, weights=weights, minlength=size)
+    if k == 1:
+        # argmax returns the first of equal scores, i.e. the lowest row
+        row = int(np.argmax(scores))
+        return [(row, float(scores[row]))]
+    candidates = np.flatnonzero(scores > min_score)
+    if len(candidates) > k:
+        # Everything tied with the k-th best, then ordered by score and row
+        kth = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+        candidates = candidates[scores[candidates] >= kth]
+    best = candidates[np.lexsort((candidates, -scores[candidates]))[:k]]
+    return [(int(row), float(scores[row])) for row in best]
+
+
+def rank_postings(postings: Iterable[Tuple[Sequence[int], Sequence[float]]], k: int,
+                  min_score: float = 0.0) -> List[Tuple[int, float]]:
+    """``rank_arrays`` in pure Python, over posting lists of (rows, weights)"""
+    scores: Dict[int, float] = {}
+    for rows, weights in postings:
+        for row, weight in zip(rows, weights):
+            scores[row] = scores.get(row, 0.0) + weight
+    return heapq.nsmallest(k, ((row, score) for row, score in scores.items() if score > min_score),
+                           key=lambda item: (-item[1], item[0]))
+
+
+class Match(NamedTuple):
+    key: Hashable
+    text: str
+    score: float
+
+
+class SimilarityIndex:
+    """Fuzzy lookup of short texts (names, skills, roles) by hashed character n-grams.
+
+    Each entry is a vector over ``dims`` buckets (the crc32 of its n-grams),
+    weighted to sum to 1. A query scores an entry by the share of the entry's
+    n-grams found anywhere in the query, so "I'd like nursing" finds "Nurse"
+    whatever else the message says. That is one sparse matrix-vector product over
+    the posting lists of the query's buckets, then a top-k selection; the cost
+    follows the postings touched, not the size of the index. With NumPy installed
+    the postings are flat arrays and both steps are vectorized; without it the
+    same sums run in Python (``vectorized=False`` forces that). Nothing is
+    downloaded or trained.
+
+    N-grams also match inside longer words ("Doctor" in "doctorate"). With
+    ``whole_words`` a search keeps only entries whose every word is a word of the
+    query, give or take a plural ending; the n-gram score still ranks them.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Hashable]], dims: int = 1 << 16, n: int = 3,
+                 vectorized: Optional[bool] = None):
+        self.dims = dims
+        self.n = n
+        self.texts: List[str] = []
+        self.keys: List[Hashable] = []
+        rows: List[int] = []
+        buckets: List[int] = []
+        weights: List[float] = []
+        for text, key in entries:
+            row = len(self.keys)
+            self.texts.append(text)
+            self.keys.append(key)
+            for index, weight in gram_weights(text, dims, n).items():
+                rows.append(row)
+                buckets.append(index)
+                weights.append(weight)
+
+        np = _load_numpy()
+        self.vectorized = np is not None if vectorized is None else vectorized and np is not None
+        if self.vectorized:
+            # Postings sorted by bucket: bucket b's entries are rows[indptr[b]:indptr[b + 1]]
+            bucket_array = np.asarray(buckets, dtype=np.int64)
+            order = np.argsort(bucket_array, kind="stable")
+            self._rows = np.asarray(rows, dtype=np.int32)[order]
+            self._weights = np.asarray(weights, dtype=np.float64)[order]
+            self._indptr = np.concatenate(([0], np.cumsum(np.bincount(bucket_array, minlength=dims))))
+        else:
+            self._postings: Dict[int, Tuple[List[int], List[float]]] = {}
+            for row, bucket, weight in zip(rows, buckets, weights):
+                posting = self._postings.setdefault(bucket, ([], []))
+                posting[0].append(row)
+                posting[1].append(weight)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def search(self, text: str, k: int = 5, min_score: float = 0.0, whole_words: bool = False) -> List[Match]:
+        """The ``k`` best entries for ``text``, best first; ties keep insertion order"""
+        buckets = sorted({bucket(gram, self.dims) for gram in ngrams(text, self.n)})
+        if not buckets or not self.keys or k <= 0:
+            return []
+        search = self._search_arrays if self.vectorized else self._search_postings
+
+        def rank(count: int) -> List[Tuple[int, float]]:
+            return [(row, score) for row, score in search(buckets, count, min_score) if score > min_score]
+
+        if whole_words:
+            scored = whole_word_rank(text, k, rank, lambda rows: [self.texts[row] for row in rows])
+        else:
+            scored = rank(k)
+        return [Match(self.keys[row], self.texts[row], score) for row, score in scored]
+
+    def _search_arrays(self, buckets: Sequence[int], k: int, min_score: float) -> List[Tuple[int, float]]:
+        np = _numpy
+        buckets = np.asarray(buckets)
+        starts = self._indptr[buckets]
+        lengths = self._indptr[buckets + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return []
+        # All the buckets' postings in one gather: block i covers starts[i]:starts[i] + lengths[i]
+        positions = np.arange(total) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return rank_arrays(self._rows[positions], self._weights[positions], len(self.keys), k, min_score)
+
+    def _search_postings(self, buckets: Sequence[int], k: int, min_score: float) -> List[Tuple[int, float]]:
+        return rank_postings((self._postings[index] for index in buckets if index in self._postings), k, min_score)
+
+    def best(self, text: str, min_score: float = 0.0, whole_words: bool = False) -> Optional[Match]:
+        matches = self.search(text, k=1, min_score=min_score, whole_words=whole_words)
+        return matches[0] if matches else None
\ No newline at end of file
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+
+class BufferedStream:
+    """Drop-in wrapper around ``cl.Message`` that coalesces streamed deltas.
+
+    ``stream_token`` only buffers; the buffer is sent as one frame once it reaches
+    ``max_chars`` or ``interval`` seconds have passed since the last flush. While
+    deltas keep coming they do the flushing; only when the upstream stalls (no delta
+    for ``interval`` seconds: a tool call, a slow model) does a timer send what is
+    buffered, from a single flusher task. Text stays in the buffer, and in
+    ``content``, until the wrapped message has taken it, so a turn cancelled
+    mid-send keeps it. Call ``flush`` (or use ``async with``) at the end of the
+    stream to send the rest; it waits for a timed send still under way. The first
+    delta is sent at once, so buffering never delays the first byte. Everything
+    else is forwarded to the wrapped message.
+    """
+
+    def __init__(self, message, max_chars: int = 200, interval: float = 0.03,
+                 clock: Callable[[], float] = time.monotonic):
+        self.message = message
+        self.max_chars = max_chars
+        self.interval = interval
+        self.clock = clock
+        self.frames = 0
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._sent = message.content
+        self._last_flush = float("-inf")
+        self._last_token = float("-inf")
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    @property
+    def content(self) -> str:
+        return self._sent + "".join(self._buffer)
+
+    async def stream_token(self, token: str) -> None:
+        if not token:
+            return
+        self._buffer.append(token)
+        self._buffered += len(token)
+        now = self._last_token = self.clock()
+        # A timed send under way just reset the interval: this delta waits for the next frame
+        due = self._flusher is None and now - self._last_flush >= self.interval
+        if self._buffered >= self.max_chars or due:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.interval, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if not self._buffer:
+            return
+        idle = self.clock() - self._last_token
+        if idle < self.interval or self._flusher is not None:
+            # Still streaming (the next delta flushes) or a send under way: look again later
+            delay = self.interval - idle if idle < self.interval else self.interval
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+            return
+        self._flusher = asyncio.ensure_future(self._timed_flush())
+
+    async def _timed_flush(self) -> None:
+        try:
+            await self._send()
+        finally:
+            self._flusher = None
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flusher is not None and self._flusher is not asyncio.current_task():
+            await self._flusher
+        await self._send()
+
+    async def _send(self) -> None:
+        self._last_flush = self.clock()
+        if not self._buffer:
+            return
+        count, chunk = len(self._buffer), "".join(self._buffer)
+        await self.message.stream_token(chunk)
+        # Only now is the chunk the message's: cancelled before this, it is still ours to send
+        del self._buffer[:count]
+        self._buffered -= len(chunk)
+        self._sent += chunk
+        self.frames += 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.message, name)
\ No newline at end of file
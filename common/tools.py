@@ -0,0 +1,113 @@
+import asyncio
+import inspect
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .deadlines import DeadlineExceeded, current_deadline
+from .recording import record_tool
+from .tracing import span
+
+ToolCall = Tuple[str, Dict[str, Any]]
+
+
+class ToolStats:
+    __slots__ = ("calls", "cache_hits", "errors", "timeouts", "total_seconds", "max_seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        executed = self.calls - self.cache_hits
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "mean_ms": self.total_seconds / executed * 1e3 if executed else 0.0,
+            "max_ms": self.max_seconds * 1e3,
+        }
+
+
+class ToolExecutor:
+    """Runs an agent's tool calls for a turn concurrently.
+
+    Async tools are awaited on the loop, sync tools run in a worker thread unless
+    listed in ``inline`` (for trivial CPU-only helpers). Each call is bounded by
+    ``timeout`` (or its entry in ``timeouts``) and by the current turn's deadline,
+    which raises ``DeadlineExceeded`` when it is the one to run out. Results of tools listed in ``pure``
+    are memoized by arguments. Per-tool latency is kept in ``stats``.
+    """
+
+    def __init__(self, tools: Dict[str, Callable], timeout: Optional[float] = 10.0,
+                 timeouts: Optional[Dict[str, float]] = None, pure: Iterable[str] = (),
+                 inline: Iterable[str] = (), cache_size: int = 256):
+        self.tools = tools
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.pure = set(pure)
+        self.inline = set(inline)
+        self.cache_size = cache_size
+        self.stats: Dict[str, ToolStats] = {name: ToolStats() for name in tools}
+        self._cache: "OrderedDict[Tuple[str, Tuple], Any]" = OrderedDict()
+
+    async def call(self, name: str, **kwargs) -> Any:
+        started = time.perf_counter()
+        try:
+            with span("tool", tool=name):
+                return await self._call(name, **kwargs)
+        finally:
+            record_tool(name, kwargs, time.perf_counter() - started)
+
+    async def _call(self, name: str, **kwargs) -> Any:
+        tool = self.tools[name]
+        stats = self.stats[name]
+        stats.calls += 1
+        key = (name, tuple(sorted(kwargs.items()))) if name in self.pure else None
+        if key is not None and key in self._cache:
+            stats.cache_hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        started = time.perf_counter()
+        deadline = current_deadline()
+        try:
+            if inspect.iscoroutinefunction(tool):
+                pending = tool(**kwargs)
+            elif name in self.inline:
+                return self._remember(key, tool(**kwargs))
+            else:
+                pending = asyncio.to_thread(tool, **kwargs)
+            result = await asyncio.wait_for(pending, deadline.bound(self.timeouts.get(name, self.timeout)))
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            if deadline.expired:
+                raise DeadlineExceeded(deadline.seconds) from None
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+        return self._remember(key, result)
+
+    def _remember(self, key, result):
+        if key is not None:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    async def run(self, calls: Sequence[ToolCall], return_exceptions: bool = False) -> List[Any]:
+        """Execute independent calls concurrently; results come back in call order"""
+        return await asyncio.gather(*(self.call(name, **kwargs) for name, kwargs in calls), return_exceptions=return_exceptions)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
\ No newline at end of file
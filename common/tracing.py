@@ -0,0 +1,296 @@
+import atexit
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+
+class Span:
+    __slots__ = ("name", "span_id", "start_ns", "end_ns", "attributes", "events")
+
+    def __init__(self, name: str, span_id: int, attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = span_id
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.events: List[tuple] = []
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def event(self, name: str) -> None:
+        self.events.append((name, time.perf_counter_ns()))
+
+    def end(self) -> None:
+        if not self.end_ns:
+            self.end_ns = time.perf_counter_ns()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end()
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key, value):
+        pass
+
+    def event(self, name):
+        pass
+
+    def end(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class StreamSpans:
+    """Splits a streamed model call into ``model`` (until the first token) and ``streaming`` spans"""
+
+    def __init__(self, turn: "Turn", attributes: Dict[str, Any]):
+        self.turn = turn
+        self.model = turn.span("model", **attributes)
+        self.streaming: Optional[Span] = None
+        self.tokens = 0
+
+    def token(self) -> None:
+        self.tokens += 1
+        if self.streaming is None:
+            self.model.end()
+            self.streaming = self.turn.span("streaming")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self.streaming or self.model
+        span.set("tokens", self.tokens)
+        span.__exit__(exc_type, exc, tb)
+
+
+class _NoopStreamSpans:
+    __slots__ = ()
+
+    def token(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NOOP_STREAM = _NoopStreamSpans()
+
+
+class Turn:
+    """Spans recorded for one chat turn; handed to the tracer's buffer on ``end``"""
+
+    def __init__(self, tracer: "Tracer", app: str, session_id: Optional[str], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.trace_id = random.getrandbits(128)
+        self.root = Span("turn", random.getrandbits(64), {"app": app, "session_id": session_id or "", **attributes})
+        self.unix_offset_ns = time.time_ns() - self.root.start_ns
+        self.spans: List[Span] = []
+
+    def span(self, name: str, **attributes) -> Span:
+        span = Span(name, random.getrandbits(64), attributes)
+        self.spans.append(span)
+        return span
+
+    def stream(self, **attributes) -> StreamSpans:
+        return StreamSpans(self, attributes)
+
+    def set(self, key: str, value: Any) -> None:
+        self.root.set(key, value)
+
+    def end(self) -> None:
+        if not self.root.end_ns:
+            self.root.end_ns = time.perf_counter_ns()
+            self.tracer._buffer.append(self)
+
+
+class _NoopTurn:
+    __slots__ = ()
+
+    def span(self, name, **attributes):
+        return NOOP_SPAN
+
+    def stream(self, **attributes):
+        return NOOP_STREAM
+
+    def set(self, key, value):
+        pass
+
+    def end(self):
+        pass
+
+
+NOOP_TURN = _NoopTurn()
+
+# The turn being handled in this task; asyncio tasks and Runner's executor calls copy it
+_current_turn: contextvars.ContextVar = contextvars.ContextVar("trace_turn", default=NOOP_TURN)
+
+
+def span(name: str, **attributes):
+    """Span on the current turn, for library code that has no handle on it (no-op outside a traced turn)"""
+    return _current_turn.get().span(name, **attributes)
+
+
+class JsonlExporter:
+    """One JSON object per turn with its phases as millisecond offsets"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def export(self, turns: List[Turn]) -> None:
+        with self.path.open("a", encoding="utf-8") as handle:
+            for turn in turns:
+                root = turn.root
+                record = {
+                    "trace_id": f"{turn.trace_id:032x}",
+                    "start": (root.start_ns + turn.unix_offset_ns) / 1e9,
+                    "duration_ms": (root.end_ns - root.start_ns) / 1e6,
+                    **root.attributes,
+                    "spans": [
+                        {
+                            "name": span.name,
+                            "offset_ms": (span.start_ns - root.start_ns) / 1e6,
+                            "duration_ms": ((span.end_ns or root.end_ns) - span.start_ns) / 1e6,
+                            **span.attributes,
+                            **{f"{name}_ms": (at - root.start_ns) / 1e6 for name, at in span.events},
+                        }
+                        for span in turn.spans
+                    ],
+                }
+                handle.write(json.dumps(record, default=str) + "\n")
+
+
+class OtlpJsonExporter:
+    """OTLP/JSON lines, readable by the OpenTelemetry collector's otlpjsonfile receiver"""
+
+    def __init__(self, path: str, service_name: str = "agents-chat"):
+        self.path = Path(path)
+        self.service_name = service_name
+
+    @staticmethod
+    def _attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [{"key": key, "value": {"stringValue": str(value)}} for key, value in values.items()]
+
+    def _span(self, turn: Turn, span: Span, parent: Optional[Span]) -> Dict[str, Any]:
+        end_ns = span.end_ns or turn.root.end_ns
+        record = {
+            "traceId": f"{turn.trace_id:032x}",
+            "spanId": f"{span.span_id:016x}",
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_ns + turn.unix_offset_ns),
+            "endTimeUnixNano": str(end_ns + turn.unix_offset_ns),
+            "attributes": self._attributes(span.attributes),
+            "events": [{"name": name, "timeUnixNano": str(at + turn.unix_offset_ns)} for name, at in span.events],
+        }
+        if parent is not None:
+            record["parentSpanId"] = f"{parent.span_id:016x}"
+        return record
+
+    def export(self, turns: List[Turn]) -> None:
+        spans = []
+        for turn in turns:
+            spans.append(self._span(turn, turn.root, None))
+            spans.extend(self._span(turn, span, turn.root) for span in turn.spans)
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": self._attributes({"service.name": self.service_name})},
+            "scopeSpans": [{"scope": {"name": "common.tracing"}, "spans": spans}],
+        }]}
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(payload) + "\n")
+
+
+class Tracer:
+    """Sampled per-turn span recorder.
+
+    Finished turns are appended to an in-memory buffer; a daemon thread drains it to
+    the exporter every ``flush_interval`` seconds (or sooner once ``batch_size`` turns
+    are waiting), so the request path never touches the file.
+    """
+
+    def __init__(self, exporter=None, sample_rate: float = 1.0, flush_interval: float = 1.0,
+                 batch_size: int = 256, max_buffer: int = 10000):
+        self.exporter = exporter
+        self.sample_rate = sample_rate if exporter is not None else 0.0
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._buffer: Deque[Turn] = deque(maxlen=max_buffer)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start_turn(self, app: str, session_id: Optional[str] = None, **attributes):
+        """Begin tracing a turn; unsampled turns get a shared no-op recorder"""
+        if self.sample_rate <= 0.0 or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            turn = NOOP_TURN
+        else:
+            if self._thread is None:
+                self._start_writer()
+            if len(self._buffer) >= self.batch_size:
+                self._wake.set()
+            turn = Turn(self, app, session_id, attributes)
+        _current_turn.set(turn)
+        return turn
+
+    def _start_writer(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Export everything buffered so far"""
+        with self._lock:
+            batch = []
+            while self._buffer:
+                batch.append(self._buffer.popleft())
+            if batch:
+                try:
+                    self.exporter.export(batch)
+                except OSError:
+                    self.dropped += len(batch)
+
+
+def tracer_from_env() -> Tracer:
+    """Tracer configured by TRACE_FILE, TRACE_FORMAT (jsonl or otlp) and TRACE_SAMPLE_RATE"""
+    path = os.getenv("TRACE_FILE")
+    if not path:
+        return Tracer()
+    exporter = OtlpJsonExporter(path) if os.getenv("TRACE_FORMAT", "jsonl") == "otlp" else JsonlExporter(path)
+    return Tracer(exporter, sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0")))
+
+
+tracer = tracer_from_env()
\ No newline at end of file
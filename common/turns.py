@@ -0,0 +1,82 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+SERIALIZE = "serialize"
+SUPERSEDE = "supersede"
+
+
+class _SessionTurns:
+    __slots__ = ("lock", "task", "cancelled", "latest", "pending")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.task: Optional[asyncio.Task] = None
+        self.cancelled = False
+        self.latest = 0
+        self.pending = 0
+
+
+class TurnCoordinator:
+    """Orders the turns of each session.
+
+    In ``serialize`` mode a new message waits for the session's running turn to
+    finish. In ``supersede`` mode it cancels the running turn (its model stream and
+    tool calls with it), skips any older turn still waiting, and starts once the
+    cancelled turn's cleanup is done, so the history is only ever written by one
+    turn at a time. ``run`` returns ``None`` for a superseded turn.
+    """
+
+    def __init__(self, mode: str = SUPERSEDE):
+        if mode not in (SERIALIZE, SUPERSEDE):
+            raise ValueError(f"Unknown turn mode: {mode}")
+        self.mode = mode
+        self.turns = 0
+        self.superseded = 0
+        self.queued = 0
+        self._sessions: Dict[str, _SessionTurns] = {}
+
+    async def run(self, session_id: str, turn: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = _SessionTurns()
+        state.latest += 1
+        generation = state.latest
+        state.pending += 1
+        if state.task is not None and not state.task.done():
+            if self.mode == SUPERSEDE:
+                if not state.cancelled:
+                    state.cancelled = True
+                    state.task.cancel()
+                    self.superseded += 1
+            else:
+                self.queued += 1
+        try:
+            async with state.lock:
+                if self.mode == SUPERSEDE and generation != state.latest:
+                    # A newer message arrived while this one waited; it never starts
+                    self.superseded += 1
+                    return None
+                task = asyncio.ensure_future(turn())
+                state.task, state.cancelled = task, False
+                self.turns += 1
+                try:
+                    return await task
+                except asyncio.CancelledError:
+                    if not (task.cancelled() and state.cancelled and state.task is task):
+                        raise
+                    return None
+                finally:
+                    state.task = None
+        finally:
+            state.pending -= 1
+            if not state.pending:
+                del self._sessions[session_id]
+
+    def metrics(self) -> Dict[str, int]:
+        return {"turns": self.turns, "superseded": self.superseded, "queued": self.queued, "sessions": len(self._sessions)}
+
+
+def coordinator_from_env(default: str = SUPERSEDE) -> TurnCoordinator:
+    """TurnCoordinator in the mode named by TURN_MODE, or ``default``"""
+    return TurnCoordinator(os.getenv("TURN_MODE", default))
\ No newline at end of file
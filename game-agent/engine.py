@@ -0,0 +1,264 @@
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.router import IntentRouter
+
+
+class Obstacle(NamedTuple):
+    name: str
+    difficulty: int  # d10 roll needed to sneak past
+    item: str  # item that gets you past without a roll
+    success: str
+    failure: str
+
+
+class Event(NamedTuple):
+    text: str
+    item: Optional[str]
+
+
+class Location(NamedTuple):
+    name: str
+    description: str
+    exits: Tuple[str, ...]
+    obstacle: Optional[str]
+    events: Tuple[Event, ...]
+
+
+OBSTACLES = {
+    "creaky trapdoor": Obstacle(
+        "creaky trapdoor", 5, "rope",
+        "You step lightly along the beams and the trapdoor stays shut.",
+        "The boards groan and you scramble back before the trapdoor gives way.",
+    ),
+    "nosy guard": Obstacle(
+        "nosy guard", 7, "coin",
+        "You slip past while the guard squints at a pigeon.",
+        "\"Where do you think you're going?\" The guard waves you back.",
+    ),
+    "locked gate": Obstacle(
+        "locked gate", 9, "key",
+        "You squeeze through a gap in the railings.",
+        "The railings are too tight and the lock won't budge.",
+    ),
+}
+
+LOCATIONS = {
+    "town square": Location(
+        "town square", "An old fountain gurgles in the middle of the square.",
+        ("library", "market", "old mill"), None,
+        (Event("A stray cat drops a shiny coin at your feet.", "coin"),
+         Event("You hear footsteps approaching from the shadows.", None),
+         Event("Someone has scratched an arrow pointing to the old mill on the fountain's rim.", None)),
+    ),
+    "library": Location(
+        "library", "Dusty shelves lean over a silent reading room.",
+        ("town square", "clock tower"), None,
+        (Event("You find a dusty map hidden behind a bookshelf!", "map"),
+         Event("A torn page mentions a chest beneath the clock tower.", None),
+         Event("A creaky floorboard reveals a coil of rope!", "rope")),
+    ),
+    "market": Location(
+        "market", "Empty stalls rattle in the wind.",
+        ("town square", "old mill"), "nosy guard",
+        (Event("A forgotten purse under a stall holds a coin.", "coin"),
+         Event("A fruit seller whispers that the mill keeper lost a key.", None)),
+    ),
+    "old mill": Location(
+        "old mill", "The wheel creaks slowly over a dark millpond.",
+        ("town square", "market", "clock tower"), "creaky trapdoor",
+        (Event("A creaky floorboard reveals a secret compartment with a rusty key!", "key"),
+         Event("Flour dust swirls in a shaft of light.", None)),
+    ),
+    "clock tower": Location(
+        "clock tower", "Gears tick above a heavy chest bound in iron.",
+        ("library", "old mill"), "locked gate",
+        (Event("A locked chest glints in the corner of the room.", None),
+         Event("The clock strikes and a loose brick falls out, revealing a coin.", "coin")),
+    ),
+}
+
+START = "town square"
+TREASURE_LOCATION = "clock tower"
+ITEMS = {"coin": ["coin", "coins"], "key": ["key", "keys"], "map": ["map", "maps"], "rope": ["rope"]}
+
+# Verbs the engine resolves on its own; anything else is left to the model
+ACTIONS = IntentRouter(
+    routes=[
+        ("inventory", ["inventory", "bag", "pockets", "items"]),
+        ("use", ["use", "unlock", "open", "bribe", "give", "tie"]),
+        ("sneak", ["sneak", "sneaking", "evade", "evading", "dodge", "slip"]),
+        ("move", ["go", "walk", "head", "enter", "visit", "move", "return"]),
+        ("search", ["search", "find", "look", "explore", "inspect", "item", "treasure", "key", "keys", "map", "maps"]),
+    ],
+    entities={
+        "town square": ["town square", "square", "fountain"],
+        "library": ["library"],
+        "market": ["market"],
+        "old mill": ["old mill", "mill"],
+        "clock tower": ["clock tower", "tower"],
+        **ITEMS,
+    },
+)
+
+
+class GameState:
+    """One player's game: location, inventory and obstacles cleared so far.
+
+    ``log`` holds every action the engine applied, so a game is reproduced exactly
+    by ``GameEngine.replay(seed, log)``.
+    """
+
+    __slots__ = ("seed", "turn", "location", "inventory", "cleared", "blocked", "won", "log")
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.turn = 0
+        self.location = START
+        self.inventory: Dict[str, int] = {}
+        self.cleared: List[str] = []
+        # Location the player tried to enter while its obstacle was in the way
+        self.blocked: Optional[str] = None
+        self.won = False
+        self.log: List[List[Optional[str]]] = []
+
+    def rng(self) -> random.Random:
+        """Dice for the current turn, derived from the seed so replays roll the same"""
+        return random.Random(self.seed * 1_000_003 + self.turn)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GameState":
+        state = cls(data["seed"])
+        for slot in cls.__slots__:
+            setattr(state, slot, data[slot])
+        return state
+
+    def describe(self) -> str:
+        """Game facts for the narrator, so model replies agree with the engine"""
+        location = LOCATIONS[self.location]
+        items = ", ".join(f"{item} x{count}" if count > 1 else item for item, count in self.inventory.items()) or "nothing"
+        facts = f"The player is at the {self.location}. {location.description} Paths lead to {', '.join(location.exits)}. They carry {items}."
+        if self.blocked:
+            facts += f" A {LOCATIONS[self.blocked].obstacle} blocks the way to the {self.blocked}."
+        if self.won:
+            facts += " They have already found the treasure."
+        return facts
+
+
+class GameEngine:
+    """Resolves sneak, move, search, use and inventory actions without a model call"""
+
+    def __init__(self, actions: IntentRouter = ACTIONS):
+        self.actions = actions
+
+    def new_game(self, seed: Optional[int] = None) -> GameState:
+        return GameState(random.getrandbits(32) if seed is None else seed)
+
+    def parse(self, text: str) -> Optional[Tuple[str, Optional[str]]]:
+        match = self.actions.route(text)
+        if match.route is None:
+            return None
+        return match.route, match.entity
+
+    def resolve(self, state: GameState, text: str) -> Optional[str]:
+        """Apply the action in ``text``; ``None`` (and no state change) when it needs the model"""
+        action = self.parse(text)
+        if action is None:
+            return None
+        return self.apply(state, *action)
+
+    def apply(self, state: GameState, action: str, target: Optional[str]) -> Optional[str]:
+        reply = getattr(self, f"_{action}")(state, target)
+        if reply is not None:
+            state.log.append([action, target])
+            state.turn += 1
+        return reply
+
+    def replay(self, seed: int, log: Sequence[Sequence[Optional[str]]]) -> GameState:
+        state = GameState(seed)
+        for action, target in log:
+            self.apply(state, action, target)
+        return state
+
+    def _inventory(self, state: GameState, target: Optional[str]) -> str:
+        if not state.inventory:
+            return "🎒 Your pockets are empty. Try searching around."
+        items = "\n".join(f"• {item.title()}" + (f" x{count}" if count > 1 else "") for item, count in state.inventory.items())
+        return f"🎒 **Inventory**:\n\n{items}"
+
+    def _move(self, state: GameState, target: Optional[str]) -> Optional[str]:
+        if target is None or target not in LOCATIONS:
+            return None
+        if target == state.location:
+            return f"📍 You're already at the {target}. {LOCATIONS[target].description}"
+        here = LOCATIONS[state.location]
+        if target not in here.exits:
+            return f"🧭 You can't reach the {target} from the {state.location}. Paths lead to the {', the '.join(here.exits)}."
+        destination = LOCATIONS[target]
+        if destination.obstacle and destination.obstacle not in state.cleared:
+            state.blocked = target
+            obstacle = OBSTACLES[destination.obstacle]
+            return (f"🚨 **Challenge: {obstacle.name.title()}**\n\nA {obstacle.name} stands between you and the {target}. "
+                    f"Try to sneak past, or use a {obstacle.item} if you have one.")
+        return self._arrive(state, target)
+
+    def _arrive(self, state: GameState, target: str) -> str:
+        state.location = target
+        state.blocked = None
+        location = LOCATIONS[target]
+        return f"📍 **{target.title()}**\n\n{location.description}\n\nPaths lead to the {', the '.join(location.exits)}."
+
+    def _sneak(self, state: GameState, target: Optional[str]) -> str:
+        if state.blocked is None:
+            return "👣 You creep around, but nothing is blocking your way right now."
+        obstacle = OBSTACLES[LOCATIONS[state.blocked].obstacle]
+        roll = state.rng().randint(1, 10)
+        dice = f"🎲 You rolled a {roll} on a 10-sided die (you need {obstacle.difficulty})."
+        if roll < obstacle.difficulty:
+            return f"🚨 **Challenge: {obstacle.name.title()}**\n\n{dice}\n\n{obstacle.failure}"
+        state.cleared.append(obstacle.name)
+        return f"🚨 **Challenge: {obstacle.name.title()}**\n\n{dice}\n\n{obstacle.success}\n\n" + self._arrive(state, state.blocked)
+
+    def _search(self, state: GameState, target: Optional[str]) -> str:
+        location = LOCATIONS[state.location]
+        if location.name == TREASURE_LOCATION and "key" in state.inventory and not state.won:
+            return self._use(state, "key")
+        event = state.rng().choice(location.events)
+        text = f"🎁 **Discovery**:\n\n🔔 {event.text}"
+        if event.item:
+            state.inventory[event.item] = state.inventory.get(event.item, 0) + 1
+            text += f"\n\n{event.item.title()} added to your inventory."
+        return text + "\n\nWhat do you do next? (Inspect, move on, use an item, etc.)"
+
+    def _use(self, state: GameState, target: Optional[str]) -> Optional[str]:
+        if target not in ITEMS:
+            return None
+        if target not in state.inventory:
+            return f"🎒 You don't have a {target}."
+        if state.blocked is not None:
+            obstacle = OBSTACLES[LOCATIONS[state.blocked].obstacle]
+            if obstacle.item != target:
+                return f"🚨 The {target} won't help with the {obstacle.name}."
+            self._spend(state, target)
+            state.cleared.append(obstacle.name)
+            return f"✨ You use the {target} and get past the {obstacle.name}.\n\n" + self._arrive(state, state.blocked)
+        if state.location == TREASURE_LOCATION and target == "key" and not state.won:
+            state.won = True
+            return "💰 **Treasure!** The key turns, the chest creaks open and gold coins spill out. You solved the mystery of Willow Creek!"
+        return None
+
+    def _spend(self, state: GameState, item: str) -> None:
+        # Keys and rope are kept; coins are handed over
+        if item == "coin":
+            state.inventory[item] -= 1
+            if not state.inventory[item]:
+                del state.inventory[item]
+
+
+engine = GameEngine()
\ No newline at end of file
@@ -1,32 +1,33 @@
+import asyncio
 import os
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
 import chainlit as cl
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
-try:
-    from agents.run import RunConfig
-except ImportError:
-    RunConfig = None  # Fallback if RunConfig is not available
 import random
 
-load_dotenv()
-api_key = os.getenv("OPENROUTER_API_KEY")
-if not api_key:
-    raise ValueError("OPENROUTER_API_KEY is not set in your .env file.")
-
-client = AsyncOpenAI(
-    api_key=api_key,
-    base_url="https://openrouter.ai/api/v1",
-    default_headers={
-        "HTTP-Referer": "http://localhost:8000",
-        "X-Title": "Mystery Treasure Hunt"
-    }
-)
-
-# Set Gemini model
-model = OpenAIChatCompletionsModel(
-    model="mistralai/mistral-7b-instruct:free",
-    openai_client=client
-)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.admission import Overloaded, provider_admission
+from common.breaker import CircuitOpen, provider_breaker
+from common.clients import model_clients, register_lifecycle
+from common.config import LazyApp, require_env
+from common.deadlines import DeadlineExceeded, start_deadline, turn_deadline_from_env
+from common.history import ChatHistory, estimate_tokens
+from common.recording import recorder
+from common.router import IntentRouter
+from common.sessions import store_from_env
+from common.streaming import BufferedStream
+from common.tracing import tracer
+from common.turns import coordinator_from_env
+from engine import GameState, engine
+
+HISTORY_TOKEN_BUDGET = 2000
+REPLY_TOKEN_ESTIMATE = 300
+
+MODEL_NAME = "mistralai/mistral-7b-instruct:free"
+OPENROUTER_HEADERS = {
+    "HTTP-Referer": "http://localhost:8000",
+    "X-Title": "Mystery Treasure Hunt"
+}
 
 def roll_dice(sides: int = 6) -> str:
     result = random.randint(1, sides)
@@ -42,75 +43,194 @@ def create_event(player_action: str) -> str:
     ]
     return f"🔔 **Event**: {random.choice(events)}"
 
-NarratorAgent = Agent(
-    name="NarratorAgent",
-    instructions="Guide a mystery treasure hunt in a small town. Describe simple scenes (e.g., old library, town square) and prompt player actions (e.g., search, move, inspect). Use events when relevant.",
-    model=model
+# Keyword tables are compiled once; obstacles beat items when both match
+router = IntentRouter(
+    routes=[
+        ("sneak", ["sneak", "sneaking", "evade", "evading"]),
+        ("obstacle", ["trap", "traps", "guard", "guards", "obstacle", "obstacles"]),
+        ("item", ["item", "items", "find", "treasure", "key", "keys", "map", "maps"]),
+    ],
+    default="narrate",
 )
 
-MonsterAgent = Agent(
-    name="MonsterAgent",
-    instructions="Handle obstacles like traps or guards. Use roll_dice to decide outcomes (e.g., evade a trap, sneak past a guard). Keep it simple and non-fantasy (no dragons).",
-    tools={"roll_dice": roll_dice},
-    model=model
-)
-
-ItemAgent = Agent(
-    name="ItemAgent",
-    instructions="Manage player items and rewards (e.g., keys, maps, coins). Use create_event to introduce items or challenges. Keep items everyday and practical.",
-    tools={"create_event": create_event},
-    model=model
-)
+class GameApp:
+    """Clients, agents and env-configured state, built on the first chat rather than at import"""
+
+    def __init__(self):
+        api_key = require_env("OPENROUTER_API_KEY")
+        from agents import Agent
+        try:
+            from agents.run import RunConfig
+        except ImportError:
+            RunConfig = None  # Fallback if RunConfig is not available
+        # Imports the SDK's Model base class, so only once the app is built
+        from common.hedging import HedgedModel, hedge_delay_from_env
+
+        fallback_model_name = os.getenv("OPENROUTER_FALLBACK_MODEL", "meta-llama/llama-3.2-3b-instruct:free")
+        base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+        client, primary_model = model_clients.get(
+            base_url=base_url,
+            api_key=api_key,
+            model=MODEL_NAME,
+            default_headers=OPENROUTER_HEADERS
+        )
+        candidates = [(MODEL_NAME, primary_model)]
+        if fallback_model_name:
+            candidates.append((fallback_model_name, model_clients.get(
+                base_url=base_url, api_key=api_key, model=fallback_model_name, default_headers=OPENROUTER_HEADERS)[1]))
+        # Free models are often slow or rate limited: hedge/fail over to the fallback model
+        model = HedgedModel(candidates, hedge_delay=hedge_delay_from_env())
+        self.run_config = RunConfig(model_provider=client) if RunConfig else None
+
+        # The free tier allows about 20 requests/minute: queue bursts fairly per session and
+        # answer early instead of failing every session at once (OPENROUTER_MAX_CONCURRENCY, OPENROUTER_RPS, OPENROUTER_TPM)
+        self.admission = provider_admission("openrouter", max_concurrency=4, requests_per_second=20 / 60)
+        # While OpenRouter keeps failing, narration fails fast and one call at a time probes for recovery
+        # (OPENROUTER_BREAKER_FAILURES, OPENROUTER_BREAKER_RESET)
+        self.breaker = provider_breaker("openrouter")
+        # Each turn has TURN_DEADLINE seconds; narration cut short keeps what it streamed
+        self.turn_deadline = turn_deadline_from_env()
+        # Conversation state lives in the session store, not cl.user_session (see SESSION_STORE)
+        self.sessions = store_from_env("game", lambda: ChatHistory(max_tokens=HISTORY_TOKEN_BUDGET))
+        # A message sent while the previous reply is still streaming cancels that reply (TURN_MODE=serialize queues it instead)
+        self.turns = coordinator_from_env()
+        # Games are seeded per session; set GAME_SEED to make every new game reproducible
+        game_seed = os.getenv("GAME_SEED")
+        self.game_seed = int(game_seed) if game_seed else None
+
+        self.narrator_agent = Agent(
+            name="NarratorAgent",
+            instructions="Guide a mystery treasure hunt in a small town. Describe simple scenes (e.g., old library, town square) and prompt player actions (e.g., search, move, inspect). Use events when relevant.",
+            model=model
+        )
+        self.monster_agent = Agent(
+            name="MonsterAgent",
+            instructions="Handle obstacles like traps or guards. Use roll_dice to decide outcomes (e.g., evade a trap, sneak past a guard). Keep it simple and non-fantasy (no dragons).",
+            tools={"roll_dice": roll_dice},
+            model=model
+        )
+        self.item_agent = Agent(
+            name="ItemAgent",
+            instructions="Manage player items and rewards (e.g., keys, maps, coins). Use create_event to introduce items or challenges. Keep items everyday and practical.",
+            tools={"create_event": create_event},
+            model=model
+        )
+        self.route_agents = {
+            "sneak": self.monster_agent,
+            "obstacle": self.monster_agent,
+            "item": self.item_agent,
+            "narrate": self.narrator_agent,
+        }
+
+app = LazyApp(GameApp)
+
+register_lifecycle(cl, prepare=app)
+
+def load_game(session) -> GameState:
+    data = session.get("game")
+    return GameState.from_dict(data) if data else engine.new_game(app.game_seed)
 
 @cl.on_chat_start
 async def start():
-    cl.user_session.set("chat_history", [])
-    cl.user_session.set("current_agent", NarratorAgent)
+    session = await app.sessions.areset(cl.user_session.get("id"))
+    session.set("current_agent", app.narrator_agent.name)
+    session.set("game", load_game(session).as_dict())
+    await app.sessions.asave(session)
     await cl.Message(content="🕵️ **Welcome to the Mystery Treasure Hunt!** 🕵️\n\nYou're in the quiet town of Willow Creek, chasing clues to a hidden treasure. You start in the town square, with an old fountain and a dusty library nearby.\n\n**Tell me about yourself:**\n• What's your adventurer style? (Curious Explorer, Clever Detective, etc.)\n• What's your goal? (Find treasure, solve the mystery, etc.)\n• What's your first move? (Search, explore, talk to locals, etc.)\n\nLet’s uncover the secrets of Willow Creek! 🔍").send()
 
 @cl.on_message
 async def main(message: cl.Message):
-    history = cl.user_session.get("chat_history") or []
-    history.append({"role": "user", "content": message.content})
-    user_input = message.content.lower()
-
-    if any(word in user_input for word in ["trap", "guard", "obstacle", "sneak", "evade"]):
-        agent = MonsterAgent
-    elif any(word in user_input for word in ["item", "find", "treasure", "key", "map"]):
-        agent = ItemAgent
-    else:
-        agent = NarratorAgent
+    await app.turns.run(cl.user_session.get("id"), lambda: handle_turn(message))
 
-    cl.user_session.set("current_agent", agent)
+async def handle_turn(message: cl.Message):
+    from agents import Runner
 
-    msg = cl.Message(content="")
+    turn = tracer.start_turn("game", cl.user_session.get("id"))
+    record = recorder.start_turn("game", cl.user_session.get("id"), message.content)
+    deadline = start_deadline(app.turn_deadline)
+    sessions, admission = app.sessions, app.admission
+    session = await sessions.asession(cl.user_session.get("id"))
+    history = session.history
+    history.append({"role": "user", "content": message.content})
+    user_input = message.content.lower()
+    with turn.span("routing") as span:
+        route = router.route(user_input)
+        span.set("route", route.route)
+    agent = app.route_agents[route.route]
+
+    session.set("current_agent", agent.name)
+    game = load_game(session)
+    # Sneak, move, search, use and inventory actions are resolved locally from the game state
+    with turn.span("engine") as span:
+        reply = engine.resolve(game, message.content)
+        span.set("resolved", reply is not None)
+
+    msg = BufferedStream(cl.Message(content=""))
     await msg.send()
+    result = None
 
     try:
-        if agent == MonsterAgent:
-            obstacle = random.choice(["creaky trapdoor", "nosy guard", "locked gate"])
-            if "sneak" in user_input or "evade" in user_input:
-                dice_result = roll_dice(10)
-                await msg.stream_token(f"🚨 **Challenge: {obstacle.title()}**:\n\n{dice_result}\n\nYou try to slip past the obstacle. Your success depends on the roll...")
+        if reply is not None:
+            await msg.stream_token(reply)
+            with turn.span("session_write"):
+                session.set("game", game.as_dict())
                 history.append({"role": "assistant", "content": msg.content})
-                cl.user_session.set("chat_history", history)
-                return
-
-        if agent == ItemAgent:
-            event = create_event(user_input)
-            await msg.stream_token(f"🎁 **Discovery**:\n\n{event}\n\nWhat do you do next? (Inspect, take, ignore, etc.)")
-            history.append({"role": "assistant", "content": msg.content})
-            cl.user_session.set("chat_history", history)
+                await sessions.asave(session)
             return
 
-        run_config = RunConfig(model_provider=client) if RunConfig else None
-        result = Runner.run_streamed(agent, history, run_config=run_config)
-        async for event in result.stream_events():
-            if event.type == "raw_response_event" and hasattr(event.data, "delta"):
-                await msg.stream_token(event.data.delta)
-
-        history.append({"role": "assistant", "content": msg.content})
-        cl.user_session.set("chat_history", history)
-
+        # The model only narrates; the game facts keep it consistent with the engine
+        facts = {"role": "system", "content": game.describe()}
+        prompt_tokens = history.total_tokens + estimate_tokens(facts["content"])
+        with turn.span("admission"):
+            app.breaker.check()
+            permit = await deadline.wait(admission.acquire(session.id, tokens=prompt_tokens + REPLY_TOKEN_ESTIMATE))
+        try:
+            with turn.stream(agent=agent.name) as stream, record.model(agent.name) as model, app.breaker.attempt() as call:
+                result = Runner.run_streamed(agent, [facts] + history.messages(), run_config=app.run_config)
+                async for event in deadline.iterate(result.stream_events()):
+                    if event.type == "raw_response_event" and hasattr(event.data, "delta"):
+                        call.responded()
+                        stream.token()
+                        model.delta(event.data.delta)
+                        await msg.stream_token(event.data.delta)
+        finally:
+            permit.record(prompt_tokens + estimate_tokens(msg.content))
+            admission.release(permit)
+
+        with turn.span("session_write"):
+            history.append({"role": "assistant", "content": msg.content})
+            await sessions.asave(session)
+
+    except asyncio.CancelledError:
+        # Superseded by a newer message: stop the upstream run and keep only what the player already saw
+        turn.set("error", "superseded")
+        if result is not None and hasattr(result, "cancel"):
+            result.cancel()
+        if msg.content:
+            history.append({"role": "assistant", "content": msg.content})
+        await sessions.asave(session)
+        raise
+    except DeadlineExceeded:
+        # Out of time: stop the upstream run and keep the part of the scene already streamed
+        turn.set("error", "deadline")
+        if result is not None and hasattr(result, "cancel"):
+            result.cancel()
+        if msg.content:
+            history.append({"role": "assistant", "content": msg.content})
+            await sessions.asave(session)
+            await msg.stream_token("\n\n⌛ *The narrator pauses here. What do you do next?*")
+        else:
+            await msg.stream_token("⌛ The narrator lost the thread this time. Try your move again.")
+    except Overloaded as e:
+        turn.set("error", "overloaded")
+        await msg.stream_token(f"⏳ The town is crowded with treasure hunters right now. Try your move again in {max(1, round(e.retry_after))} seconds.")
+    except CircuitOpen as e:
+        turn.set("error", "circuit_open")
+        await msg.stream_token(f"🔌 The narrator can't be reached right now. Try your move again in {max(1, round(e.retry_after))} seconds.")
     except Exception as e:
-        await msg.stream_token(f"❌ Something went wrong: {str(e)}")
\ No newline at end of file
+        turn.set("error", type(e).__name__)
+        await msg.stream_token(f"❌ Something went wrong: {str(e)}")
+    finally:
+        await msg.flush()
+        record.end(session, msg.content, seed=game.seed)
+        turn.end()
\ No newline at end of file
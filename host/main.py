@@ -0,0 +1,96 @@
+"""Serve the travel, game and career apps from one Chainlit process.
+
+    chainlit run host/main.py
+
+Each app is a chat profile. Its own ``main.py`` is imported unchanged, and the
+host's handlers send each chat to that app's ``start`` and ``main``. Chainlit
+keeps one handler set per process, so the host registers its handlers last. The
+apps share the event loop, the model client pool (one client per provider
+endpoint and key), provider admission, the tracer and the recorder. Their sessions
+stay apart, since every app keeps its own session store namespace and turn
+coordinator. HOST_APPS (e.g. ``travel,career``) limits which apps are mounted.
+"""
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Sequence
+import chainlit as cl
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from common.clients import register_lifecycle
+
+APPS = {
+    "travel": ("Dream Travel", ROOT / "ai-travel agent" / "main.py", "Plan a trip: destinations, bookings and things to do."),
+    "game": ("Treasure Hunt", ROOT / "game-agent" / "main.py", "A mystery treasure hunt in the town of Willow Creek."),
+    "career": ("Career Mentor", ROOT / "career-mentor-agent" / "main.py", "Career guidance for software engineering, finance and medicine."),
+}
+
+# Packages an app bundles under the name of an installed one: the career app's agents/ shim
+PRIVATE_PACKAGES = ("agents",)
+
+
+def _private(name: str, packages: Sequence[str]) -> bool:
+    return any(name == package or name.startswith(package + ".") for package in packages)
+
+
+def mount(name: str, path: Path, private: Sequence[str] = PRIVATE_PACKAGES):
+    """Import an app's main.py as ``{name}_app`` from its own directory.
+
+    The app's directory is on sys.path only while it is imported. Modules named in
+    ``private`` that it brings along are then taken back out of sys.modules, so an
+    app's bundled ``agents`` package does not replace the installed SDK for the
+    others. The app keeps the references it bound at import.
+    """
+    saved = {key: sys.modules.pop(key) for key in list(sys.modules) if _private(key, private)}
+    sys.path.insert(0, str(path.parent))
+    try:
+        spec = importlib.util.spec_from_file_location(f"{name}_app", path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(path.parent))
+        for key in [key for key in sys.modules if _private(key, private)]:
+            del sys.modules[key]
+        sys.modules.update(saved)
+    return module
+
+
+enabled = [name.strip() for name in os.getenv("HOST_APPS", ",".join(APPS)).split(",") if name.strip()]
+apps = {name: mount(name, APPS[name][1]) for name in enabled}
+profiles = {APPS[name][0]: name for name in apps}
+
+
+def build_apps() -> None:
+    """Build every mounted app that has its keys, so MODEL_WARM_UP has clients to warm"""
+    for module in apps.values():
+        try:
+            module.app()
+        except ValueError:
+            pass
+
+
+# Registered after the apps' own hooks, so these are the ones Chainlit keeps
+register_lifecycle(cl, prepare=build_apps)
+
+
+def current():
+    """The app serving this chat, by its chat profile (the first app when none is chosen)"""
+    return apps[profiles.get(cl.user_session.get("chat_profile"), enabled[0])]
+
+
+@cl.set_chat_profiles
+async def chat_profiles():
+    return [cl.ChatProfile(name=APPS[name][0], markdown_description=APPS[name][2]) for name in apps]
+
+
+@cl.on_chat_start
+async def start():
+    await current().start()
+
+
+@cl.on_message
+async def main(message: cl.Message):
+    await current().main(message)
\ No newline at end of file